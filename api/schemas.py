@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Optional, List, Any
 
 class CustomerData(BaseModel):
     # Demographics
@@ -55,13 +55,65 @@ class CustomerData(BaseModel):
 class PredictionResponse(BaseModel):
     churn_probability: float
     risk_category: str
+
+class BatchPredictionRequest(BaseModel):
+    # Records are validated one by one in the handler so that a single bad
+    # record is reported back instead of rejecting the whole batch.
+    records: List[Any] = Field(..., description="List of CustomerData payloads")
+
+class BatchPredictionItem(BaseModel):
+    index: int
+    churn_probability: Optional[float] = None
+    risk_category: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchPredictionResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    predictions: List[BatchPredictionItem]
     
+class FeatureContribution(BaseModel):
+    feature: str = Field(..., description="CustomerData field")
+    value: Any = None
+    contribution: float = Field(..., description="SHAP attribution in log-odds; positive pushes towards churn")
+
+class ExplanationResponse(PredictionResponse):
+    base_value: float = Field(..., description="Log-odds before any feature is taken into account")
+    contributions: List[FeatureContribution]
+
+class BatchExplanationItem(BaseModel):
+    index: int
+    churn_probability: Optional[float] = None
+    risk_category: Optional[str] = None
+    base_value: Optional[float] = None
+    contributions: Optional[List[FeatureContribution]] = None
+    error: Optional[str] = None
+
+class BatchExplanationResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    explanations: List[BatchExplanationItem]
+
 class HealthResponse(BaseModel):
     status: str
     version: str
+    ready: bool = False
 
 class ModelInfoResponse(BaseModel):
     model_type: str
     version: str
     trained_date: str
     features_count: int
+    artifact_hash: str
+    model_path: str
+    loaded_at: str
+    load_seconds: float
+
+class ReloadRequest(BaseModel):
+    model_path: Optional[str] = Field(None, description="Artifact to load, inside serving.reload.model_dir. Defaults to the currently served path.")
+
+class ReloadResponse(BaseModel):
+    status: str
+    model: ModelInfoResponse
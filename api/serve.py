@@ -0,0 +1,122 @@
+"""
+Pre-fork multi-worker server for the Churn Prediction API.
+
+The parent process loads the model once, freezes the GC (so refcount/GC passes don't
+dirty the shared pages), binds the listening socket and forks N uvicorn workers.
+Workers inherit the model copy-on-write: the XGBoost booster and sklearn objects are
+shared with the parent, and numpy arrays are additionally memory-mapped from the
+artifact when serving.mmap_mode is set (the artifact must then only be replaced
+atomically, never rewritten in place). Each added worker therefore costs roughly its
+own interpreter state rather than another copy of the model, and starts without
+unpickling anything.
+
+Usage:
+    python -m api.serve --workers 4 --host 0.0.0.0 --port 8000
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+
+import uvicorn
+
+import api.app as app_module
+
+logger = logging.getLogger("ChurnAPI.serve")
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, log_level: str):
+    # Restore default handlers; uvicorn installs its own graceful-shutdown handlers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app_module.app, log_level=log_level)
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int, log_level: str = "info"):
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Pre-fork serving requires os.fork (POSIX only); use `uvicorn api.app:app` instead.")
+
+    logger.info(f"Preloading model from {app_module.MODEL_PATH} (mmap_mode={app_module.MMAP_MODE})...")
+    if os.path.exists(app_module.MODEL_PATH):
+        app_module.preload_model()
+    else:
+        logger.warning(f"Model not found at {app_module.MODEL_PATH}. Workers will start without a model.")
+
+    # Move everything allocated so far to a permanent generation so collections in the
+    # workers don't touch (and copy) the shared model pages.
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(host, port)
+    logger.info(f"Listening on http://{host}:{port} with {workers} workers")
+
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock, log_level)
+            finally:
+                os._exit(0)
+        children.add(pid)
+        logger.info(f"Started worker {pid}")
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}; restarting.")
+            spawn()
+
+    sock.close()
+    logger.info("All workers stopped.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Serve the API with N pre-forked workers sharing one model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=app_module.serving_config.get("workers", 1))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, log_level=args.log_level)
+    sys.exit(0)
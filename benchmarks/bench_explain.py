@@ -0,0 +1,84 @@
+"""
+Latency and throughput of SHAP explanations (ChurnPredictor.explain_batch) per model.
+
+Checks additivity first: for every record of the raw dataset the field attributions plus
+the base value must equal the model's log-odds. Then times explain_batch at several batch
+sizes, against a naive loop that explains one record per call.
+
+Usage:
+    python -m benchmarks.bench_explain --models artifacts/models/challenger_model.joblib artifacts/models/baseline_model.joblib
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_validation.cleaner import DataCleaner
+from src.inference.predictor import ChurnPredictor
+
+DATA_PATH = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def load_records(path: str):
+    df = DataCleaner().clean_data(pd.read_csv(path))
+    return df.drop(columns=["customerID", "Churn"]).to_dict(orient="records")
+
+
+def time_batches(predictor: ChurnPredictor, records, batch_size: int, repeats: int) -> np.ndarray:
+    timings = []
+    for i in range(repeats):
+        offset = (i * batch_size) % max(len(records) - batch_size, 1)
+        batch = records[offset:offset + batch_size]
+        start = time.perf_counter()
+        predictor.explain_batch(batch)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=["artifacts/models/best_model.joblib"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    records = load_records(DATA_PATH)
+    for model_path in args.models:
+        start = time.perf_counter()
+        predictor = ChurnPredictor(model_path, explain=True)
+        explainer = predictor.state.explainer
+        if explainer is None:
+            print(f"{model_path}: no explainer available, skipped.")
+            continue
+        print(f"\n{model_path} ({explainer.kind} explainer, loaded in {time.perf_counter() - start:.2f}s)")
+
+        # Additivity: base value + field attributions == log-odds of the served probability
+        X = explainer.compiled.transform_records(records)
+        probs = explainer.compiled.predict_proba(X)
+        error = np.abs(explainer.base_value + explainer.explain(X).sum(axis=1) - np.log(probs / (1 - probs))).max()
+        assert error < 1e-4, f"attributions are not additive, max error {error:.2e}"
+        print(f"Additivity OK on {len(records)} records (max error {error:.1e}).")
+
+        print(f"{'batch':>8}{'p50 (ms)':>12}{'p95 (ms)':>12}{'rows/s':>12}")
+        for batch_size in args.batch_sizes:
+            seconds = time_batches(predictor, records, batch_size, args.repeats)
+            p50, p95 = np.percentile(seconds, [50, 95]) * 1e3
+            print(f"{batch_size:>8}{p50:>12.2f}{p95:>12.2f}{batch_size / seconds.mean():>12.0f}")
+
+        # What a per-request explainer would cost: one explain call per record
+        sample = records[:200]
+        start = time.perf_counter()
+        for record in sample:
+            predictor.explain_batch([record])
+        naive = len(sample) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        predictor.explain_batch(sample)
+        vectorized = len(sample) / (time.perf_counter() - start)
+        print(f"{len(sample)} records one at a time: {naive:.0f} rows/s; as one batch: {vectorized:.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compares the compiled fast path against the sklearn pipeline for single-record scoring.
+
+Checks that probabilities match exactly on every row of the raw dataset (single and batch),
+then reports per-call latency percentiles for both paths.
+
+Usage:
+    python -m benchmarks.bench_fast_path --model artifacts/models/best_model.joblib
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_validation.cleaner import DataCleaner
+from src.inference.predictor import ChurnPredictor
+
+DATA_PATH = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def load_records(path: str):
+    df = DataCleaner().clean_data(pd.read_csv(path))
+    return df.drop(columns=["customerID", "Churn"]).to_dict(orient="records")
+
+
+def time_calls(fn, records, repeats: int) -> np.ndarray:
+    timings = []
+    for i in range(repeats):
+        record = records[i % len(records)]
+        start = time.perf_counter()
+        fn(record)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="artifacts/models/best_model.joblib")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    predictor = ChurnPredictor(args.model)
+    if predictor.compiled is None:
+        raise SystemExit("Pipeline could not be compiled; nothing to compare.")
+    records = load_records(DATA_PATH)
+
+    # Parity: compiled batch and per-record results must equal the sklearn pipeline bit for bit
+    expected = predictor.model.predict_proba(pd.DataFrame(records))[:, 1]
+    batch = predictor.compiled.predict_proba_records(records)
+    assert np.array_equal(expected, batch), f"batch mismatch, max diff {np.abs(expected - batch).max()}"
+    for i, record in enumerate(records):
+        single_expected = predictor.model.predict_proba(pd.DataFrame([record]))[:, 1]
+        single = predictor.compiled.predict_proba_records([record])
+        assert np.array_equal(single_expected, single), f"row {i}: {single[0]!r} != {single_expected[0]!r}"
+    print(f"Parity OK on {len(records)} records (single and batch).")
+
+    def sklearn_single(record):
+        return predictor._predict_df(pd.DataFrame([record]))[0]
+
+    results = {
+        "sklearn pipeline": time_calls(sklearn_single, records, args.repeats),
+        "compiled fast path": time_calls(predictor.predict_single, records, args.repeats),
+    }
+    print(f"{'path':<22}{'p50 (us)':>12}{'p95 (us)':>12}{'p99 (us)':>12}")
+    for name, us in results.items():
+        p50, p95, p99 = np.percentile(us, [50, 95, 99])
+        print(f"{name:<22}{p50:>12.1f}{p95:>12.1f}{p99:>12.1f}")
+    speedup = np.percentile(results["sklearn pipeline"], 99) / np.percentile(results["compiled fast path"], 99)
+    print(f"p99 speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Import-time and cold-start profile of the serving and training entry points.
+
+For each module, runs `python -X importtime -c "import <module>"` in a fresh interpreter
+(several times; medians reported) and prints the total import time, the heaviest
+top-level packages it pulls in and which heavy dependencies end up loaded.
+
+With --serve it also starts `uvicorn api.app:app` and reports the time until /health
+first answers and until it reports the model ready (the model loads in the background,
+see serving.background_load).
+
+Usage:
+    python -m benchmarks.bench_import_time --repeats 5 --serve
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Optional
+
+import numpy as np
+
+MODULES = ["api.app", "src.inference.predictor", "src.inference.portable", "src.training.train_pipeline"]
+HEAVY = ["pandas", "joblib", "sklearn", "xgboost", "scipy", "pandera", "yaml"]
+
+
+def parse_importtime(stderr: str):
+    """
+    Returns {module: cumulative microseconds} from `-X importtime` output.
+    """
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+def profile_import(module: Optional[str]):
+    code = f"import {module}, sys, json; print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))" if module else "pass"
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": "."},
+    )
+    loaded = json.loads(result.stdout.strip().splitlines()[-1]) if module else []
+    return parse_importtime(result.stderr), loaded
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_health(port: int):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+        return json.loads(response.read())
+
+
+def measure_cold_start(timeout: float = 120.0):
+    """
+    Seconds from process start to the first /health answer and to `ready: true`.
+    """
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-W", "ignore", "-m", "uvicorn", "api.app:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env={**os.environ, "PYTHONPATH": "."},
+    )
+    first_health, ready = None, None
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                health = get_health(port)
+            except OSError:
+                time.sleep(0.005)
+                continue
+            now = time.perf_counter() - start
+            first_health = first_health or now
+            if health.get("ready"):
+                ready = now
+                break
+            time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+    return first_health, ready
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest top-level packages to list")
+    parser.add_argument("--serve", action="store_true", help="Also measure API cold start to /health and to model ready")
+    args = parser.parse_args()
+
+    # Packages every interpreter imports at startup (site, encodings, ...) aren't the module's cost
+    startup, _ = profile_import(None)
+
+    for module in MODULES:
+        totals, per_package = [], defaultdict(list)
+        for _ in range(args.repeats):
+            cumulative, loaded = profile_import(module)
+            totals.append(cumulative[module])
+            for name, us in cumulative.items():
+                if "." not in name and name != module.split(".")[0] and name not in startup:
+                    per_package[name].append(us)
+        heaviest = sorted(per_package.items(), key=lambda item: -np.median(item[1]))[:args.top]
+        print(f"\n{module}: {np.median(totals) / 1e3:.0f} ms (median of {args.repeats})")
+        print(f"  heavy deps loaded: {', '.join(loaded) or 'none'}")
+        for name, us in heaviest:
+            print(f"  {name:<24}{np.median(us) / 1e3:>8.0f} ms")
+
+    if args.serve:
+        first_health, ready = measure_cold_start()
+        if first_health is None:
+            print("\nuvicorn api.app:app did not answer /health")
+            return
+        print(f"\nuvicorn api.app:app cold start: /health after {first_health:.2f}s")
+        print(f"  model ready after {ready:.2f}s" if ready else "  model not ready (missing artifact?)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Latency/throughput benchmark suite for the inference stack.
+
+Scenarios, run for each model artifact (baseline and challenger):
+- predictor.single            ChurnPredictor.predict_single, one record per call
+- predictor.records.<n>       ChurnPredictor.predict_batch on n dict records (compiled fast path)
+- predictor.frame.<n>         ChurnPredictor.predict_frame on an n-row DataFrame (sklearn pipeline)
+- http.predict.c<k>           POST /predict with k concurrent clients (micro-batcher included)
+- http.batch100.c<k>          POST /predict/batch with 100 records, k concurrent clients
+HTTP scenarios drive the in-process FastAPI app through httpx's ASGI transport, so they
+measure the app (validation, routing, batching, serialization) without network noise.
+
+Each scenario runs in a fresh interpreter, so peak RSS is that of the scenario alone.
+Rows are resampled from the raw dataset. The prediction cache is disabled.
+
+Reported per scenario: p50/p95/p99 latency per call, rows/sec (wall clock) and peak RSS.
+Results are written as JSON and compared with a stored baseline; a scenario regresses
+when its p50 or rows/sec is worse than the baseline by more than --tolerance (p99 is
+shown but not gated on: on a shared machine it moves too much between runs).
+
+Usage:
+    python -m benchmarks.bench_inference                  # full suite, compare with benchmarks/baseline.json
+    python -m benchmarks.bench_inference --quick          # fewer calls, no 1M-row batch
+    python -m benchmarks.bench_inference --save-baseline  # store this run as the new baseline
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+
+import numpy as np
+
+DATA_PATH = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+MODELS = {
+    "baseline": "artifacts/models/baseline_model.joblib",
+    "challenger": "artifacts/models/challenger_model.joblib",
+}
+FRAME_SIZES = [1, 100, 10_000, 1_000_000]
+# Lists of dicts cost ~1 KB per row, so the records path stops at 10k rows
+RECORD_SIZES = [1, 100, 10_000]
+HTTP_CONCURRENCY = [1, 16, 64]
+HTTP_BATCH_SIZE = 100
+RESULTS_PATH = "benchmarks/results/latest.json"
+BASELINE_PATH = "benchmarks/baseline.json"
+
+
+def scenarios(quick: bool) -> List[str]:
+    frame_sizes = [n for n in FRAME_SIZES if not quick or n < 1_000_000]
+    return (
+        ["predictor.single"]
+        + [f"predictor.records.{n}" for n in RECORD_SIZES]
+        + [f"predictor.frame.{n}" for n in frame_sizes]
+        + [f"http.predict.c{k}" for k in HTTP_CONCURRENCY]
+        + [f"http.batch{HTTP_BATCH_SIZE}.c{k}" for k in HTTP_CONCURRENCY]
+    )
+
+
+def load_frame(n_rows: int, seed: int = 0):
+    import pandas as pd
+    from src.data_validation.cleaner import DataCleaner
+
+    base = DataCleaner().clean_data(pd.read_csv(DATA_PATH)).drop(columns=["customerID", "Churn"])
+    rng = np.random.default_rng(seed)
+    return base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+
+
+def summarize(latencies: List[float], rows: int, wall: float) -> Dict[str, Any]:
+    ms = np.asarray(latencies) * 1e3
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "calls": len(ms),
+        "rows": rows,
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+        "rows_per_sec": round(rows / wall, 1),
+    }
+
+
+def n_calls(batch_size: int, repeats: int, rows_budget: int) -> int:
+    return int(np.clip(rows_budget // batch_size, 3, repeats))
+
+
+def time_sequential(fn, inputs: list, calls: int, rows_per_call: int) -> Dict[str, Any]:
+    for item in inputs[:min(10, calls)]:
+        fn(item)  # warm-up
+    latencies = []
+    start = time.perf_counter()
+    for i in range(calls):
+        item = inputs[i % len(inputs)]
+        t0 = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, calls * rows_per_call, time.perf_counter() - start)
+
+
+def run_predictor(scenario: str, model_path: str, repeats: int, rows_budget: int) -> Dict[str, Any]:
+    from src.inference.predictor import ChurnPredictor
+
+    predictor = ChurnPredictor(model_path)
+    kind = scenario.split(".")[1]
+    if kind == "single":
+        records = load_frame(min(repeats, 10_000)).to_dict(orient="records")
+        return time_sequential(predictor.predict_single, records, repeats, 1)
+
+    n = int(scenario.split(".")[2])
+    calls = n_calls(n, repeats, rows_budget)
+    # A few distinct inputs, so repeated calls don't just replay the same rows
+    frames = [load_frame(n, seed=seed) for seed in range(3 if n <= 10_000 else 1)]
+    if kind == "records":
+        return time_sequential(predictor.predict_batch, [f.to_dict(orient="records") for f in frames], calls, n)
+    return time_sequential(predictor.predict_frame, frames, calls, n)
+
+
+async def run_http(scenario: str, model_path: str, repeats: int) -> Dict[str, Any]:
+    import httpx
+    import api.app as app_module
+
+    app_module.MODEL_PATH = model_path
+    app_module.BACKGROUND_LOAD = False
+    app_module.CACHE_CONFIG = {"enabled": False}
+    # Measures the app at full concurrency: no request is shed
+    app_module.EXECUTOR_CONFIG = {**app_module.EXECUTOR_CONFIG, "max_requests": None, "max_queue": 1024}
+
+    _, endpoint, concurrency = scenario.split(".")
+    concurrency = int(concurrency[1:])
+    batch = endpoint != "predict"
+    rows_per_call = HTTP_BATCH_SIZE if batch else 1
+    # Requests cycle through a fixed pool of payloads (50 batches or up to 10k single records)
+    records = load_frame(50 * rows_per_call if batch else min(repeats, 10_000)).to_dict(orient="records")
+    if batch:
+        url = "/predict/batch"
+        payloads = [{"records": records[i:i + HTTP_BATCH_SIZE]} for i in range(0, len(records), HTTP_BATCH_SIZE)]
+    else:
+        url, payloads = "/predict", records
+
+    await app_module.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for payload in payloads[:10]:
+                (await client.post(url, json=payload)).raise_for_status()  # warm-up
+
+            latencies = []
+            pending = iter(range(repeats))
+
+            async def client_loop():
+                for i in pending:
+                    t0 = time.perf_counter()
+                    response = await client.post(url, json=payloads[i % len(payloads)])
+                    latencies.append(time.perf_counter() - t0)
+                    response.raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+            wall = time.perf_counter() - start
+    finally:
+        await app_module.app.router.shutdown()
+    return summarize(latencies, repeats * rows_per_call, wall)
+
+
+def run_scenario(scenario: str, model_path: str, repeats: int, rows_budget: int) -> Dict[str, Any]:
+    logging.disable(logging.WARNING)
+    if scenario.startswith("http."):
+        result = asyncio.run(run_http(scenario, model_path, repeats))
+    else:
+        result = run_predictor(scenario, model_path, repeats, rows_budget)
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def spawn_scenario(scenario: str, model_path: str, repeats: int, rows_budget: int) -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-m", "benchmarks.bench_inference", "--scenario", scenario,
+         "--model-path", model_path, "--repeats", str(repeats), "--rows-budget", str(rows_budget)],
+        capture_output=True, text=True, env={**os.environ, "PYTHONPATH": "."},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{scenario} on {model_path} failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Prints each scenario against the baseline; returns the keys that regressed.
+    """
+    regressions = []
+    print(f"\n{'scenario':<40}{'p50 (ms)':>11}{'base':>11}{'p99 (ms)':>11}{'base':>11}"
+          f"{'rows/sec':>13}{'base':>13}  status")
+    for key, current in results.items():
+        previous = baseline.get(key, {})
+        print(f"{key:<40}{current['p50_ms']:>11.3f}{previous.get('p50_ms', float('nan')):>11.3f}"
+              f"{current['p99_ms']:>11.3f}{previous.get('p99_ms', float('nan')):>11.3f}"
+              f"{current['rows_per_sec']:>13,.0f}{previous.get('rows_per_sec', float('nan')):>13,.0f}  ", end="")
+        if not previous:
+            print("new")
+            continue
+        slower = current["p50_ms"] / previous["p50_ms"] - 1
+        throughput = current["rows_per_sec"] / previous["rows_per_sec"] - 1
+        regressed = slower > tolerance or throughput < -tolerance
+        if regressed:
+            regressions.append(key)
+        print(f"{'REGRESSED' if regressed else 'ok'} (p50 {slower:+.0%}, rows/sec {throughput:+.0%})")
+    return regressions
+
+
+def write_json(path: str, payload: Dict[str, Any]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--only", default=None, help="Run only scenarios containing this substring")
+    parser.add_argument("--quick", action="store_true", help="Fewer calls and no 1M-row batch")
+    parser.add_argument("--repeats", type=int, default=None, help="Max calls per scenario (default 2000, 200 with --quick)")
+    parser.add_argument("--rows-budget", type=int, default=None, help="Rows scored per batch scenario (default 2M, 200k with --quick)")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p50/rows-per-sec regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 if any scenario regressed")
+    # Internal: run one scenario in this process and print its result as JSON
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--model-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    repeats = args.repeats or (200 if args.quick else 2000)
+    rows_budget = args.rows_budget or (200_000 if args.quick else 2_000_000)
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario, args.model_path, repeats, rows_budget)))
+        return
+
+    results = {}
+    for name in args.models:
+        path = MODELS[name]
+        if not os.path.exists(path):
+            print(f"Skipping {name}: no artifact at {path}")
+            continue
+        for scenario in scenarios(args.quick):
+            if args.only and args.only not in scenario:
+                continue
+            result = spawn_scenario(scenario, path, repeats, rows_budget)
+            results[f"{name}/{scenario}"] = result
+            print(f"{name + '/' + scenario:<40} p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  "
+                  f"p99 {result['p99_ms']:>9.3f} ms  {result['rows_per_sec']:>12,.0f} rows/s  "
+                  f"peak RSS {result['peak_rss_mb']:>7.1f} MB")
+
+    payload = {"environment": environment(), "results": results}
+    write_json(args.output, payload)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, payload)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Load test of the API under overload: admission control on vs. off.
+
+Starts the API with uvicorn in a subprocess per scenario, then drives it over TCP with
+--concurrency clients posting /predict/batch (--batch-size records, resampled from the
+raw dataset) back to back for --duration seconds (sleeping Retry-After when shed), while a probe in its own process
+(so it measures the server, not the busy load generator) calls /health every 50 ms.
+Scenarios:
+- bounded:    serving.executor as configured (dedicated pool, bounded queue, 429/503)
+- unbounded:  executor disabled and an unbounded micro-batcher queue, i.e. scoring in
+              the default threadpool with no admission control
+
+Reported per scenario: responses by status, p50/p99/max latency of accepted (200)
+requests as seen by the clients and by the server (quantiles of its /metrics latency
+histogram, as bucket upper bounds: on a small machine the load generator's own CPU
+share inflates the client view), rows/sec, and p50/p99/max latency of /health.
+
+Usage:
+    python -m benchmarks.bench_load --concurrency 64 --duration 15
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, Any, List
+
+import numpy as np
+
+DATA_PATH = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+SCENARIOS = ("bounded", "unbounded")
+
+
+def serve(scenario: str, port: int, model_path: str):
+    import uvicorn
+    import api.app as app_module
+
+    app_module.MODEL_PATH = model_path
+    app_module.BACKGROUND_LOAD = False
+    app_module.CACHE_CONFIG = {"enabled": False}
+    if scenario == "unbounded":
+        app_module.EXECUTOR_CONFIG = {"enabled": False}
+        app_module.BATCHING_CONFIG = {**app_module.BATCHING_CONFIG, "max_queue": 0}
+    uvicorn.run(app_module.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def probe(port: int, duration: float):
+    # Plain http.client over one keep-alive connection; prints the latencies as JSON
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            connection.request("GET", "/health")
+            connection.getresponse().read()
+            latencies.append(time.perf_counter() - t0)
+        except (http.client.HTTPException, OSError):
+            # Keep-alive connection closed under us; reconnect on the next request
+            connection.close()
+        time.sleep(0.05)
+    print(json.dumps(latencies))
+
+
+def histogram_quantiles(metrics_text: str, route: str, quantiles=(0.5, 0.99)) -> Dict[str, Any]:
+    """
+    Bucket upper bounds (ms) holding the given quantiles of the server's request latency
+    histogram for `route`.
+    """
+    prefix = f'churn_http_request_duration_seconds_bucket{{route="{route}"'
+    buckets = []
+    for line in metrics_text.splitlines():
+        if line.startswith(prefix):
+            bound = line.split('le="')[1].split('"')[0]
+            buckets.append((float(bound), float(line.rsplit(" ", 1)[1])))
+    if not buckets or not buckets[-1][1]:
+        return {}
+    total = buckets[-1][1]
+    return {
+        f"p{round(q * 100)}_ms": next(bound * 1e3 for bound, count in buckets if count >= q * total)
+        for q in quantiles
+    }
+
+
+def load_records(n_rows: int) -> List[Dict[str, Any]]:
+    import pandas as pd
+    from src.data_validation.cleaner import DataCleaner
+
+    df = DataCleaner().clean_data(pd.read_csv(DATA_PATH)).drop(columns=["customerID", "Churn"])
+    return df.sample(n_rows, replace=True, random_state=0).to_dict(orient="records")
+
+
+def percentiles(seconds: List[float]) -> Dict[str, float]:
+    if not seconds:
+        return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+    ms = np.array(seconds) * 1e3
+    return {"p50_ms": round(float(np.percentile(ms, 50)), 1), "p99_ms": round(float(np.percentile(ms, 99)), 1),
+            "max_ms": round(float(ms.max()), 1)}
+
+
+async def drive(port: int, payloads: List[Dict[str, Any]], concurrency: int, duration: float) -> Dict[str, Any]:
+    import httpx
+
+    # Serialized once: the load generator shares the machine with the server
+    bodies = [json.dumps(payload).encode() for payload in payloads]
+    headers = {"Content-Type": "application/json"}
+
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+        for _ in range(100):
+            try:
+                if (await client.get("/health")).json().get("ready"):
+                    break
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+        for payload in payloads[:5]:
+            (await client.post("/predict/batch", json=payload)).raise_for_status()  # warm-up
+
+        statuses, accepted = Counter(), []
+        retry_after = set()
+        deadline = time.perf_counter() + duration
+
+        async def client_loop(offset: int):
+            i = offset
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                try:
+                    response = await client.post("/predict/batch", content=bodies[i % len(bodies)], headers=headers)
+                except httpx.TransportError:
+                    statuses["connection_error"] += 1
+                    i += concurrency
+                    continue
+                elapsed = time.perf_counter() - t0
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    accepted.append(elapsed)
+                elif "retry-after" in response.headers:
+                    # Back off as asked, like a well-behaved client
+                    retry_after.add(response.headers["retry-after"])
+                    await asyncio.sleep(float(response.headers["retry-after"]))
+                i += concurrency
+
+        prober = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.bench_load", "--probe", "--port", str(port), "--duration", str(duration)],
+            stdout=subprocess.PIPE, text=True, env={**os.environ, "PYTHONPATH": "."},
+        )
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(k) for k in range(concurrency)))
+        wall = time.perf_counter() - start
+        health = json.loads(prober.communicate()[0])
+        server = histogram_quantiles((await client.get("/metrics")).text, "/predict/batch")
+
+    rows = len(accepted) * len(payloads[0]["records"])
+    return {
+        "statuses": dict(sorted(statuses.items(), key=lambda item: str(item[0]))),
+        "retry_after": sorted(retry_after),
+        "accepted": percentiles(accepted),
+        "server": server,
+        "rows_per_sec": round(rows / wall),
+        "health": percentiles(health),
+    }
+
+
+def run_scenario(scenario: str, args) -> Dict[str, Any]:
+    port = args.port + SCENARIOS.index(scenario)
+    server = subprocess.Popen(
+        [sys.executable, "-W", "ignore", "-m", "benchmarks.bench_load", "--serve", scenario,
+         "--port", str(port), "--model-path", args.model_path],
+        env={**os.environ, "PYTHONPATH": "."},
+    )
+    try:
+        records = load_records(50 * args.batch_size)
+        payloads = [{"records": records[i:i + args.batch_size]} for i in range(0, len(records), args.batch_size)]
+        return asyncio.run(drive(port, payloads, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--model-path", default="artifacts/models/best_model.joblib")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--serve", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(args.port, args.duration)
+        return
+    if args.serve:
+        serve(args.serve, args.port, args.model_path)
+        return
+
+    logging.disable(logging.INFO)
+    results = {}
+    for scenario in args.scenarios:
+        results[scenario] = run_scenario(scenario, args)
+        r = results[scenario]
+        print(f"{scenario:<10} statuses={r['statuses']} rows/s={r['rows_per_sec']:,}\n"
+              f"{'':<10} accepted p50/p99/max={r['accepted']['p50_ms']}/{r['accepted']['p99_ms']}/"
+              f"{r['accepted']['max_ms']} ms (server p50/p99 <= {r['server'].get('p50_ms')}/{r['server'].get('p99_ms')} ms)  "
+              f"/health p50/p99/max={r['health']['p50_ms']}/{r['health']['p99_ms']}/{r['health']['max_ms']} ms")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares the additive scoring table of a linear model against ChurnPredictor.
+
+Checks that the table's probabilities (pure-Python single record and integer-code batch
+paths) match ChurnPredictor on every row of the raw dataset, then reports single-record
+latency percentiles and batch throughput for both.
+
+Usage:
+    python -m benchmarks.bench_scoring_table --model artifacts/models/baseline_model.joblib
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_validation.cleaner import DataCleaner
+from src.inference.predictor import ChurnPredictor
+from src.inference.scoring_table import ScoringTable, check_parity
+
+DATA_PATH = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def load_records(path: str):
+    df = DataCleaner().clean_data(pd.read_csv(path))
+    return df.drop(columns=["customerID", "Churn"]).to_dict(orient="records")
+
+
+def time_calls(fn, records, repeats: int) -> np.ndarray:
+    timings = []
+    for i in range(repeats):
+        record = records[i % len(records)]
+        start = time.perf_counter()
+        fn(record)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1e6
+
+
+def rows_per_second(fn, repeats: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        rows = fn()
+    return rows * repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="artifacts/models/baseline_model.joblib")
+    parser.add_argument("--repeats", type=int, default=5000)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    predictor = ChurnPredictor(args.model)
+    table = ScoringTable.from_pipeline(predictor.model, compiled=predictor.compiled)
+    records = load_records(DATA_PATH)
+
+    max_diff = check_parity(table, predictor, records)
+    assert max_diff <= args.tolerance, f"scoring table disagrees with ChurnPredictor, max diff {max_diff:.3g}"
+    print(f"Parity OK on {len(records)} records (single and batch, max diff {max_diff:.1e}).")
+
+    results = {
+        "ChurnPredictor": time_calls(predictor.predict_single, records, args.repeats),
+        "scoring table": time_calls(table.predict_proba_record, records, args.repeats),
+    }
+    print(f"{'single record':<22}{'p50 (us)':>12}{'p95 (us)':>12}{'p99 (us)':>12}")
+    for name, us in results.items():
+        p50, p95, p99 = np.percentile(us, [50, 95, 99])
+        print(f"{name:<22}{p50:>12.1f}{p95:>12.1f}{p99:>12.1f}")
+
+    batch = (records * (100_000 // len(records) + 1))[:100_000]
+    codes, numeric = table.encode(batch)
+    throughput = {
+        "ChurnPredictor": rows_per_second(lambda: len(predictor.predict_batch(batch)), repeats=1),
+        "table (records)": rows_per_second(lambda: len(table.predict_proba_records(batch)), repeats=1),
+        "table (codes)": rows_per_second(lambda: len(table.predict_proba_codes(codes, numeric))),
+    }
+    print(f"{'100k-row batch':<22}{'rows/s':>12}")
+    for name, rate in throughput.items():
+        print(f"{name:<22}{rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares the fused EngineeredFeatures transformer against the original
+InteractionFeatures -> TenureBinning -> LogTransformer chain.
+
+Rows are resampled from the raw dataset (plus tenure 0 / NaN edge cases) to 1, 1k and
+1M rows. At each size the two outputs must be identical (same columns, dtypes and
+values, bit for bit), then the median transform time of each path is reported.
+
+Usage:
+    python -m benchmarks.bench_transformers
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from src.data_validation.cleaner import DataCleaner
+from src.feature_engineering.transformers import (
+    TenureBinning, LogTransformer, InteractionFeatures, EngineeredFeatures
+)
+
+DATA_PATH = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+SIZES = [1, 1_000, 1_000_000]
+
+
+def make_frame(base: pd.DataFrame, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+    if n_rows > 2:
+        # Edge cases: tenure of 0 (division guard, below first bin) and a missing TotalCharges
+        df.loc[0, "tenure"] = 0
+        df.loc[1, "TotalCharges"] = np.nan
+    return df
+
+
+def time_transform(transformer, df: pd.DataFrame, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        transformer.transform(df)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=20, help="Timed repeats per size (3 at 1M rows)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    base = DataCleaner().clean_data(pd.read_csv(DATA_PATH)).drop(columns=["customerID", "Churn"])
+
+    legacy = Pipeline([
+        ('interaction', InteractionFeatures()),
+        ('tenure_bin', TenureBinning()),
+        ('log_transform', LogTransformer(columns=['TotalCharges'])),
+    ])
+    fused = EngineeredFeatures(log_columns=['TotalCharges'])
+
+    print(f"{'rows':>10}{'legacy (ms)':>14}{'fused (ms)':>14}{'speedup':>10}")
+    for n_rows in SIZES:
+        df = make_frame(base, n_rows)
+        before = df.copy()
+
+        expected = legacy.transform(df)
+        actual = fused.transform(df)
+        pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+        for col in ("calculated_AvgCharges", "TotalCharges_log"):
+            # assert_frame_equal treats NaNs as equal; also require identical bit patterns
+            assert expected[col].to_numpy().tobytes() == actual[col].to_numpy().tobytes(), col
+        pd.testing.assert_frame_equal(df, before, check_exact=True)  # input left untouched
+
+        repeats = 3 if n_rows >= 1_000_000 else args.repeats
+        legacy_s = time_transform(legacy, df, repeats)
+        fused_s = time_transform(fused, df, repeats)
+        print(f"{n_rows:>10}{legacy_s * 1e3:>14.3f}{fused_s * 1e3:>14.3f}{legacy_s / fused_s:>9.1f}x")
+    print("Outputs identical at every size.")
+
+
+if __name__ == "__main__":
+    main()
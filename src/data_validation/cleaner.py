@@ -8,13 +8,15 @@ class DataCleaner:
     def __init__(self):
         pass
 
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def clean_data(self, df: pd.DataFrame, drop_duplicates: bool = True) -> pd.DataFrame:
         """
         Cleans the input DataFrame.
         - Coerces TotalCharges to numeric (errors='coerce').
         - Fills missing TotalCharges (which result from empty strings in this dataset) with 0 or mean.
           (Logic: If tenure is 0, TotalCharges is usually ' '. Imputing with 0 makes sense).
         - Standardizes categorical values if needed (e.g. 'No phone service' -> 'No').
+        - Drops duplicate rows, unless `drop_duplicates=False` (scoring, where every input row
+          needs an output row).
         """
         df = df.copy()
         
@@ -29,7 +31,8 @@ class DataCleaner:
             df['TotalCharges'] = df['TotalCharges'].fillna(0.0)
 
         # Basic Check: Drop duplicates if any
-        df = df.drop_duplicates()
+        if drop_duplicates:
+            df = df.drop_duplicates()
         if len(df) < original_rows:
             logger.info(f"Dropped {original_rows - len(df)} duplicate rows.")
 
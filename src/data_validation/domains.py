@@ -0,0 +1,78 @@
+"""
+Value domains of the Telco extract, shared by the pandera schema, the fast validator
+(src/data_validation/validator.py) and the API's batch validation.
+
+Pure Python, so the API can check payloads without importing pandas or pandera.
+"""
+from typing import Dict, Any, List, Optional
+
+YES_NO = ["Yes", "No"]
+INTERNET_ADDON = ["Yes", "No", "No internet service"]
+
+CATEGORICAL_DOMAINS: Dict[str, List[str]] = {
+    "gender": ["Male", "Female"],
+    "Partner": YES_NO,
+    "Dependents": YES_NO,
+    "PhoneService": YES_NO,
+    "MultipleLines": ["Yes", "No", "No phone service"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": INTERNET_ADDON,
+    "OnlineBackup": INTERNET_ADDON,
+    "DeviceProtection": INTERNET_ADDON,
+    "TechSupport": INTERNET_ADDON,
+    "StreamingTV": INTERNET_ADDON,
+    "StreamingMovies": INTERNET_ADDON,
+    "Contract": ["Month-to-month", "One year", "Two year"],
+    "PaperlessBilling": YES_NO,
+    "PaymentMethod": ["Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)"],
+}
+
+TARGET_DOMAIN = YES_NO
+
+
+class NumericRule:
+    """
+    Constraints on a numeric column: a lower bound and/or a closed set of values.
+    """
+    def __init__(self, minimum: Optional[float] = None, allowed: Optional[List[float]] = None, nullable: bool = False):
+        self.minimum = minimum
+        self.allowed = allowed
+        self.nullable = nullable
+
+    def violation(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None if self.nullable else "is required"
+        if self.allowed is not None and value not in self.allowed:
+            return f"{value!r} is not one of {self.allowed}"
+        if self.minimum is not None and value < self.minimum:
+            return f"{value!r} is below {self.minimum}"
+        return None
+
+
+NUMERIC_RULES: Dict[str, NumericRule] = {
+    "SeniorCitizen": NumericRule(allowed=[0, 1]),
+    "tenure": NumericRule(minimum=0),
+    "MonthlyCharges": NumericRule(minimum=0),
+    # Blank for new customers in the raw extract; DataCleaner fills it with 0
+    "TotalCharges": NumericRule(minimum=0, nullable=True),
+}
+
+_DOMAIN_SETS = {col: frozenset(values) for col, values in CATEGORICAL_DOMAINS.items()}
+
+
+def record_violations(record: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Checks one model-input record (feature name -> value) against the domains.
+    Returns {column: message} for every violating column; empty if the record is valid.
+    A few set lookups per record, cheap enough for every request.
+    """
+    violations = {}
+    for col, domain in _DOMAIN_SETS.items():
+        value = record.get(col)
+        if value not in domain:
+            violations[col] = f"{value!r} is not one of {CATEGORICAL_DOMAINS[col]}"
+    for col, rule in NUMERIC_RULES.items():
+        message = rule.violation(record.get(col))
+        if message is not None:
+            violations[col] = message
+    return violations
@@ -1,44 +1,144 @@
-import pandas as pd
-import pandera as pa
-from pandera import Column, DataFrameSchema, Check
+import time
 import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion.ingestor import NUMERIC_DTYPES
+from src.data_validation.domains import CATEGORICAL_DOMAINS, NUMERIC_RULES, TARGET_DOMAIN, NumericRule
 
 logger = logging.getLogger(__name__)
 
+
+class ValidationReport:
+    """
+    Result of a fast validation pass: violation counts per column over the rows checked
+    (all rows, or a sample), plus any required columns that are missing.
+    """
+    def __init__(self, total_rows: int, rows_checked: int, violations: Dict[str, int],
+                 missing_columns: List[str], seconds: float):
+        self.total_rows = total_rows
+        self.rows_checked = rows_checked
+        self.violations = violations
+        self.missing_columns = missing_columns
+        self.seconds = seconds
+
+    @property
+    def sampled(self) -> bool:
+        return self.rows_checked < self.total_rows
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.missing_columns and not any(self.violations.values())
+
+    def failing_columns(self) -> Dict[str, int]:
+        return {col: count for col, count in self.violations.items() if count}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_rows": self.total_rows,
+            "rows_checked": self.rows_checked,
+            "sampled": self.sampled,
+            "is_valid": self.is_valid,
+            "missing_columns": self.missing_columns,
+            "violations": self.failing_columns(),
+            "seconds": round(self.seconds, 4),
+        }
+
+
+def categorical_violations(series: pd.Series, domain: List[str]) -> int:
+    """
+    Values outside `domain`, nulls included. For a category column only the (few)
+    categories are looked up; the per-row work is one take over the integer codes.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Code -1 (missing) indexes the trailing True
+        invalid = np.append(~series.cat.categories.isin(domain), True)
+        return int(invalid[series.cat.codes.to_numpy()].sum())
+    return int((~series.isin(domain)).sum())
+
+
+def numeric_violations(series: pd.Series, rule: NumericRule) -> int:
+    """
+    Non-numeric values, disallowed nulls, values below the minimum or outside the allowed set.
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        invalid = np.zeros(len(values), dtype=bool)
+    else:
+        coerced = pd.to_numeric(series, errors="coerce")
+        values = coerced.to_numpy(dtype=np.float64, na_value=np.nan)
+        # Strings that don't parse as numbers
+        invalid = (coerced.isna() & series.notna()).to_numpy()
+    missing = np.isnan(values)
+    if not rule.nullable:
+        invalid |= missing
+    # NaN compares False, so nulls are only counted through `missing`
+    if rule.minimum is not None:
+        invalid |= values < rule.minimum
+    if rule.allowed is not None:
+        invalid |= ~np.isin(values, rule.allowed) & ~missing
+    return int(invalid.sum())
+
+
 class DataValidator:
-    def __init__(self):
-        self.schema = DataFrameSchema({
-            "customerID": Column(str, required=True),
-            "gender": Column(str, checks=Check.isin(["Male", "Female"]), nullable=False),
-            "SeniorCitizen": Column(int, checks=Check.isin([0, 1]), nullable=False),
-            "Partner": Column(str, checks=Check.isin(["Yes", "No"]), nullable=False),
-            "Dependents": Column(str, checks=Check.isin(["Yes", "No"]), nullable=False),
-            "tenure": Column(int, checks=Check.ge(0), nullable=False),
-            "PhoneService": Column(str, checks=Check.isin(["Yes", "No"]), nullable=False),
-            "MultipleLines": Column(str, nullable=False), # "No phone service" is also a value
-            "InternetService": Column(str, checks=Check.isin(["DSL", "Fiber optic", "No"]), nullable=False),
-            "OnlineSecurity": Column(str, nullable=False),
-            "OnlineBackup": Column(str, nullable=False),
-            "DeviceProtection": Column(str, nullable=False),
-            "TechSupport": Column(str, nullable=False),
-            "StreamingTV": Column(str, nullable=False),
-            "StreamingMovies": Column(str, nullable=False),
-            "Contract": Column(str, checks=Check.isin(["Month-to-month", "One year", "Two year"]), nullable=False),
-            "PaperlessBilling": Column(str, checks=Check.isin(["Yes", "No"]), nullable=False),
-            "PaymentMethod": Column(str, nullable=False),
-            "MonthlyCharges": Column(float, checks=Check.ge(0), nullable=False),
-            # TotalCharges is float after cleaning, but might be object initially. Validation happens AFTER cleaning?
-            # Or before? Usually validator checks "Processed" data schema or "Raw" data schema.
-            # Let's assume we validate CLEANED data.
-            "TotalCharges": Column(float, checks=Check.ge(0), nullable=True), 
-            "Churn": Column(str, checks=Check.isin(["Yes", "No"]), nullable=False),
-        })
+    """
+    Validates cleaned data (as typed by DataIngestor) against the shared domains
+    in src/data_validation/domains.py.
+
+    - mode="full": pandera DataFrameSchema (dtypes and value checks); raises SchemaError
+      on the first failing column.
+    - mode="fast": vectorized domain checks without pandera. Counts violations for every
+      column and logs them instead of raising. Values only; dtypes are not enforced.
+    - mode="sampled": "fast" on a random sample of `sample_size` rows.
+    """
+    MODES = ("full", "fast", "sampled")
+
+    def __init__(self, mode: str = "full", sample_size: int = 100_000, random_state: Optional[int] = 42,
+                 target_col: str = "Churn"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown validation mode '{mode}'; expected one of {self.MODES}.")
+        self.mode = mode
+        self.sample_size = sample_size
+        self.random_state = random_state
+        self.target_col = target_col
+        self._schema = None
+
+    @property
+    def schema(self):
+        # pandera is only imported for full validation
+        if self._schema is None:
+            self._schema = self.build_schema()
+        return self._schema
+
+    def build_schema(self):
+        from pandera import Column, DataFrameSchema, Check
+        columns = {"customerID": Column("string", required=True)}
+        for col, domain in CATEGORICAL_DOMAINS.items():
+            columns[col] = Column("category", checks=Check.isin(domain), nullable=False)
+        for col, rule in NUMERIC_RULES.items():
+            checks = []
+            if rule.allowed is not None:
+                checks.append(Check.isin(rule.allowed))
+            if rule.minimum is not None:
+                checks.append(Check.ge(rule.minimum))
+            columns[col] = Column(NUMERIC_DTYPES[col], checks=checks, nullable=rule.nullable)
+        columns[self.target_col] = Column("category", checks=Check.isin(TARGET_DOMAIN), nullable=False)
+        return DataFrameSchema(columns)
 
     def validate(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Validates the dataframe against the schema.
-        Returns the dataframe if valid, raises SchemaError otherwise.
+        Full mode returns the dataframe if valid and raises SchemaError otherwise;
+        fast/sampled modes log a per-column violation report and return the dataframe.
         """
+        if self.mode != "full":
+            report = self.check(df)
+            self.log_report(report)
+            return df
+
+        import pandera as pa
         try:
             validated_df = self.schema.validate(df)
             logger.info("Data Validation Passed.")
@@ -46,3 +146,42 @@ class DataValidator:
         except pa.errors.SchemaError as e:
             logger.error(f"Data Validation Failed: {e}")
             raise e
+
+    def check(self, df: pd.DataFrame) -> ValidationReport:
+        """
+        Fast validation: violation counts per column (over a sample in "sampled" mode).
+        """
+        start = time.perf_counter()
+        total_rows = len(df)
+        if self.mode == "sampled" and total_rows > self.sample_size:
+            rows = np.random.default_rng(self.random_state).choice(total_rows, self.sample_size, replace=False)
+            df = df.iloc[np.sort(rows)]
+
+        violations, missing = {}, []
+        if "customerID" in df.columns:
+            violations["customerID"] = int(df["customerID"].isna().sum())
+        else:
+            missing.append("customerID")
+        domains = {**CATEGORICAL_DOMAINS, self.target_col: TARGET_DOMAIN}
+        for col, domain in domains.items():
+            if col in df.columns:
+                violations[col] = categorical_violations(df[col], domain)
+            else:
+                missing.append(col)
+        for col, rule in NUMERIC_RULES.items():
+            if col in df.columns:
+                violations[col] = numeric_violations(df[col], rule)
+            else:
+                missing.append(col)
+        return ValidationReport(total_rows, len(df), violations, missing, time.perf_counter() - start)
+
+    @staticmethod
+    def log_report(report: ValidationReport):
+        scope = f"{report.rows_checked:,} sampled of {report.total_rows:,}" if report.sampled else f"{report.total_rows:,}"
+        if report.is_valid:
+            logger.info(f"Data Validation Passed ({scope} rows in {report.seconds * 1e3:.1f} ms).")
+            return
+        if report.missing_columns:
+            logger.warning(f"Data Validation: missing columns {report.missing_columns}")
+        for col, count in report.failing_columns().items():
+            logger.warning(f"Data Validation: {col}: {count:,} of {report.rows_checked:,} rows outside the allowed values")
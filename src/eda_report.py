@@ -1,64 +1,193 @@
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing
 import os
+import sys
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.stats import gaussian_kde
+from src.data_ingestion.ingestor import DataIngestor
 from src.data_validation.cleaner import DataCleaner
+from src.utils.config import load_config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def generate_eda_report(data_path, output_dir):
-    logger.info(f"Loading data from {data_path}...")
-    try:
-        df = pd.read_csv(data_path)
-    except FileNotFoundError:
-        logger.error("Data file not found.")
-        return
+# Only these columns are read from the columnar dataset (customerID keeps rows distinct for dedup)
+EDA_COLUMNS = ['customerID', 'SeniorCitizen', 'tenure', 'MonthlyCharges', 'TotalCharges', 'Churn']
+MANIFEST = "eda_manifest.json"
+KDE_POINTS = 200
 
-    # Clean data first to handle TotalCharges
-    cleaner = DataCleaner()
-    df = cleaner.clean_data(df)
+# Figures are rendered from the aggregates below, never from the full frame:
+# - histograms are binned counts over every row (one bincount per column),
+# - KDE curves are fitted on a uniform sample of at most `kde_sample_size` rows per class,
+# - the correlation matrix is one np.corrcoef over the numeric columns.
 
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # 1. Target Distribution
-    plt.figure(figsize=(6, 4))
-    sns.countplot(x='Churn', data=df)
-    plt.title('Target Distribution (Churn)')
-    plt.savefig(os.path.join(output_dir, 'churn_distribution.png'))
-    plt.close()
-    
-    # 2. Tenure Distribution by Churn
-    plt.figure(figsize=(10, 6))
-    sns.histplot(data=df, x='tenure', hue='Churn', kde=True, element="step")
-    plt.title('Tenure Distribution by Churn')
-    plt.savefig(os.path.join(output_dir, 'tenure_by_churn.png'))
-    plt.close()
-    
-    # 3. MonthlyCharges Distribution by Churn
-    plt.figure(figsize=(10, 6))
-    sns.kdeplot(data=df, x='MonthlyCharges', hue='Churn', fill=True)
-    plt.title('Monthly Charges Distribution by Churn')
-    plt.savefig(os.path.join(output_dir, 'charges_by_churn.png'))
-    plt.close()
-    
-    # 4. Correlation Matrix (Numerical)
-    num_cols = df.select_dtypes(include=['float64', 'int64']).columns
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(df[num_cols].corr(), annot=True, cmap='coolwarm', fmt=".2f")
-    plt.title('Correlation Matrix')
-    plt.savefig(os.path.join(output_dir, 'correlation_matrix.png'))
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def report_key(data_path: str, eda_config: Dict[str, Any]) -> str:
+    """
+    Hash of the input data, the EDA settings and this module's code: the report is only
+    regenerated when one of them changes.
+    """
+    inputs = {
+        "data_hash": file_hash(data_path),
+        "settings": eda_config,
+        "code_hash": hashlib.sha256(inspect.getsource(sys.modules[__name__]).encode("utf-8")).hexdigest(),
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def class_sample(codes: np.ndarray, n_classes: int, size: int, rng: np.random.Generator) -> Dict[int, np.ndarray]:
+    """
+    Row indices of a uniform random sample (without replacement) of at most `size` rows per class.
+    """
+    samples = {}
+    for c in range(n_classes):
+        rows = np.flatnonzero(codes == c)
+        samples[c] = rows if len(rows) <= size else np.sort(rng.choice(rows, size, replace=False))
+    return samples
+
+
+def kde_curve(values: np.ndarray, cut: float, grid: Optional[np.ndarray] = None):
+    """
+    Gaussian KDE (Scott's bandwidth, as seaborn) evaluated on KDE_POINTS points, extending
+    `cut` bandwidths beyond the data unless a grid is given.
+    """
+    if len(values) < 2 or np.ptp(values) == 0:
+        return None
+    kde = gaussian_kde(values)
+    if grid is None:
+        bw = kde.factor * values.std(ddof=1)
+        grid = np.linspace(values.min() - cut * bw, values.max() + cut * bw, KDE_POINTS)
+    return grid, kde(grid)
+
+
+def churn_counts(df: pd.DataFrame) -> Dict[str, Any]:
+    churn = df['Churn'].astype('category')
+    labels = [str(c) for c in churn.cat.categories]
+    codes = churn.cat.codes.to_numpy()
+    return {"labels": labels, "codes": codes, "counts": np.bincount(codes[codes >= 0], minlength=len(labels))}
+
+
+def tenure_aggregates(df: pd.DataFrame, churn: Dict[str, Any], samples: Dict[int, np.ndarray]) -> Dict[str, Any]:
+    """
+    Per-class tenure histogram over every row (a single bincount on class * n_bins + bin)
+    and a KDE per class on the sample, scaled to counts as in seaborn's histplot(kde=True).
+    """
+    tenure = df['tenure'].to_numpy(dtype=np.float64)
+    edges = np.histogram_bin_edges(tenure, bins="auto")
+    n_bins = len(edges) - 1
+    bins = np.clip(np.searchsorted(edges, tenure, side="right") - 1, 0, n_bins - 1)
+    codes, labels = churn["codes"], churn["labels"]
+    valid = codes >= 0
+    counts = np.bincount(codes[valid] * n_bins + bins[valid], minlength=len(labels) * n_bins).reshape(len(labels), n_bins)
+    width = edges[1] - edges[0]
+    # As seaborn, the KDE spans the histogram's bins rather than each class's own range
+    grid = np.linspace(edges[0], edges[-1], KDE_POINTS)
+    curves = {}
+    for c, label in enumerate(labels):
+        curve = kde_curve(tenure[samples[c]], cut=0, grid=grid)
+        if curve is not None:
+            curves[label] = (curve[0], curve[1] * counts[c].sum() * width)
+    return {"labels": labels, "edges": edges, "counts": counts, "curves": curves}
+
+
+def charges_aggregates(df: pd.DataFrame, churn: Dict[str, Any], samples: Dict[int, np.ndarray]) -> Dict[str, Any]:
+    """
+    Per-class MonthlyCharges KDE on the sample, weighted by class share (seaborn's common_norm).
+    """
+    charges = df['MonthlyCharges'].to_numpy(dtype=np.float64)
+    total = churn["counts"].sum()
+    curves = {}
+    for c, label in enumerate(churn["labels"]):
+        curve = kde_curve(charges[samples[c]], cut=3)
+        if curve is not None:
+            curves[label] = (curve[0], curve[1] * churn["counts"][c] / total)
+    return {"labels": churn["labels"], "curves": curves}
+
+
+def correlation_aggregates(df: pd.DataFrame) -> Dict[str, Any]:
+    num_cols = list(df.select_dtypes(include='number').columns)
+    values = df[num_cols].to_numpy(dtype=np.float64)
+    return {"columns": num_cols, "corr": np.corrcoef(values, rowvar=False)}
+
+
+def render_figure(name: str, data: Dict[str, Any], path: str) -> float:
+    """
+    Draws one figure from its aggregates and saves it to `path`. Runs in a worker process.
+    Returns the render time in seconds.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    start = time.perf_counter()
+    palette = sns.color_palette()
+    if name == "churn_distribution":
+        plt.figure(figsize=(6, 4))
+        sns.barplot(x=data["labels"], y=data["counts"])
+        plt.xlabel("Churn")
+        plt.ylabel("count")
+        plt.title('Target Distribution (Churn)')
+    elif name == "tenure_by_churn":
+        plt.figure(figsize=(10, 6))
+        for c, label in enumerate(data["labels"]):
+            plt.stairs(data["counts"][c], data["edges"], fill=True, color=palette[c], alpha=0.25)
+            plt.stairs(data["counts"][c], data["edges"], color=palette[c], label=label)
+            if label in data["curves"]:
+                plt.plot(*data["curves"][label], color=palette[c])
+        plt.xlabel("tenure")
+        plt.ylabel("Count")
+        plt.legend(title="Churn")
+        plt.title('Tenure Distribution by Churn')
+    elif name == "charges_by_churn":
+        plt.figure(figsize=(10, 6))
+        for c, label in enumerate(data["labels"]):
+            if label in data["curves"]:
+                grid, density = data["curves"][label]
+                plt.fill_between(grid, density, color=palette[c], alpha=0.25)
+                plt.plot(grid, density, color=palette[c], label=label)
+        plt.ylim(bottom=0)
+        plt.xlabel("MonthlyCharges")
+        plt.ylabel("Density")
+        plt.legend(title="Churn")
+        plt.title('Monthly Charges Distribution by Churn')
+    elif name == "correlation_matrix":
+        plt.figure(figsize=(10, 8))
+        sns.heatmap(pd.DataFrame(data["corr"], index=data["columns"], columns=data["columns"]),
+                    annot=True, cmap='coolwarm', fmt=".2f")
+        plt.title('Correlation Matrix')
+    else:
+        raise ValueError(f"Unknown figure '{name}'")
+    plt.savefig(path)
     plt.close()
+    return time.perf_counter() - start
+
 
-    # Generate Markdown Summary
+def write_summary(output_dir: str, n_rows: int, n_columns: int, churn_rate: float):
     report_path = os.path.join(output_dir, "eda_summary.md")
     with open(report_path, "w") as f:
         f.write("# Exploratory Data Analysis Report\n\n")
-        f.write(f"**Total Samples**: {len(df)}\n")
-        f.write(f"**Columns**: {len(df.columns)}\n\n")
+        f.write(f"**Total Samples**: {n_rows}\n")
+        f.write(f"**Columns**: {n_columns}\n\n")
         f.write("## Churn Distribution\n")
-        f.write(f"Churn Rate: {df['Churn'].value_counts(normalize=True)['Yes']:.2%}\n")
+        f.write(f"Churn Rate: {churn_rate:.2%}\n")
         f.write(f"![Churn Dist](churn_distribution.png)\n\n")
         f.write("## Key Insights\n")
         f.write("- **Tenure**: New customers (low tenure) are more likely to churn.\n")
@@ -68,7 +197,115 @@ def generate_eda_report(data_path, output_dir):
         f.write("1. **Price Sensitivity**: Customers with higher monthly bills churn more. Hypothesis: Offering down-sell options might save them.\n")
         f.write("2. **Early Life Churn**: High churn in first 6 months. Hypothesis: Onboarding is critical.\n")
 
-    logger.info(f"EDA Report generated at {output_dir}")
+
+def generate_eda_report(data_path=None, output_dir="artifacts/eda", config=None, force=False):
+    """
+    Writes the EDA figures, eda_summary.md and eda_manifest.json (input hash and
+    per-figure timings) to `output_dir`. `data_path` (a raw CSV or a Parquet extract)
+    defaults to the typed dataset at data.processed_path, rebuilt first if the raw CSV is
+    newer. Skipped when the input data, the `eda` settings and this module are unchanged
+    since the last run, unless `force`.
+    """
+    config = config or load_config()
+    eda_config = config.get('eda', {})
+    ingestor = DataIngestor(config)
+    df = None
+    try:
+        if data_path is None:
+            df = ingestor.ingest()  # rebuilds the Parquet file first if the raw CSV is newer
+            data_path = ingestor.processed_path
+        elif not os.path.exists(data_path):
+            raise FileNotFoundError(data_path)
+    except FileNotFoundError:
+        logger.error("Data file not found.")
+        return
+
+    key = report_key(data_path, eda_config)
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        if previous.get("key") == key and all(os.path.exists(os.path.join(output_dir, fig["file"])) for fig in previous["figures"]):
+            logger.info(f"Input data unchanged since {previous['created_at']} ({key}); skipping EDA report.")
+            return previous
+
+    start = time.perf_counter()
+    logger.info(f"Loading data from {data_path}...")
+    if df is not None:
+        df = df[EDA_COLUMNS]
+    elif data_path.endswith((".parquet", ".pq")):
+        df = pd.read_parquet(data_path, columns=EDA_COLUMNS)
+    else:
+        # A CSV gets the same typed read as the raw data
+        df = ingestor.read_raw(data_path)[EDA_COLUMNS]
+
+    # Clean data first to handle TotalCharges
+    cleaner = DataCleaner()
+    df = cleaner.clean_data(df)
+    load_seconds = time.perf_counter() - start
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Aggregates: one vectorized pass per figure, timed separately
+    timings: Dict[str, Dict[str, float]] = {}
+    aggregates: Dict[str, Dict[str, Any]] = {}
+
+    def timed(name, fn, *args):
+        t = time.perf_counter()
+        aggregates[name] = fn(*args)
+        timings[name] = {"aggregate_seconds": time.perf_counter() - t}
+
+    t = time.perf_counter()
+    churn = churn_counts(df)
+    rng = np.random.default_rng(config['project']['random_seed'])
+    samples = class_sample(churn["codes"], len(churn["labels"]), eda_config.get('kde_sample_size', 50_000), rng)
+    shared_seconds = time.perf_counter() - t
+    timed("churn_distribution", lambda: {"labels": churn["labels"], "counts": churn["counts"]})
+    timed("tenure_by_churn", tenure_aggregates, df, churn, samples)
+    timed("charges_by_churn", charges_aggregates, df, churn, samples)
+    timed("correlation_matrix", correlation_aggregates, df)
+
+    # Rendering: one figure per worker process
+    n_jobs = eda_config.get('n_jobs', -1)
+    workers = min(os.cpu_count() if n_jobs in (None, -1) else n_jobs, len(aggregates))
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {
+            name: pool.submit(render_figure, name, data, os.path.join(output_dir, f"{name}.png"))
+            for name, data in aggregates.items()
+        }
+        for name, future in futures.items():
+            timings[name]["render_seconds"] = future.result()
+
+    counts = churn["counts"]
+    churn_label = config['data'].get('churn_label', 'Yes')
+    churn_rate = counts[churn["labels"].index(churn_label)] / counts.sum() if churn_label in churn["labels"] else 0.0
+    write_summary(output_dir, len(df), len(ingestor.dtypes), churn_rate)
+
+    manifest = {
+        "key": key,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "rows": len(df),
+        "kde_sample_rows": {label: int(len(samples[c])) for c, label in enumerate(churn["labels"])},
+        "load_seconds": round(load_seconds, 4),
+        "shared_aggregate_seconds": round(shared_seconds, 4),
+        "figures": [
+            {"name": name, "file": f"{name}.png", **{k: round(v, 4) for k, v in timings[name].items()}}
+            for name in aggregates
+        ],
+        "total_seconds": round(time.perf_counter() - start, 3),
+    }
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    for fig in manifest["figures"]:
+        logger.info(f"{fig['name']:<20} aggregate {fig['aggregate_seconds'] * 1e3:8.1f} ms, render {fig['render_seconds'] * 1e3:8.1f} ms")
+    logger.info(f"EDA Report generated at {output_dir} in {manifest['total_seconds']:.2f}s ({workers} render workers)")
+    return manifest
 
 if __name__ == "__main__":
-    generate_eda_report("data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv", "artifacts/eda")
+    parser = argparse.ArgumentParser(description="Generate the EDA figures and summary.")
+    parser.add_argument("--data", type=str, default=None, help="CSV or Parquet to analyse (default: data.processed_path)")
+    parser.add_argument("--output-dir", type=str, default="artifacts/eda")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the input data is unchanged")
+    args = parser.parse_args()
+    generate_eda_report(args.data, args.output_dir, force=args.force)
@@ -0,0 +1,207 @@
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.metrics import roc_auc_score, recall_score, precision_score, f1_score, precision_recall_curve
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from src.utils.matrices import save_matrix, load_matrix
+
+logger = logging.getLogger("ChurnPrediction.evaluation")
+
+METRICS = ("roc_auc", "recall", "precision", "f1")
+
+
+def recall_at_precision(y_true: np.ndarray, y_prob: np.ndarray, precision_floor: float) -> Tuple[float, float]:
+    """
+    Highest recall over decision thresholds whose precision is at least `precision_floor`,
+    and that threshold. (0.0, 1.0) if no threshold reaches the floor.
+    """
+    precision, recall, thresholds = precision_recall_curve(y_true, y_prob)
+    # The final (precision=1, recall=0) point has no threshold
+    eligible = precision[:-1] >= precision_floor
+    if not eligible.any():
+        return 0.0, 1.0
+    best = int(np.argmax(np.where(eligible, recall[:-1], -1.0)))
+    return float(recall[best]), float(thresholds[best])
+
+
+def _build_model(name: str, random_state: int, model_params: Dict[str, Any]):
+    if name == "baseline":
+        from src.models.baseline import BaselineModel
+        return BaselineModel(random_state=random_state)
+    from src.models.challenger import ChallengerModel
+    return ChallengerModel(random_state=random_state, n_jobs=1, **model_params)
+
+
+def _run_fold(name: str, fold: int, data_dir: str, random_state: int, model_params: Dict[str, Any],
+              validation_size: float) -> Dict[str, Any]:
+    """
+    Fits model `name` on the training rows of `fold` and scores its held-out rows.
+    Runs in a worker process pinned to one thread; dense matrices are memory-mapped.
+    """
+    X = load_matrix(data_dir, f"X_{name}", mmap_mode="r")
+    y = np.load(os.path.join(data_dir, "y.npy"))
+    train_idx = np.load(os.path.join(data_dir, f"fold{fold}_train.npy"))
+    test_idx = np.load(os.path.join(data_dir, f"fold{fold}_test.npy"))
+    X_fit, y_fit = X[train_idx], y[train_idx]
+
+    start = time.perf_counter()
+    model = _build_model(name, random_state, model_params)
+    if getattr(model, "early_stopping_rounds", None):
+        # Same early stopping as the final fit, on a split of this fold's training rows
+        fit_rows, val_rows = train_test_split(
+            np.arange(len(y_fit)), test_size=validation_size, stratify=y_fit, random_state=random_state
+        )
+        model.fit(X_fit[fit_rows], y_fit[fit_rows], eval_set=[(X_fit[val_rows], y_fit[val_rows])])
+        model = model.refit_best(X_fit, y_fit)
+    else:
+        model.fit(X_fit, y_fit)
+    fit_seconds = time.perf_counter() - start
+
+    y_test = y[test_idx]
+    y_prob = model.predict_proba(X[test_idx])[:, 1]
+    y_pred = (y_prob >= 0.5).astype(int)
+    return {
+        "model": name,
+        "fold": fold,
+        "test_idx": test_idx,
+        "y_prob": y_prob,
+        "roc_auc": roc_auc_score(y_test, y_prob),
+        "recall": recall_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, zero_division=0),
+        "f1": f1_score(y_test, y_pred),
+        "fit_seconds": round(fit_seconds, 3),
+    }
+
+
+class ModelComparison:
+    """
+    Stratified k-fold comparison of several models on the training split, with the folds of
+    every model run in one process pool of `n_jobs` workers (one thread each).
+
+    Each model gets its own feature matrix (e.g. dense for the Baseline, CSR for the
+    Challenger), written once to `work_dir` and memory-mapped by the workers, as in
+    src/training/tuning.py. Models are ranked by recall at `precision_floor`, computed on
+    the pooled out-of-fold predictions. The incumbent stays champion unless another
+    model beats it by at least `min_improvement`.
+    """
+    def __init__(self, selection_config: Dict[str, Any], random_state: int = 42,
+                 work_dir: str = "artifacts/evaluation", validation_size: float = 0.15):
+        self.n_folds = selection_config.get("n_folds", 5)
+        n_jobs = selection_config.get("n_jobs", -1)
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.precision_floor = selection_config.get("precision_floor", 0.5)
+        self.min_improvement = selection_config.get("min_improvement", 0.0)
+        self.incumbent = selection_config.get("incumbent", "baseline")
+        self.random_state = random_state
+        self.work_dir = work_dir
+        self.validation_size = validation_size
+
+    def _cache_features(self, matrices: Dict[str, Any], y: np.ndarray) -> str:
+        data_dir = os.path.join(self.work_dir, "features")
+        if os.path.isdir(data_dir):
+            shutil.rmtree(data_dir)
+        os.makedirs(data_dir, exist_ok=True)
+        for name, X in matrices.items():
+            save_matrix(data_dir, f"X_{name}", X if sp.issparse(X) else np.asarray(X))
+        np.save(os.path.join(data_dir, "y.npy"), y)
+        folds = StratifiedKFold(n_splits=self.n_folds, shuffle=True, random_state=self.random_state)
+        for fold, (train_idx, test_idx) in enumerate(folds.split(np.zeros(len(y)), y)):
+            np.save(os.path.join(data_dir, f"fold{fold}_train.npy"), train_idx)
+            np.save(os.path.join(data_dir, f"fold{fold}_test.npy"), test_idx)
+        return data_dir
+
+    def evaluate(self, matrices: Dict[str, Any], y, model_params: Dict[str, Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        `matrices`: {model name: transformed training features}, all with the rows of `y`.
+        `model_params`: extra constructor arguments per model name.
+        Returns {model name: summary}; see `_summarize`.
+        """
+        y = np.asarray(y)
+        model_params = model_params or {}
+        data_dir = self._cache_features(matrices, y)
+        tasks = [(name, fold) for name in matrices for fold in range(self.n_folds)]
+        workers = min(self.n_jobs, len(tasks))
+        logger.info(f"Cross-validating {list(matrices)}: {self.n_folds} stratified folds, {len(tasks)} fits on {workers} workers")
+
+        start = time.perf_counter()
+        # 'spawn' keeps workers clear of any OpenMP/BLAS state initialized in the parent
+        context = multiprocessing.get_context("spawn")
+        results: Dict[str, List[Dict[str, Any]]] = {name: [] for name in matrices}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_run_fold, name, fold, data_dir, self.random_state, model_params.get(name, {}), self.validation_size)
+                for name, fold in tasks
+            ]
+            for future in futures:
+                result = future.result()
+                logger.info(f"{result['model']} fold {result['fold']}: recall={result['recall']:.4f}, "
+                            f"roc_auc={result['roc_auc']:.4f} ({result['fit_seconds']}s)")
+                results[result["model"]].append(result)
+        shutil.rmtree(data_dir)
+        logger.info(f"Cross-validation finished in {time.perf_counter() - start:.1f}s")
+        return {name: self._summarize(folds, y) for name, folds in results.items()}
+
+    def _summarize(self, folds: List[Dict[str, Any]], y: np.ndarray) -> Dict[str, Any]:
+        # Out-of-fold probabilities cover every training row exactly once
+        oof = np.empty(len(y))
+        for fold in folds:
+            oof[fold["test_idx"]] = fold["y_prob"]
+        recall, threshold = recall_at_precision(y, oof, self.precision_floor)
+        summary = {
+            "recall_at_precision": recall,
+            "threshold": threshold,
+            "oof_roc_auc": float(roc_auc_score(y, oof)),
+            "folds": [{k: fold[k] for k in ("fold", *METRICS, "fit_seconds")} for fold in folds],
+        }
+        for metric in METRICS:
+            values = [fold[metric] for fold in folds]
+            summary[f"{metric}_mean"] = float(np.mean(values))
+            summary[f"{metric}_std"] = float(np.std(values))
+        return summary
+
+    def choose_champion(self, summaries: Dict[str, Dict[str, Any]]) -> str:
+        """
+        Highest recall at the precision floor (pooled out-of-fold ROC-AUC breaks ties);
+        the incumbent keeps the title unless beaten by `min_improvement`.
+        """
+        best = max(summaries, key=lambda name: (summaries[name]["recall_at_precision"], summaries[name]["oof_roc_auc"]))
+        if self.incumbent in summaries and best != self.incumbent:
+            margin = summaries[best]["recall_at_precision"] - summaries[self.incumbent]["recall_at_precision"]
+            if margin < self.min_improvement:
+                logger.info(f"{best} leads {self.incumbent} by {margin:+.4f} recall, below min_improvement "
+                            f"{self.min_improvement}; keeping {self.incumbent}")
+                return self.incumbent
+        return best
+
+    def log_summary(self, summaries: Dict[str, Dict[str, Any]]):
+        logger.info(f"Cross-validated comparison (recall at precision >= {self.precision_floor}):")
+        for name, s in summaries.items():
+            logger.info(
+                f"  {name:<12} recall@p={s['recall_at_precision']:.4f} (threshold {s['threshold']:.3f}), "
+                f"roc_auc={s['roc_auc_mean']:.4f}±{s['roc_auc_std']:.4f}, recall={s['recall_mean']:.4f}±{s['recall_std']:.4f}, "
+                f"precision={s['precision_mean']:.4f}±{s['precision_std']:.4f}"
+            )
+
+    def write_report(self, summaries: Dict[str, Dict[str, Any]], champion: str) -> str:
+        os.makedirs(self.work_dir, exist_ok=True)
+        path = os.path.join(self.work_dir, "cv_report.json")
+        report = {
+            "n_folds": self.n_folds,
+            "precision_floor": self.precision_floor,
+            "min_improvement": self.min_improvement,
+            "incumbent": self.incumbent,
+            "champion": champion,
+            "models": summaries,
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return path
@@ -0,0 +1,92 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Optional, Tuple, Dict, Any
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import transformers
+from src.utils.matrices import save_matrix, load_matrix
+
+logger = logging.getLogger("ChurnPrediction.feature_cache")
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Content hash of a DataFrame: row values (including index), column names and dtypes.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    Content-addressed on-disk cache of the fitted feature pipeline and its output.
+
+    The key combines the train/test data hashes with a hash of the feature pipeline
+    definition (its parameters and the source of the custom transformers), so any change
+    to data, config or transformer code produces a new entry. Each entry holds:
+    - X_train / X_test: transformed matrices shared by every model fit (.npy, or .npz when sparse),
+    - feature_pipeline.joblib: the fitted pipeline, embedded into the saved model artifacts,
+    - meta.json: shapes and the inputs that produced the key.
+    """
+    def __init__(self, cache_dir: str = "artifacts/feature_cache"):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(feature_pipeline, X_train: pd.DataFrame, X_test: pd.DataFrame) -> Tuple[str, Dict[str, Any]]:
+        inputs = {
+            "train_hash": hash_frame(X_train),
+            "test_hash": hash_frame(X_test),
+            "pipeline_hash": hashlib.sha256(repr(feature_pipeline.get_params(deep=True)).encode("utf-8")).hexdigest(),
+            "code_hash": hashlib.sha256(inspect.getsource(transformers).encode("utf-8")).hexdigest(),
+        }
+        key = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+        return key, inputs
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str):
+        """
+        Returns (feature_pipeline, X_train_t, X_test_t) or None on a cache miss.
+        """
+        entry = self._entry_dir(key)
+        if not os.path.exists(os.path.join(entry, "meta.json")):
+            return None
+        try:
+            feature_pipeline = joblib.load(os.path.join(entry, "feature_pipeline.joblib"))
+            X_train_t = load_matrix(entry, "X_train")
+            X_test_t = load_matrix(entry, "X_test")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feature cache entry {key}: {e}")
+            return None
+        return feature_pipeline, X_train_t, X_test_t
+
+    def save(self, key: str, inputs: Dict[str, Any], feature_pipeline, X_train_t: np.ndarray, X_test_t: np.ndarray):
+        """
+        Writes the entry into a temporary directory and renames it into place, so a crashed
+        or concurrent run never leaves a partial entry behind.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            joblib.dump(feature_pipeline, os.path.join(tmp_dir, "feature_pipeline.joblib"))
+            save_matrix(tmp_dir, "X_train", X_train_t)
+            save_matrix(tmp_dir, "X_test", X_test_t)
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+                json.dump({**inputs, "X_train_shape": list(X_train_t.shape), "X_test_shape": list(X_test_t.shape)}, f, indent=2)
+            os.replace(tmp_dir, self._entry_dir(key))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            # Another run may have published the same key first; its content is identical
+            if not os.path.exists(os.path.join(self._entry_dir(key), "meta.json")):
+                raise
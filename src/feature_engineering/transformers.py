@@ -25,7 +25,7 @@ class TenureBinning(BaseEstimator, TransformerMixin):
     def transform(self, X):
         X = X.copy()
         if 'tenure' in X.columns:
-            logger.info("Binning 'tenure' into cohorts.")
+            logger.debug("Binning 'tenure' into cohorts.")
             X['tenure_group'] = pd.cut(X['tenure'], bins=self.bins, labels=self.labels, right=True)
             # Convert to string to treat as categorical for OHE later
             X['tenure_group'] = X['tenure_group'].astype(str)
@@ -50,7 +50,7 @@ class LogTransformer(BaseEstimator, TransformerMixin):
         X = X.copy()
         for col in self.columns:
             if col in X.columns:
-                logger.info(f"Applying log1p transformation to {col}")
+                logger.debug(f"Applying log1p transformation to {col}")
                 # Using log1p to handle 0s gracefully
                 X[f'{col}_log'] = np.log1p(X[col])
         return X
@@ -73,11 +73,60 @@ class InteractionFeatures(BaseEstimator, TransformerMixin):
     def transform(self, X):
         X = X.copy()
         if 'TotalCharges' in X.columns and 'tenure' in X.columns:
-            logger.info("Creating interaction feature: AvgCharges (Total / Tenure)")
+            logger.debug("Creating interaction feature: AvgCharges (Total / Tenure)")
             # Avoid division by zero
             X['calculated_AvgCharges'] = X['TotalCharges'] / (X['tenure'].replace(0, 1))
         return X
 
+class EngineeredFeatures(BaseEstimator, TransformerMixin):
+    """
+    Fused, single-pass equivalent of InteractionFeatures -> TenureBinning -> LogTransformer.
+
+    Produces the same columns with bit-identical values ('calculated_AvgCharges',
+    'tenure_group', '<col>_log'), computed directly on the numpy arrays:
+    - AvgCharges: TotalCharges / tenure in the input dtypes, with a tenure of 0 dividing by 1.
+    - tenure_group: np.digitize(right=True) matches pd.cut(right=True); values outside the
+      bins (including tenure 0) and NaN map to 'nan', as pd.cut(...).astype(str) does.
+    - log1p of each column in `log_columns`.
+    The input frame is shallow-copied, so its column data is never duplicated.
+
+    The separate transformers above are kept so previously saved model artifacts still load.
+    """
+    def __init__(self, bins=[0, 12, 24, 60, np.inf], labels=['0-12', '12-24', '24-60', '60+'], log_columns=['TotalCharges']):
+        self.bins = bins
+        self.labels = labels
+        self.log_columns = log_columns
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        X = X.copy(deep=False)
+        has_tenure = 'tenure' in X.columns
+        if has_tenure:
+            tenure = X['tenure'].to_numpy(dtype=np.float64)
+
+        if has_tenure and 'TotalCharges' in X.columns:
+            # Divide in the input dtypes (float32 charges from DataIngestor stay float32), as pandas does
+            denominator = X['tenure'].to_numpy(copy=True)
+            denominator[denominator == 0] = 1
+            X['calculated_AvgCharges'] = X['TotalCharges'].to_numpy() / denominator
+
+        if has_tenure:
+            bins = np.asarray(self.bins, dtype=np.float64)
+            idx = np.digitize(tenure, bins, right=True)
+            # idx == 0: at/below the first edge; idx == len(bins): above the last edge or NaN
+            idx[(idx == 0) | (idx == len(bins))] = len(bins)
+            labels = np.array([str(l) for l in self.labels] + ['nan'], dtype=object)
+            X['tenure_group'] = labels[idx - 1]
+
+        for col in self.log_columns:
+            if col in X.columns:
+                X[f'{col}_log'] = np.log1p(X[col].to_numpy())
+
+        logger.debug(f"Engineered features for {len(X)} rows.")
+        return X
+
 class DropColumns(BaseEstimator, TransformerMixin):
     """
     Drops unnecessary columns (e.g., ID, or original cols after transformation).
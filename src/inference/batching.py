@@ -0,0 +1,205 @@
+import asyncio
+import bisect
+import logging
+from concurrent.futures import Executor
+from typing import Callable, Dict, Any, List, Optional, Sequence
+
+from src.inference.executor import Overloaded
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class CountHistogram:
+    """
+    Cumulative bucket counts for small integer observations (batch sizes, queue depths).
+    """
+    def __init__(self, buckets: Sequence[int] = DEFAULT_BUCKETS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0
+
+    def observe(self, value: int):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + ["+Inf"], self.counts):
+            running += n
+            cumulative[str(bound)] = running
+        return {
+            "buckets": cumulative,
+            "count": self.count,
+            "sum": self.total,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-record requests into vectorized batches.
+
+    Callers `await submit(record)`. A background task takes the first queued record,
+    keeps collecting until `max_batch_size` records are queued or `max_wait_ms` has
+    elapsed, scores them with one `score_fn(records)` call and resolves each caller's
+    future with its own result. Records arriving while a batch is being scored are
+    picked up by the next batch.
+
+    A coroutine `score_fn` is awaited (e.g. a call through the ScoringExecutor); a plain
+    function runs in `executor`. At most `max_queue` records wait (0: unbounded); further
+    submits raise Overloaded (429), as does every record of a batch the executor sheds.
+    """
+    def __init__(self, score_fn: Callable[[List[Dict[str, Any]]], List[Any]],
+                 max_batch_size: int = 64, max_wait_ms: float = 1.0,
+                 executor: Optional[Executor] = None, max_queue: int = 0, retry_after_seconds: int = 1):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.max_queue = max_queue
+        self.retry_after = retry_after_seconds
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.batch_sizes = CountHistogram()
+        self.queue_depths = CountHistogram()
+        self.batches = 0
+        self.records = 0
+        self.failed_batches = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(f"Micro-batcher started (max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait * 1000:g})")
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        # Fail anything still queued so callers don't hang
+        queued = []
+        while not self._queue.empty():
+            queued.append(self._queue.get_nowait())
+        self._fail(queued)
+        logger.info("Micro-batcher stopped.")
+
+    @staticmethod
+    def _fail(batch, error: Optional[Exception] = None):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error or RuntimeError("Micro-batcher stopped"))
+
+    async def submit(self, record: Dict[str, Any]) -> Any:
+        if not self.running:
+            raise RuntimeError("Micro-batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((record, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise Overloaded(f"Micro-batcher queue is full ({self.max_queue} records waiting)", 429, self.retry_after)
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                self.queue_depths.observe(self._queue.qsize() + 1)
+
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._score(loop, batch)
+            except asyncio.CancelledError:
+                # stop() cancelled us mid-batch: these records are off the queue, so fail them here
+                self._fail(batch)
+                raise
+
+    async def _score(self, loop, batch):
+        records = [record for record, _ in batch]
+        self.batches += 1
+        self.records += len(records)
+        self.batch_sizes.observe(len(records))
+
+        try:
+            results = await self._call(loop, records)
+        except Overloaded as e:
+            # Shed as a whole: rescoring record by record would only add load
+            results = [e] * len(records)
+        except Exception as e:
+            self.failed_batches += 1
+            logger.error(f"Batch of {len(records)} failed ({e}); rescoring records individually.")
+            results = await self._score_individually(loop, records)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue  # caller went away (e.g. client disconnect cancelled the request)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _call(self, loop, records):
+        if asyncio.iscoroutinefunction(self.score_fn):
+            return await self.score_fn(records)
+        return await loop.run_in_executor(self.executor, self.score_fn, records)
+
+    async def _score_individually(self, loop, records):
+        # Isolates a bad record so it doesn't fail every other caller in its batch
+        results = []
+        for record in records:
+            try:
+                results.append((await self._call(loop, [record]))[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_queue": self.max_queue,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "records": self.records,
+            "failed_batches": self.failed_batches,
+            "batch_size_histogram": self.batch_sizes.snapshot(),
+            "queue_depth_histogram": self.queue_depths.snapshot()
+        }
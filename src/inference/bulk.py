@@ -0,0 +1,172 @@
+import argparse
+import logging
+import os
+import time
+from typing import Iterator, Optional, Dict, Any
+
+import pandas as pd
+
+from src.data_validation.cleaner import DataCleaner
+from src.inference.predictor import ChurnPredictor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+SUPPORTED_FORMATS = ("csv", "parquet")
+
+
+def detect_format(path: str) -> str:
+    """
+    Infers the file format (csv/parquet) from the file extension.
+    """
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("parquet", "pq"):
+        return "parquet"
+    if ext == "csv":
+        return "csv"
+    raise ValueError(f"Unsupported file format '{ext}'. Expected one of {SUPPORTED_FORMATS}.")
+
+
+def _import_parquet():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet support requires 'pyarrow'. Install it with `pip install pyarrow`.") from e
+    return pa, pq
+
+
+def iter_chunks(source, file_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Yields the raw customer file as DataFrames of at most `chunk_size` rows.
+    `source` can be a path or a seekable binary file object (e.g. an upload).
+    Only one chunk is held in memory at a time.
+    """
+    if file_format == "csv":
+        # TotalCharges contains blanks in raw extracts; keep it as read and let the cleaner coerce it.
+        reader = pd.read_csv(source, chunksize=chunk_size)
+        with reader:
+            for chunk in reader:
+                yield chunk
+    elif file_format == "parquet":
+        _, pq = _import_parquet()
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported file format '{file_format}'. Expected one of {SUPPORTED_FORMATS}.")
+
+
+class ThroughputMeter:
+    """
+    Tracks rows processed and logs cumulative rows/sec after every chunk.
+    """
+    def __init__(self, log_every: int = 1):
+        self.log_every = log_every
+        self.rows = 0
+        self.chunks = 0
+        self.start = time.perf_counter()
+
+    def update(self, n_rows: int):
+        self.rows += n_rows
+        self.chunks += 1
+        if self.chunks % self.log_every == 0:
+            logger.info(f"Scored {self.rows:,} rows in {self.chunks} chunks ({self.rows_per_sec:,.0f} rows/sec)")
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1)
+        }
+
+
+def score_chunks(predictor: ChurnPredictor, chunks: Iterator[pd.DataFrame],
+                 id_column: str = "customerID", meter: Optional[ThroughputMeter] = None) -> Iterator[pd.DataFrame]:
+    """
+    Cleans and scores each chunk with the loaded pipeline.
+    Yields one result frame per chunk: the id column (if present) plus
+    churn_probability and risk_category. Every input row is scored: duplicates are
+    kept, so the output lines up with the input whatever the chunk boundaries.
+    """
+    cleaner = DataCleaner()
+    for chunk in chunks:
+        cleaned = cleaner.clean_data(chunk, drop_duplicates=False)
+        scored = predictor.predict_frame(cleaned)
+        if id_column in cleaned.columns:
+            scored.insert(0, id_column, cleaned[id_column].values)
+        if meter is not None:
+            meter.update(len(scored))
+        yield scored
+
+
+def write_scores(scored_chunks: Iterator[pd.DataFrame], output_path: str, file_format: str) -> int:
+    """
+    Streams scored chunks to a CSV or Parquet file without materializing the full result.
+    Returns the number of rows written.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    rows = 0
+    if file_format == "csv":
+        with open(output_path, "w", newline="") as f:
+            for i, chunk in enumerate(scored_chunks):
+                chunk.to_csv(f, header=(i == 0), index=False)
+                rows += len(chunk)
+    elif file_format == "parquet":
+        pa, pq = _import_parquet()
+        writer = None
+        try:
+            for chunk in scored_chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(f"Unsupported file format '{file_format}'. Expected one of {SUPPORTED_FORMATS}.")
+    return rows
+
+
+def score_file(model_path: str, input_path: str, output_path: str,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, id_column: str = "customerID") -> Dict[str, Any]:
+    """
+    Scores a raw customer file chunk by chunk at a constant memory ceiling
+    and writes the results to `output_path` (format inferred from extension).
+    """
+    predictor = ChurnPredictor(model_path)
+    meter = ThroughputMeter()
+
+    logger.info(f"Scoring {input_path} -> {output_path} in chunks of {chunk_size:,} rows")
+    chunks = iter_chunks(input_path, detect_format(input_path), chunk_size)
+    scored = score_chunks(predictor, chunks, id_column=id_column, meter=meter)
+    write_scores(scored, output_path, detect_format(output_path))
+
+    stats = meter.summary()
+    logger.info(f"Bulk scoring complete: {stats}")
+    return stats
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Stream-score a raw customer CSV/Parquet file.")
+    parser.add_argument("--input", required=True, help="Raw customer file (.csv or .parquet)")
+    parser.add_argument("--output", required=True, help="Destination file (.csv or .parquet)")
+    parser.add_argument("--model", default="artifacts/models/best_model.joblib", help="Trained pipeline artifact")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--id-column", default="customerID", help="Column copied through to the output")
+    args = parser.parse_args()
+
+    score_file(args.model, args.input, args.output, chunk_size=args.chunk_size, id_column=args.id_column)
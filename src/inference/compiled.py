@@ -0,0 +1,254 @@
+import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+_expit = None
+
+
+def _numpy_expit(x):
+    return np.divide(1.0, 1.0 + np.exp(-x))
+
+
+def expit(x):
+    # scipy's expit (what LogisticRegression uses) is imported on first use and kept:
+    # scipy.special adds ~150 ms to the import of every serving process
+    global _expit
+    if _expit is None:
+        try:
+            from scipy.special import expit as scipy_expit
+        except ImportError:  # pragma: no cover - scipy ships with scikit-learn
+            scipy_expit = _numpy_expit
+        _expit = scipy_expit
+    return _expit(x)
+
+
+class CompilationError(ValueError):
+    """Raised when a fitted pipeline uses a step the compiled path cannot reproduce exactly."""
+
+
+class CompiledPipeline:
+    """
+    Compiled, numpy-only inference path for a fitted churn pipeline.
+
+    The fitted sklearn Pipeline is flattened once into:
+    - an ordered list of feature-engineering ops (ratio, tenure binning, log1p),
+    - per-column one-hot lookup tables (category -> output column index),
+    - the positions of the passthrough numeric columns,
+    - the final estimator (with a closed-form path for StandardScaler + LogisticRegression).
+    Pipelines whose preprocessor emits a sparse matrix are scored densely with zeros
+    marked missing, which is how XGBoost reads the unstored entries of a CSR matrix.
+
+    Records (dicts) are then scored by filling a dense float64 feature matrix directly,
+    skipping per-call DataFrame construction, X.copy(), pd.cut and the ColumnTransformer.
+    Every op mirrors the arithmetic of its sklearn/pandas counterpart, so probabilities
+    match the original pipeline exactly.
+    """
+    def __init__(self, engineering_ops: List[Dict[str, Any]], categorical: List[Dict[str, Any]],
+                 numerical: List[Dict[str, Any]], n_features: int, estimator=None,
+                 linear: Optional[Dict[str, np.ndarray]] = None, zeros_as_missing: bool = False):
+        self.engineering_ops = engineering_ops
+        self.categorical = categorical
+        self.numerical = numerical
+        self.n_features = n_features
+        self.estimator = estimator
+        self.linear = linear
+        self.zeros_as_missing = zeros_as_missing
+
+        # Raw input fields the compiled path reads from each record
+        derived = {op["output"] for op in engineering_ops}
+        inputs = [c for op in engineering_ops for c in op["inputs"]]
+        inputs += [spec["column"] for spec in categorical + numerical]
+        self.input_columns = list(dict.fromkeys(c for c in inputs if c not in derived))
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "CompiledPipeline":
+        """
+        Builds the compiled path from a fitted Pipeline([('features', ...), ('model', ...)])
+        as produced by src.training.train_pipeline.
+        """
+        if not hasattr(pipeline, "steps") or len(pipeline.steps) < 2:
+            raise CompilationError("Expected a fitted sklearn Pipeline with feature and model steps.")
+
+        feature_pipeline = pipeline.steps[0][1]
+        estimator = pipeline.steps[-1][1]
+        steps = dict(getattr(feature_pipeline, "steps", []))
+        if "feature_eng" not in steps or "preprocessor" not in steps:
+            raise CompilationError("Feature pipeline must contain 'feature_eng' and 'preprocessor' steps.")
+
+        engineering_ops = _compile_engineering(steps["feature_eng"])
+        categorical, numerical, n_features, sparse = _compile_preprocessor(steps["preprocessor"])
+        linear = _compile_linear(estimator)
+        if sparse and linear is not None:
+            raise CompilationError("Sparse feature matrices are only supported for tree estimators.")
+
+        return cls(engineering_ops, categorical, numerical, n_features, estimator=estimator, linear=linear,
+                   zeros_as_missing=sparse)
+
+    def transform_records(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Turns a list of raw records into the dense feature matrix the estimator expects.
+        """
+        columns = {col: [r[col] for r in records] for col in self.input_columns}
+        return self.transform_columns(columns, len(records))
+
+    def transform_columns(self, columns: Dict[str, Any], n_rows: int) -> np.ndarray:
+        columns = dict(columns)
+        for op in self.engineering_ops:
+            columns[op["output"]] = _apply_op(op, columns)
+
+        X = np.zeros((n_rows, self.n_features), dtype=np.float64)
+        rows = np.arange(n_rows)
+        for spec in self.categorical:
+            lookup = spec["lookup"]
+            idx = np.fromiter((lookup.get(v, -1) for v in columns[spec["column"]]), dtype=np.intp, count=n_rows)
+            known = idx >= 0
+            X[rows[known], idx[known]] = 1.0
+        for spec in self.numerical:
+            X[:, spec["index"]] = _as_float(columns[spec["column"]])
+        return X
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Returns P(churn) for each row of a compiled feature matrix.
+        """
+        if self.linear is not None:
+            # Same op order as StandardScaler.transform + LogisticRegression._predict_proba_lr
+            X = X - self.linear["mean"]
+            X /= self.linear["scale"]
+            scores = X @ self.linear["coef"].T + self.linear["intercept"]
+            return expit(scores.reshape(-1))
+        if self.zeros_as_missing:
+            # The model was trained on CSR input, where XGBoost treats every unstored
+            # entry (all zeros) as missing; NaN is the dense equivalent.
+            X = np.where(X == 0, np.nan, X)
+        return self.estimator.predict_proba(X)[:, 1]
+
+    def predict_proba_records(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        return self.predict_proba(self.transform_records(records))
+
+
+def _as_float(values) -> np.ndarray:
+    # None (e.g. missing TotalCharges) becomes NaN, like pandas does for numeric columns
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64) \
+        if isinstance(values, list) else np.asarray(values, dtype=np.float64)
+
+
+def _apply_op(op: Dict[str, Any], columns: Dict[str, Any]) -> np.ndarray:
+    kind = op["kind"]
+    if kind == "ratio":
+        # InteractionFeatures: numerator / denominator.replace(0, 1)
+        numerator = _as_float(columns[op["inputs"][0]])
+        denominator = _as_float(columns[op["inputs"][1]])
+        return numerator / np.where(denominator == 0, 1.0, denominator)
+    if kind == "bin":
+        # TenureBinning: pd.cut(right=True) followed by astype(str); out-of-range/NaN -> 'nan'
+        values = _as_float(columns[op["inputs"][0]])
+        bins = op["bins"]
+        ids = np.searchsorted(bins, values, side="left")
+        invalid = (ids == 0) | (ids == len(bins)) | np.isnan(values)
+        labels = np.asarray(op["labels"] + ["nan"], dtype=object)
+        return labels[np.where(invalid, len(op["labels"]), ids - 1)]
+    if kind == "log1p":
+        return np.log1p(_as_float(columns[op["inputs"][0]]))
+    raise CompilationError(f"Unknown op '{kind}'")
+
+
+def _compile_engineering(engineering) -> List[Dict[str, Any]]:
+    from src.feature_engineering.transformers import (
+        TenureBinning, LogTransformer, InteractionFeatures, EngineeredFeatures
+    )
+
+    ops = []
+    for name, step in getattr(engineering, "steps", [(None, engineering)]):
+        if isinstance(step, EngineeredFeatures):
+            ops.append({"kind": "ratio", "inputs": ["TotalCharges", "tenure"], "output": "calculated_AvgCharges"})
+            ops.append({"kind": "bin", "inputs": ["tenure"], "output": "tenure_group",
+                        "bins": np.asarray(step.bins, dtype=np.float64), "labels": [str(l) for l in step.labels]})
+            for col in step.log_columns:
+                ops.append({"kind": "log1p", "inputs": [col], "output": f"{col}_log"})
+        elif isinstance(step, InteractionFeatures):
+            ops.append({"kind": "ratio", "inputs": ["TotalCharges", "tenure"], "output": "calculated_AvgCharges"})
+        elif isinstance(step, TenureBinning):
+            ops.append({"kind": "bin", "inputs": ["tenure"], "output": "tenure_group",
+                        "bins": np.asarray(step.bins, dtype=np.float64), "labels": [str(l) for l in step.labels]})
+        elif isinstance(step, LogTransformer):
+            for col in step.columns:
+                ops.append({"kind": "log1p", "inputs": [col], "output": f"{col}_log"})
+        else:
+            raise CompilationError(f"Unsupported feature engineering step '{name}' ({type(step).__name__}).")
+    return ops
+
+
+def _compile_preprocessor(preprocessor):
+    if not hasattr(preprocessor, "transformers_"):
+        raise CompilationError("Preprocessor is not a fitted ColumnTransformer.")
+    if getattr(preprocessor, "remainder", "drop") != "drop":
+        raise CompilationError("Only remainder='drop' is supported.")
+
+    categorical, numerical = [], []
+    offset = 0
+    for name, transformer, cols in preprocessor.transformers_:
+        if name == "remainder" or (isinstance(transformer, str) and transformer == "drop"):
+            continue
+        if _is_passthrough(transformer):
+            for col in cols:
+                numerical.append({"column": col, "index": offset})
+                offset += 1
+        elif type(transformer).__name__ == "OneHotEncoder":
+            if getattr(transformer, "drop_idx_", None) is not None:
+                raise CompilationError("OneHotEncoder with drop is not supported.")
+            if getattr(transformer, "_infrequent_enabled", False):
+                raise CompilationError("OneHotEncoder infrequent categories are not supported.")
+            if transformer.handle_unknown != "ignore":
+                raise CompilationError("OneHotEncoder must use handle_unknown='ignore'.")
+            for col, categories in zip(cols, transformer.categories_):
+                lookup = {cat: offset + i for i, cat in enumerate(categories.tolist())}
+                categorical.append({"column": col, "lookup": lookup})
+                offset += len(categories)
+        else:
+            raise CompilationError(f"Unsupported preprocessor transformer '{name}' ({type(transformer).__name__}).")
+    # ColumnTransformer records whether its fitted output was a sparse matrix
+    return categorical, numerical, offset, bool(getattr(preprocessor, "sparse_output_", False))
+
+
+def _is_passthrough(transformer) -> bool:
+    # Fitted ColumnTransformers store 'passthrough' as an identity FunctionTransformer
+    if isinstance(transformer, str):
+        return transformer == "passthrough"
+    return type(transformer).__name__ == "FunctionTransformer" and transformer.func is None
+
+
+def _compile_linear(estimator) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Extracts StandardScaler + binary one-vs-rest LogisticRegression (or log-loss SGDClassifier)
+    parameters when the estimator wraps exactly that pipeline, so scoring skips sklearn's input validation.
+    Returns None for any other estimator, which is then called through predict_proba.
+    """
+    inner = getattr(estimator, "model", None)
+    steps = getattr(inner, "steps", None)
+    if not steps or len(steps) != 2:
+        return None
+    scaler, clf = steps[0][1], steps[1][1]
+    if type(scaler).__name__ != "StandardScaler":
+        return None
+    if type(clf).__name__ == "LogisticRegression":
+        ovr = clf.multi_class in ["ovr", "warn"] or (
+            clf.multi_class == "auto" and (clf.classes_.size <= 2 or clf.solver in ("liblinear", "newton-cholesky"))
+        )
+    elif type(clf).__name__ == "SGDClassifier":
+        # log_loss predict_proba is the same expit(decision_function) as binary LogisticRegression
+        ovr = clf.loss == "log_loss"
+    else:
+        return None
+    if not ovr or not (scaler.with_mean and scaler.with_std) or clf.coef_.shape[0] != 1:
+        return None
+    return {
+        "mean": scaler.mean_,
+        "scale": scaler.scale_,
+        "coef": clf.coef_,
+        "intercept": clf.intercept_,
+    }
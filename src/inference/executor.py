@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Model of a process-pool worker, loaded by the pool initializer
+_worker_predictor = None
+
+
+class Overloaded(RuntimeError):
+    """
+    Raised when a call is shed: `status_code` 429 when the queue is full, 503 when it
+    waited longer than the queue timeout. `retry_after` is in seconds.
+    """
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _init_worker(model_path: str, options: Dict[str, Any]):
+    global _worker_predictor
+    from src.inference.predictor import ChurnPredictor
+    _worker_predictor = ChurnPredictor(model_path, **options)
+
+
+def _noop():
+    pass
+
+
+def _call_worker(method: str, model_path: str, version: Optional[str], args: tuple, kwargs: Dict[str, Any]):
+    # The parent's predictor decides which model serves; a worker catches up on its next call
+    if version is not None and _worker_predictor.model_version != version:
+        _worker_predictor.reload(model_path)
+    return getattr(_worker_predictor, method)(*args, **kwargs)
+
+
+class ScoringExecutor:
+    """
+    Dedicated, sized pool for CPU-bound scoring with bounded admission.
+
+    Handlers `await run(predictor, method, *args)` on the event loop. At most
+    `max_workers` calls run at once and `max_queue` more wait for a worker; beyond that
+    calls are rejected at once (Overloaded, 429). A call that waits longer than
+    `queue_timeout_ms` for a worker is cancelled before it starts (Overloaded, 503), so
+    a burst costs queued clients a bounded wait instead of an ever-growing one.
+
+    `max_requests` bounds whole requests (body parsing and validation included) through
+    `admit_request`/`release_request`, called by the API before a request body is read.
+
+    kind="thread": the predictor's method runs in a thread (numpy and XGBoost release
+    the GIL for the heavy parts). kind="process": every worker process loads its own
+    ChurnPredictor from the served artifact (`predictor_options` are its constructor
+    arguments) and reloads it when the parent's model version changes. The prediction
+    cache and per-stage timers then live in the workers.
+    """
+    KINDS = ("thread", "process")
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None, max_queue: int = 64,
+                 queue_timeout_ms: Optional[float] = 2000, retry_after_seconds: int = 1,
+                 max_requests: Optional[int] = None, predictor_options: Optional[Dict[str, Any]] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}'; expected one of {self.KINDS}.")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout_ms / 1000.0 if queue_timeout_ms else None
+        self.retry_after = retry_after_seconds
+        self.max_requests = max_requests
+        self.predictor_options = predictor_options or {}
+
+        self.pool = None
+        self._model_path: Optional[str] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.active_requests = 0
+        self.rejected_requests = 0
+
+    @property
+    def running(self) -> bool:
+        return self.pool is not None
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.in_flight - self.max_workers, 0)
+
+    def start(self, model_path: Optional[str] = None):
+        if self.running:
+            return
+        if self.kind == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scoring")
+        else:
+            # 'spawn' keeps workers clear of the server's event loop, threads and OpenMP state
+            self._model_path = model_path
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker, initargs=(model_path, self.predictor_options),
+            )
+            # Workers are spawned on demand; start them all now so they load the model
+            # in the background instead of on the first requests
+            for _ in range(self.max_workers):
+                self.pool.submit(_noop)
+        logger.info(f"Scoring executor started ({self.kind}, max_workers={self.max_workers}, max_queue={self.max_queue})")
+
+    def stop(self):
+        if self.pool is None:
+            return
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = None
+        logger.info("Scoring executor stopped.")
+
+    def task(self, predictor, method: str, *args, **kwargs):
+        """
+        The callable the pool runs for `predictor.<method>(*args, **kwargs)`.
+        """
+        if self.kind == "thread":
+            return partial(getattr(predictor, method), *args, **kwargs)
+        state = predictor.state
+        return partial(_call_worker, method, state.model_path if state else self._model_path,
+                       predictor.model_version, args, kwargs)
+
+    def admit_request(self):
+        if self.max_requests is not None and self.active_requests >= self.max_requests:
+            self.rejected_requests += 1
+            raise Overloaded(f"Too many scoring requests in progress ({self.max_requests})", 429, self.retry_after)
+        self.active_requests += 1
+
+    def release_request(self):
+        self.active_requests -= 1
+
+    def admit(self):
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise Overloaded(f"Scoring queue is full ({self.max_queue} calls waiting)", 429, self.retry_after)
+
+    async def run(self, predictor, method: str, *args, **kwargs):
+        """
+        Runs `predictor.<method>(*args, **kwargs)` in the pool. Admission is checked on
+        the event loop, so no lock is needed.
+        """
+        if not self.running:
+            raise RuntimeError("Scoring executor is not running")
+        self.admit()
+        self.in_flight += 1
+        future = self.pool.submit(self.task(predictor, method, *args, **kwargs))
+        # Released when the call finishes or is cancelled, even if its caller went away
+        waiter = asyncio.wrap_future(future)
+        waiter.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.cancel():
+                self.timed_out += 1
+                raise Overloaded(f"No scoring worker free within {self.queue_timeout * 1000:g} ms", 503,
+                                 self.retry_after)
+            # Already running: the timeout only bounds the wait for a worker
+            return await waiter
+
+    def _release(self, waiter):
+        self.in_flight -= 1
+        if not waiter.cancelled():
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_timeout_ms": self.queue_timeout * 1000 if self.queue_timeout else None,
+            "max_requests": self.max_requests,
+            "active_requests": self.active_requests,
+            "rejected_requests": self.rejected_requests,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
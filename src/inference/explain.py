@@ -0,0 +1,105 @@
+import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from src.inference.compiled import CompiledPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class ExplanationError(ValueError):
+    """Raised when a model has no SHAP explainer (e.g. an unsupported estimator or a .json export)."""
+
+
+class ChurnExplainer:
+    """
+    SHAP attributions of a fitted churn pipeline, in log-odds, per CustomerData field.
+
+    Built once per loaded model (see ModelState.explainer) on top of its CompiledPipeline:
+    - records become the dense feature matrix through the compiled numpy path,
+    - a shap.TreeExplainer over the Challenger's booster (trimmed to the trees it predicts
+      with), or a shap.LinearExplainer over the Baseline's logistic regression in
+      StandardScaler space (background = the training means), explains all rows at once,
+    - a (n_features x n_fields) matrix folds the output columns back onto the input fields:
+      every one-hot column of a field onto that field, derived features (tenure_group,
+      calculated_AvgCharges, TotalCharges_log) onto their inputs, split equally.
+    Field attributions sum to the model's log-odds minus `base_value`.
+    """
+    def __init__(self, compiled: CompiledPipeline, explainer, kind: str, fields: List[str], field_map: np.ndarray):
+        self.compiled = compiled
+        self.explainer = explainer
+        self.kind = kind
+        self.fields = fields
+        self.field_map = field_map
+        # For boosters shap only replaces base_score with the true expectation (the
+        # bias term of XGBoost's TreeSHAP) on the first call, so explain one row up front
+        self.shap_values(np.zeros((1, compiled.n_features)))
+        self.base_value = float(np.ravel(explainer.expected_value)[0])
+
+    @classmethod
+    def from_pipeline(cls, pipeline, compiled: Optional[CompiledPipeline] = None) -> "ChurnExplainer":
+        import shap
+        compiled = compiled or CompiledPipeline.from_pipeline(pipeline)
+        if compiled.linear is not None:
+            coef = compiled.linear["coef"].reshape(-1)
+            intercept = float(np.ravel(compiled.linear["intercept"])[0])
+            # Scaled features have zero mean over the training data, so a zero background
+            # attributes each feature's distance from its training mean
+            n = len(coef)
+            explainer, kind = shap.LinearExplainer((coef, intercept), (np.zeros(n), np.eye(n))), "linear"
+        elif hasattr(compiled.estimator, "get_booster"):
+            n_trees = getattr(compiled.estimator, "n_trees", None)
+            booster = compiled.estimator.get_booster()
+            explainer, kind = shap.TreeExplainer(booster[:n_trees] if n_trees else booster), "tree"
+        else:
+            raise ExplanationError(f"No SHAP explainer for {type(compiled.estimator).__name__}.")
+        fields, field_map = cls.build_field_map(compiled)
+        return cls(compiled, explainer, kind, fields, field_map)
+
+    @staticmethod
+    def build_field_map(compiled: CompiledPipeline):
+        # Derived column -> the raw fields it is computed from
+        sources = {op["output"]: op["inputs"] for op in compiled.engineering_ops}
+        fields = compiled.input_columns
+        index = {field: i for i, field in enumerate(fields)}
+        field_map = np.zeros((compiled.n_features, len(fields)))
+        for spec in compiled.categorical:
+            inputs = sources.get(spec["column"], [spec["column"]])
+            for col in spec["lookup"].values():
+                for field in inputs:
+                    field_map[col, index[field]] = 1.0 / len(inputs)
+        for spec in compiled.numerical:
+            inputs = sources.get(spec["column"], [spec["column"]])
+            for field in inputs:
+                field_map[spec["index"], index[field]] = 1.0 / len(inputs)
+        return fields, field_map
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        """
+        Per-output-column SHAP values (log-odds) for a compiled feature matrix.
+        """
+        if self.kind == "linear":
+            linear = self.compiled.linear
+            return self.explainer.shap_values((X - linear["mean"]) / linear["scale"])
+        if self.compiled.zeros_as_missing:
+            # Trained on CSR input: unstored zeros are missing values to the booster
+            X = np.where(X == 0, np.nan, X)
+        return self.explainer.shap_values(X)
+
+    def explain(self, X: np.ndarray) -> np.ndarray:
+        """
+        (n_rows x n_fields) attributions for a compiled feature matrix.
+        """
+        return self.shap_values(X) @ self.field_map
+
+    def top_contributions(self, records: List[Dict[str, Any]], attributions: np.ndarray, top_k: int) -> List[List[Dict[str, Any]]]:
+        """
+        The `top_k` fields with the largest absolute attribution per record, largest first.
+        """
+        top_k = min(top_k, len(self.fields))
+        order = np.argsort(-np.abs(attributions), axis=1, kind="stable")[:, :top_k]
+        return [
+            [{"feature": self.fields[j], "value": record.get(self.fields[j]), "contribution": float(row[j])} for j in idx]
+            for record, row, idx in zip(records, attributions, order)
+        ]
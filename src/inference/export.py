@@ -0,0 +1,176 @@
+"""
+Exports a trained churn Pipeline to a portable format scored by src/inference/portable.py.
+
+Writes into `output_dir`:
+- <name>.json: the feature spec (engineering ops, one-hot tables, numeric positions) and,
+  for linear models, the scaler and coefficients;
+- <name>.booster.json: the native XGBoost booster (trimmed to the best iteration), for tree models;
+- <name>.scoring.json: the additive scoring table (src/inference/scoring_table.py), for linear models.
+Re-exporting a name as the other model kind removes the file the new kind doesn't write, so a
+stale booster or scoring table never sits next to a spec it doesn't belong to.
+The export is checked against the joblib pipeline before it is reported as written.
+
+Usage:
+    python -m src.inference.export --model artifacts/models/best_model.joblib --output artifacts/export
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+from src.inference.compiled import CompiledPipeline
+from src.inference.portable import PortableModel, EXPORT_FORMAT_VERSION
+from src.inference.scoring_table import ScoringTable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOLERANCE = 1e-6
+
+
+class ExportError(ValueError):
+    """Raised when a pipeline can't be exported or the export disagrees with it."""
+
+
+def _feature_spec(compiled: CompiledPipeline):
+    return {
+        "engineering_ops": [
+            {**op, "bins": op["bins"].tolist()} if op["kind"] == "bin" else op
+            for op in compiled.engineering_ops
+        ],
+        "categorical": [
+            {"column": spec["column"], "offset": min(spec["lookup"].values()),
+             "categories": sorted(spec["lookup"], key=spec["lookup"].get)}
+            for spec in compiled.categorical
+        ],
+        "numerical": compiled.numerical,
+        "n_features": compiled.n_features,
+        "zeros_as_missing": compiled.zeros_as_missing,
+    }
+
+
+def _write_json(path: str, payload) -> str:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _write_bytes(path: str, data: bytes) -> str:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _remove_stale(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+        logger.info(f"Removed stale {path}")
+
+
+def export_model(pipeline, output_dir: str, name: str = "model", X_check=None,
+                 tolerance: float = DEFAULT_TOLERANCE) -> str:
+    """
+    Writes the export for a fitted Pipeline([('features', ...), ('model', ...)]) and returns
+    the spec path. If `X_check` (raw customer frame) is given, the export is reloaded and
+    its probabilities compared with the pipeline's; ExportError is raised above `tolerance`.
+    Linear models match exactly; tree models agree to float32 rounding.
+    """
+    try:
+        compiled = CompiledPipeline.from_pipeline(pipeline)
+    except ValueError as e:
+        raise ExportError(f"Pipeline can't be exported: {e}") from e
+
+    estimator = pipeline.steps[-1][1]
+    os.makedirs(output_dir, exist_ok=True)
+    spec = {
+        "format_version": EXPORT_FORMAT_VERSION,
+        "model_type": type(estimator).__name__,
+        "features": _feature_spec(compiled),
+    }
+    table = None
+    scoring_path = os.path.join(output_dir, f"{name}.scoring.json")
+    booster_file = f"{name}.booster.json"
+    if compiled.linear is not None:
+        spec["model"] = {"kind": "linear", **{k: v.tolist() for k, v in compiled.linear.items()}}
+        table = ScoringTable.from_pipeline(pipeline, compiled=compiled)
+        _remove_stale(os.path.join(output_dir, booster_file))
+        table.save(scoring_path)
+    elif hasattr(estimator, "get_booster"):
+        booster = estimator.get_booster()
+        n_trees = getattr(estimator, "n_trees", booster.num_boosted_rounds())
+        raw = booster[:n_trees].save_raw(raw_format="json")
+        _remove_stale(scoring_path)
+        # Replaced before the spec that references it, and verified against the spec's
+        # sha256 on load, so a reader never pairs a spec with a half-written booster
+        _write_bytes(os.path.join(output_dir, booster_file), raw)
+        spec["model"] = {"kind": "xgboost", "booster_file": booster_file,
+                         "booster_sha256": hashlib.sha256(raw).hexdigest()}
+    else:
+        raise ExportError(f"No portable format for estimator {type(estimator).__name__}.")
+
+    spec_path = _write_json(os.path.join(output_dir, f"{name}.json"), spec)
+
+    if X_check is not None:
+        max_diff = check_parity(pipeline, spec_path, X_check)
+        if max_diff > tolerance:
+            raise ExportError(f"Export {spec_path} disagrees with the pipeline (max diff {max_diff:.3g}).")
+        logger.info(f"Export parity OK on {len(X_check)} rows (max diff {max_diff:.3g}).")
+        if table is not None:
+            max_diff = check_table_parity(pipeline, table, X_check)
+            if max_diff > tolerance:
+                raise ExportError(f"Scoring table of {name} disagrees with the pipeline (max diff {max_diff:.3g}).")
+            logger.info(f"Scoring table parity OK on {len(X_check)} rows (max diff {max_diff:.3g}).")
+    logger.info(f"Exported {spec['model_type']} to {spec_path}")
+    return spec_path
+
+
+def check_parity(pipeline, spec_path: str, X) -> float:
+    """
+    Max absolute difference between the pipeline's and the export's churn probabilities on X.
+    """
+    expected = pipeline.predict_proba(X)[:, 1]
+    actual = PortableModel.load(spec_path).predict_proba(X)[:, 1]
+    return float(np.max(np.abs(expected.astype(np.float64) - actual.astype(np.float64))))
+
+
+def check_table_parity(pipeline, table: ScoringTable, X) -> float:
+    """
+    Max absolute difference between the pipeline's and the scoring table's churn probabilities on X.
+    """
+    expected = pipeline.predict_proba(X)[:, 1]
+    actual = table.predict_proba_codes(*table.encode_columns(X, len(X)))
+    return float(np.max(np.abs(expected - actual)))
+
+
+def main(argv: Optional[list] = None):
+    import joblib
+    import pandas as pd
+    from src.data_validation.cleaner import DataCleaner
+
+    parser = argparse.ArgumentParser(description="Export a trained pipeline for the numpy-only runtime.")
+    parser.add_argument("--model", default="artifacts/models/best_model.joblib")
+    parser.add_argument("--output", default="artifacts/export")
+    parser.add_argument("--name", default=None, help="Export name (default: model file name)")
+    parser.add_argument("--check-data", default="data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv",
+                        help="Raw CSV scored by both paths for the parity check ('' to skip)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    pipeline = joblib.load(args.model)
+    name = args.name or os.path.splitext(os.path.basename(args.model))[0]
+    X_check = None
+    if args.check_data:
+        X_check = DataCleaner().clean_data(pd.read_csv(args.check_data))
+    export_model(pipeline, args.output, name=name, X_check=X_check, tolerance=args.tolerance)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,164 @@
+"""
+Numpy-only runtime for models exported by src/inference/export.py.
+
+An export is a feature spec (`*.json`) describing the feature engineering ops, the
+one-hot lookup tables and the numeric column positions, plus the model itself:
+- linear models: StandardScaler + logistic regression parameters, inlined in the spec;
+- XGBoost: the native booster JSON (a separate file referenced by the spec), scored
+  here by vectorized tree traversal.
+Loading and scoring an export needs neither pandas, scikit-learn nor xgboost.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.inference.compiled import CompiledPipeline
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT_VERSION = 1
+
+
+class TreeEnsemble:
+    """
+    Binary-logistic XGBoost booster evaluated with numpy.
+
+    Mirrors XGBoost's CPU predictor: features are compared as float32 (`x < split`
+    goes left, NaN follows the node's default direction), leaf values are accumulated
+    in float32 tree by tree on top of the base margin, then passed through XGBoost's
+    float32 sigmoid. Margins match the booster exactly; probabilities can differ by one
+    float32 ulp where the platform's expf rounds differently.
+    """
+    def __init__(self, trees: List[Dict[str, np.ndarray]], base_margin: float, n_features: int):
+        self.trees = trees
+        self.base_margin = np.float32(base_margin)
+        self.n_features = n_features
+
+    @classmethod
+    def from_booster_json(cls, booster: Dict[str, Any]) -> "TreeEnsemble":
+        learner = booster["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"Unsupported XGBoost objective '{objective}'; expected 'binary:logistic'.")
+        base_score = np.float32(learner["learner_model_param"]["base_score"])
+        # binary:logistic stores base_score as a probability; trees add to its logit,
+        # which XGBoost computes in float32 as -logf(1 / p - 1)
+        base_margin = -np.float32(np.log(np.float64(np.float32(1) / base_score - np.float32(1))))
+        trees = []
+        for tree in learner["gradient_booster"]["model"]["trees"]:
+            if tree.get("categories_nodes"):
+                raise ValueError("Categorical splits are not supported by the portable runtime.")
+            trees.append({
+                "left": np.asarray(tree["left_children"], dtype=np.int32),
+                "right": np.asarray(tree["right_children"], dtype=np.int32),
+                "feature": np.asarray(tree["split_indices"], dtype=np.int32),
+                "threshold": np.asarray(tree["split_conditions"], dtype=np.float32),
+                "default_left": np.asarray(tree["default_left"], dtype=bool),
+            })
+        n_features = int(learner["learner_model_param"]["num_feature"])
+        return cls(trees, base_margin, n_features)
+
+    def margin(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])
+        margin = np.full(X.shape[0], self.base_margin, dtype=np.float32)
+        for tree in self.trees:
+            left, right = tree["left"], tree["right"]
+            node = np.zeros(X.shape[0], dtype=np.int32)
+            active = left[node] != -1
+            while active.any():
+                idx = rows[active]
+                current = node[idx]
+                values = X[idx, tree["feature"][current]]
+                go_left = np.where(np.isnan(values), tree["default_left"][current],
+                                   values < tree["threshold"][current])
+                node[idx] = np.where(go_left, left[current], right[current])
+                active[idx] = left[node[idx]] != -1
+            # Leaf values are stored in split_conditions
+            margin += tree["threshold"][node]
+        return margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        p = _sigmoid32(self.margin(X))
+        return np.vstack([1 - p, p]).T
+
+
+def _sigmoid32(margin: np.ndarray) -> np.ndarray:
+    # XGBoost's float32 sigmoid: 1 / (expf(min(-x, 88.7)) + 1 + 1e-16); exp is evaluated in
+    # float64 and rounded, matching a correctly rounded expf.
+    x = np.minimum(-margin, np.float32(88.7))
+    denom = np.exp(x.astype(np.float64)).astype(np.float32) + np.float32(1.0) + np.float32(1e-16)
+    return np.float32(1.0) / denom
+
+
+class PortableModel:
+    """
+    Scores raw customer records (list of dicts or a DataFrame) from an export.
+    `compiled` is the same numpy scoring path CompiledPipeline uses for the joblib
+    pipeline, with the exported model plugged in as the estimator.
+    """
+    def __init__(self, compiled: CompiledPipeline, model_type: str, spec_path: str):
+        self.compiled = compiled
+        self.model_type = model_type
+        self.spec_path = spec_path
+
+    @classmethod
+    def load(cls, spec_path: str) -> "PortableModel":
+        with open(spec_path) as f:
+            spec = json.load(f)
+        if spec.get("format_version") != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported export format version {spec.get('format_version')!r} in {spec_path}.")
+
+        features = spec["features"]
+        engineering_ops = [
+            {**op, "bins": np.asarray(op["bins"], dtype=np.float64)} if op["kind"] == "bin" else op
+            for op in features["engineering_ops"]
+        ]
+        categorical = [
+            {"column": c["column"], "lookup": {cat: c["offset"] + i for i, cat in enumerate(c["categories"])}}
+            for c in features["categorical"]
+        ]
+        model = spec["model"]
+        estimator, linear = None, None
+        if model["kind"] == "linear":
+            linear = {
+                "mean": np.asarray(model["mean"], dtype=np.float64),
+                "scale": np.asarray(model["scale"], dtype=np.float64),
+                "coef": np.asarray(model["coef"], dtype=np.float64),
+                "intercept": np.asarray(model["intercept"], dtype=np.float64),
+            }
+        elif model["kind"] == "xgboost":
+            booster_path = os.path.join(os.path.dirname(spec_path), model["booster_file"])
+            with open(booster_path, "rb") as f:
+                raw = f.read()
+            expected_sha = model.get("booster_sha256")
+            if expected_sha is not None and hashlib.sha256(raw).hexdigest() != expected_sha:
+                raise ValueError(f"Booster {booster_path} doesn't match the sha256 recorded in {spec_path}; "
+                                 "the export was modified or is being replaced.")
+            estimator = TreeEnsemble.from_booster_json(json.loads(raw))
+        else:
+            raise ValueError(f"Unknown exported model kind '{model['kind']}'.")
+
+        compiled = CompiledPipeline(
+            engineering_ops, categorical, features["numerical"], features["n_features"],
+            estimator=estimator, linear=linear, zeros_as_missing=features.get("zeros_as_missing", False),
+        )
+        return cls(compiled, spec.get("model_type", model["kind"]), spec_path)
+
+    def predict_proba_records(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        return self.compiled.predict_proba_records(records)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        sklearn-style (n, 2) probabilities for a DataFrame or list of records.
+        """
+        if isinstance(X, list):
+            p = self.compiled.predict_proba_records(X)
+        else:
+            columns = {col: X[col].to_numpy() for col in self.compiled.input_columns}
+            p = self.compiled.predict_proba(self.compiled.transform_columns(columns, len(X)))
+        return np.vstack([1 - p, p]).T
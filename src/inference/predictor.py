@@ -1,72 +1,416 @@
-import joblib
-import pandas as pd
+import hashlib
+import numpy as np
 import logging
 import os
-from typing import Dict, Any
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, TYPE_CHECKING
+
+from src.inference.compiled import CompiledPipeline, CompilationError
+from src.inference.cache import PredictionCache
+from src.inference.explain import ChurnExplainer, ExplanationError
+from src.inference.portable import PortableModel
+from src.utils.metrics import REGISTRY, stage
+
+# pandas and joblib (and, through unpickling, sklearn/xgboost) are imported on first use:
+# dict inputs on the compiled fast path and .json exports never need them, and a serving
+# process can bind its port and answer /health before paying for them.
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Lower bounds (inclusive) of the MEDIUM and HIGH risk buckets
+RISK_THRESHOLDS = [0.3, 0.6]
+RISK_LABELS = np.array(["LOW", "MEDIUM", "HIGH"])
+
+# Known-good customer used to check the compiled fast path against the sklearn pipeline
+REFERENCE_RECORD = {
+    "gender": "Female", "SeniorCitizen": 0, "Partner": "Yes", "Dependents": "No",
+    "tenure": 1, "PhoneService": "No", "MultipleLines": "No phone service",
+    "InternetService": "DSL", "OnlineSecurity": "No", "OnlineBackup": "Yes",
+    "DeviceProtection": "No", "TechSupport": "No", "StreamingTV": "No",
+    "StreamingMovies": "No", "Contract": "Month-to-month", "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check", "MonthlyCharges": 29.85, "TotalCharges": 29.85
+}
+
+# Synthetic customers scored against a freshly loaded model before it is swapped in
+WARMUP_RECORDS = [
+    REFERENCE_RECORD,
+    {**REFERENCE_RECORD, "tenure": 0, "TotalCharges": 0.0},
+    {**REFERENCE_RECORD, "tenure": 36, "InternetService": "Fiber optic", "Contract": "One year",
+     "MonthlyCharges": 89.1, "TotalCharges": 3207.6},
+    {**REFERENCE_RECORD, "tenure": 72, "InternetService": "No", "Contract": "Two year",
+     "PaymentMethod": "Mailed check", "MonthlyCharges": 19.65, "TotalCharges": 1414.8},
+]
+
+def transform_steps(pipeline, final: bool = False):
+    """
+    Yields (name, transformer) for the transform steps of a fitted (nested) Pipeline, in the
+    order Pipeline.predict_proba applies them, so each step can be timed on its own.
+    """
+    for name, step in (pipeline.steps if final else pipeline.steps[:-1]):
+        if step is None or (isinstance(step, str) and step == "passthrough"):
+            continue
+        if hasattr(step, "steps"):
+            yield from transform_steps(step, final=True)
+        else:
+            yield name, step
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+PREDICTIONS = REGISTRY.counter(
+    "churn_predictions_total", "Customers scored, by risk category and model version.", ["risk_category", "model_version"]
+)
+
+def risk_buckets(probs: np.ndarray) -> np.ndarray:
+    """
+    Index into RISK_LABELS for each churn probability. NaN (e.g. a missing TotalCharges)
+    is LOW, as with the original per-row comparisons; np.digitize alone would make it HIGH.
+    """
+    buckets = np.digitize(probs, RISK_THRESHOLDS)
+    buckets[np.isnan(probs)] = 0
+    return buckets
+
+def categorize_risk(probs: np.ndarray) -> np.ndarray:
+    """
+    Maps churn probabilities to LOW / MEDIUM / HIGH risk labels in one vectorized pass.
+    """
+    return RISK_LABELS[risk_buckets(probs)]
+
+class ModelState:
+    """
+    Everything derived from one loaded artifact. A state is fully built (loaded,
+    compiled, warmed) before it is published, so readers that grab
+    `predictor.state` once always see a consistent model.
+    """
+    def __init__(self, model, model_path: str, artifact_hash: str, compiled: Optional[CompiledPipeline] = None,
+                 loaded_at: Optional[datetime] = None, load_seconds: float = 0.0):
+        self.model = model
+        self.model_path = model_path
+        self.artifact_hash = artifact_hash
+        self.version = artifact_hash[:12]
+        self.compiled = compiled
+        # SHAP explainer (src/inference/explain.py), built with the state when explanations are enabled
+        self.explainer: Optional[ChurnExplainer] = None
+        self.loaded_at = loaded_at or datetime.now(timezone.utc)
+        self.load_seconds = load_seconds
+        self.trained_at = datetime.fromtimestamp(os.path.getmtime(model_path), tz=timezone.utc)
+
+    @property
+    def model_type(self) -> str:
+        if isinstance(self.model, PortableModel):
+            return self.model.model_type
+        if hasattr(self.model, 'steps'):
+            return self.model.steps[-1][1].__class__.__name__
+        return type(self.model).__name__
+
+    @property
+    def features_count(self) -> int:
+        if self.compiled is not None:
+            return self.compiled.n_features
+        try:
+            preprocessor = self.model.steps[0][1].named_steps['preprocessor']
+            return len(preprocessor.get_feature_names_out())
+        except Exception:
+            return 0
+
 class ChurnPredictor:
     """
     Inference class to load trained model and serve predictions.
     Separates inference logic from API and Training code.
+
+    The loaded model lives in a ModelState that `reload()` replaces with a single
+    reference assignment, so in-flight requests finish on the model they started
+    with and new requests see the new one; no request ever sees a half-loaded model.
+
+    A `.json` model path is an export from src/inference/export.py and is served by the
+    numpy-only PortableModel instead of the joblib pipeline.
     """
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, fast_path: bool = True, cache: Optional[PredictionCache] = None,
+                 mmap_mode: Optional[str] = None, warm: bool = True, explain: bool = False):
         self.model_path = model_path
-        self.model = None
+        self.fast_path = fast_path
+        self.warm = warm
+        self.explain = explain
+        self.cache = cache
+        # 'r' memory-maps the artifact's numpy arrays (joblib.dump writes them
+        # uncompressed and aligned), so every process shares them via the page cache.
+        # The artifact must then be replaced by rename, never rewritten in place (SIGBUS).
+        self.mmap_mode = mmap_mode
+        self.state: Optional[ModelState] = None
+        self._reload_lock = threading.Lock()
         self._load_model()
 
+    @property
+    def model(self):
+        return self.state.model if self.state else None
+
+    @property
+    def compiled(self) -> Optional[CompiledPipeline]:
+        return self.state.compiled if self.state else None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        return self.state.version if self.state else None
+
+    @property
+    def reloading(self) -> bool:
+        return self._reload_lock.locked()
+
     def _load_model(self):
-        if not os.path.exists(self.model_path):
-            logger.error(f"Model file not found at {self.model_path}")
-            raise FileNotFoundError(f"Model artifacts not found at {self.model_path}")
+        self._publish(self._build_state(self.model_path, fast_path=self.fast_path))
+
+    def reload(self, model_path: Optional[str] = None) -> ModelState:
+        """
+        Loads and warms a new artifact in the calling thread, then swaps it in atomically.
+        If anything fails the current model keeps serving and the error is raised.
+        Concurrent reloads are serialized.
+        """
+        with self._reload_lock:
+            path = model_path or self.model_path
+            artifact_hash = file_sha256(path) if os.path.exists(path) else None
+            if self.state is not None and artifact_hash == self.state.artifact_hash:
+                logger.info(f"Artifact at {path} is unchanged (version {self.state.version}); skipping reload.")
+                return self.state
+
+            state = self._build_state(path, fast_path=self.fast_path or self.compiled is not None)
+            previous = self.state.version if self.state else None
+            self._publish(state)
+            self.model_path = path
+            logger.info(f"Swapped model {previous} -> {state.version} ({state.load_seconds:.2f}s to load and warm).")
+            return state
+
+    def _build_state(self, model_path: str, fast_path: bool) -> ModelState:
+        if not os.path.exists(model_path):
+            logger.error(f"Model file not found at {model_path}")
+            raise FileNotFoundError(f"Model artifacts not found at {model_path}")
         
-        logger.info(f"Loading model from {self.model_path}...")
+        logger.info(f"Loading model from {model_path}...")
+        start = time.perf_counter()
         try:
-            self.model = joblib.load(self.model_path)
-            logger.info("Model loaded successfully.")
+            # An export's spec records its booster's sha256, so hashing the spec identifies both
+            artifact_hash = file_sha256(model_path)
+            if model_path.endswith(".json"):
+                model = PortableModel.load(model_path)
+                state = ModelState(model, model_path, artifact_hash, compiled=model.compiled)
+            else:
+                import joblib
+                model = joblib.load(model_path, mmap_mode=self.mmap_mode)
+                state = ModelState(model, model_path, artifact_hash)
+                if fast_path:
+                    state.compiled = self._compile(model)
+                if self.explain:
+                    state.explainer = self._build_explainer(state)
+            if self.warm:
+                self._warm(state)
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise e
+        state.load_seconds = time.perf_counter() - start
+        logger.info(f"Model loaded successfully (version {state.version}).")
+        return state
+
+    def _publish(self, state: ModelState):
+        self.state = state
+        if self.cache is not None:
+            # Results from the previous model must never be served again
+            self.cache.clear()
+
+    def _warm(self, state: ModelState):
+        """
+        Scores a few synthetic customers so the first real requests don't pay for
+        lazy initialization, and so a broken artifact fails before it is swapped in.
+        """
+        if isinstance(state.model, PortableModel):
+            # Exports only have the numpy path; keep pandas out of the process
+            probs = state.model.predict_proba(WARMUP_RECORDS)[:, 1]
+        else:
+            import pandas as pd
+            probs = self._predict_proba(state, pd.DataFrame(WARMUP_RECORDS))
+            if state.compiled is not None:
+                state.compiled.predict_proba_records(WARMUP_RECORDS)
+        if not np.all(np.isfinite(probs)):
+            raise ValueError("Warm-up predictions are not finite.")
+
+    def enable_fast_path(self):
+        """
+        Builds the numpy fast path for the current model and warms it (e.g. in a
+        worker forked from a parent that loaded it with fast_path=False, warm=False).
+        """
+        state = self.state
+        if state is None or state.compiled is not None:
+            return
+        state.compiled = self._compile(state.model)
+        self.fast_path = True
+        self.warm = True
+        self._warm(state)
+
+    def enable_explanations(self):
+        """
+        Builds the SHAP explainer for the current model (e.g. in a worker forked from a
+        parent that loaded it without one).
+        """
+        state = self.state
+        self.explain = True
+        if state is None or state.explainer is not None or isinstance(state.model, PortableModel):
+            return
+        state.explainer = self._build_explainer(state)
+
+    def _build_explainer(self, state: ModelState) -> Optional[ChurnExplainer]:
+        """
+        Returns None (explanations unavailable, predictions unaffected) if the pipeline
+        can't be explained.
+        """
+        try:
+            explainer = ChurnExplainer.from_pipeline(state.model, compiled=state.compiled)
+        except (CompilationError, ExplanationError, ImportError) as e:
+            logger.warning(f"Explanations disabled: {e}")
+            return None
+        logger.info(f"SHAP {explainer.kind} explainer ready ({len(explainer.fields)} fields).")
+        return explainer
+
+    def _compile(self, model) -> Optional[CompiledPipeline]:
+        """
+        Builds the numpy fast path used for dict inputs. Returns None (sklearn
+        pipeline is used) if the pipeline can't be compiled or if the compiled
+        path disagrees with it on a reference record.
+        """
+        try:
+            compiled = CompiledPipeline.from_pipeline(model)
+        except CompilationError as e:
+            logger.warning(f"Fast path disabled, using sklearn pipeline: {e}")
+            return None
+
+        import pandas as pd
+        expected = model.predict_proba(pd.DataFrame([REFERENCE_RECORD]))[:, 1]
+        actual = compiled.predict_proba_records([REFERENCE_RECORD])
+        if not np.array_equal(expected, actual):
+            logger.warning(f"Fast path disabled: probability mismatch ({actual[0]!r} != {expected[0]!r}).")
+            return None
+
+        logger.info("Compiled fast inference path enabled.")
+        return compiled
 
     def predict_single(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Predict for a single user (passed as dict).
         Returns dict with probability and risk category.
         """
-        df = pd.DataFrame([input_data])
-        return self._predict_df(df)[0]
+        return self.predict_batch([input_data])[0]
 
     def predict_batch(self, input_data: list) -> list:
         """
         Predict for a batch of users.
+        Cached results are reused; only cache misses are scored (in one call).
+        """
+        state = self.state
+        if self.cache is None:
+            return self._predict_records(state, input_data)
+
+        with stage("cache_lookup", state.version):
+            keys = [PredictionCache.make_key(record, state.version) for record in input_data]
+            results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            scored = self._predict_records(state, [input_data[i] for i in missing])
+            for i, result in zip(missing, scored):
+                self.cache.put(keys[i], result)
+                results[i] = result
+        return [dict(result) for result in results]
+
+    def explain_batch(self, input_data: list, top_k: int = 5) -> list:
         """
-        df = pd.DataFrame(input_data)
-        return self._predict_df(df)
+        Churn probability, risk category and the `top_k` SHAP drivers (log-odds, per input
+        field) of each record; the whole batch is transformed and explained at once.
+        """
+        state = self.state
+        if state is None or state.explainer is None:
+            raise ExplanationError("Explanations are not available for the loaded model.")
+        explainer = state.explainer
+        with stage("compiled_features", state.version):
+            X = explainer.compiled.transform_records(input_data)
+        with stage("predict_proba", state.version):
+            probs = explainer.compiled.predict_proba(X)
+        with stage("shap", state.version):
+            attributions = explainer.explain(X)
+        drivers = explainer.top_contributions(input_data, attributions, top_k)
+        return [
+            {"churn_probability": float(p), "risk_category": risk, "base_value": explainer.base_value, "contributions": top}
+            for p, risk, top in zip(probs, categorize_risk(probs), drivers)
+        ]
+
+    def _predict_records(self, state: ModelState, input_data: list) -> list:
+        if state.compiled is not None:
+            with stage("compiled_features", state.version):
+                X = state.compiled.transform_records(input_data)
+            with stage("predict_proba", state.version):
+                probs = state.compiled.predict_proba(X)
+            return self._format_results(probs, state.version)
+        import pandas as pd
+        with stage("dataframe", state.version):
+            df = pd.DataFrame(input_data)
+        return self._format_results(self._predict_proba(state, df), state.version)
+
+    def predict_frame(self, df: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Predict for a DataFrame of users (e.g. a chunk of a bulk file).
+        Returns a DataFrame aligned with the input index holding
+        churn_probability and risk_category columns.
+        """
+        import pandas as pd
+        state = self.state
+        probs = self._predict_proba(state, df)
+        with stage("risk_bucketing", state.version):
+            risks = self._bucket(probs, state.version)
+        return pd.DataFrame({
+            "churn_probability": probs,
+            "risk_category": risks
+        }, index=df.index)
+
+    def _predict_df(self, df: "pd.DataFrame") -> list:
+        state = self.state
+        return self._format_results(self._predict_proba(state, df), state.version)
+
+    def _format_results(self, probs: np.ndarray, version: Optional[str] = None) -> list:
+        with stage("risk_bucketing", version):
+            return [
+                {"churn_probability": float(p), "risk_category": risk}
+                for p, risk in zip(probs, self._bucket(probs, version))
+            ]
+
+    def _bucket(self, probs: np.ndarray, version: Optional[str]) -> np.ndarray:
+        buckets = risk_buckets(probs)
+        if REGISTRY.enabled:
+            for label, count in zip(RISK_LABELS, np.bincount(buckets, minlength=len(RISK_LABELS))):
+                if count:
+                    PREDICTIONS.inc(int(count), risk_category=label, model_version=version or "none")
+        return RISK_LABELS[buckets]
 
-    def _predict_df(self, df: pd.DataFrame) -> list:
-        if self.model is None:
+    def _predict_proba(self, state: Optional[ModelState], df: "pd.DataFrame") -> np.ndarray:
+        if state is None or state.model is None:
             raise ValueError("Model is not loaded.")
         
         # preprocessing is included in the pipeline
         try:
-            # We assume the model is a Pipeline that handles everything
             # prediction is probability of Churn="Yes" (class 1)
-            probs = self.model.predict_proba(df)[:, 1]
-            
-            results = []
-            for p in probs:
-                risk = "LOW"
-                if p >= 0.6:
-                    risk = "HIGH"
-                elif p >= 0.3:
-                    risk = "MEDIUM"
-                
-                results.append({
-                    "churn_probability": float(p),
-                    "risk_category": risk
-                })
-            return results
+            model = state.model
+            if not hasattr(model, 'steps'):
+                with stage("predict_proba", state.version):
+                    return model.predict_proba(df)[:, 1]
+            # Same steps as Pipeline.predict_proba, timed one by one (feature_eng, preprocessor, ...)
+            X = df
+            for name, step in transform_steps(model):
+                with stage(name, state.version):
+                    X = step.transform(X)
+            with stage("predict_proba", state.version):
+                return model.steps[-1][1].predict_proba(X)[:, 1]
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             raise e
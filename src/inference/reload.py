@@ -0,0 +1,68 @@
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+from src.inference.predictor import ChurnPredictor
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWatcher:
+    """
+    Polls the predictor's artifact and hot-reloads it when it changes.
+
+    A change is only acted on once the file's (mtime, size) has been stable for one
+    full poll interval, so a copy still in progress is never loaded. The reload itself
+    runs in this background thread; requests keep being served by the current model
+    until the new one is loaded, warmed and swapped in.
+    """
+    def __init__(self, predictor: ChurnPredictor, interval_seconds: float = 5.0):
+        self.predictor = predictor
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_seen = self._signature()
+        self._pending: Optional[Tuple[float, int]] = None
+
+    def _signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.predictor.model_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.predictor.model_path} for changes every {self.interval_seconds:g}s.")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self.poll()
+
+    def poll(self):
+        signature = self._signature()
+        if signature is None or signature == self._last_seen:
+            self._pending = None
+            return
+        if signature != self._pending:
+            # Changed since the last poll; wait until it stops changing
+            self._pending = signature
+            return
+
+        self._pending = None
+        self._last_seen = signature
+        try:
+            self.predictor.reload()
+        except Exception as e:
+            logger.error(f"Hot reload of {self.predictor.model_path} failed; keeping current model: {e}")
@@ -0,0 +1,298 @@
+"""
+Additive scoring table for linear churn models (StandardScaler + logistic regression).
+
+Folding the scaler into the coefficients turns the logit into
+    intercept + sum over categorical fields of contribution[field][category]
+              + sum over numeric features of weight * value,
+so every categorical field (tenure_group included, looked up by tenure bin) is one table
+lookup. The table is plain JSON and is scored either per record in pure Python (a few
+microseconds, no numpy) or for a batch through integer category codes: one gather over a
+flat contribution array plus a small matrix-vector product.
+
+Usage:
+    python -m src.inference.scoring_table --model artifacts/models/baseline_model.joblib --output artifacts/export/baseline_model.scoring.json
+"""
+import argparse
+import json
+import logging
+import math
+import os
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.inference.compiled import CompiledPipeline, CompilationError, expit
+
+logger = logging.getLogger(__name__)
+
+TABLE_FORMAT_VERSION = 1
+
+
+class ScoringTableError(ValueError):
+    """Raised when a model has no additive scoring table (anything but a linear model)."""
+
+
+def _float(value) -> float:
+    # None (e.g. missing TotalCharges) becomes NaN, as in the compiled path
+    return math.nan if value is None else float(value)
+
+
+def _log1p(value: float) -> float:
+    return math.log1p(value) if value > -1 else math.nan
+
+
+class ScoringTable:
+    """
+    `categorical`: [{"column", "categories", "contributions"}]; unknown categories add 0,
+    like an all-zero one-hot row.
+    `binned`: [{"column", "bins", "contributions", "missing"}]: the one-hot of a binned
+    numeric field (pd.cut, right-closed), indexed by bin; `missing` covers values outside
+    the bins and NaN.
+    `numeric`: [{"column", "op", "inputs", "weight"}] with op None (passthrough), "ratio"
+    or "log1p".
+    """
+    def __init__(self, intercept: float, categorical: List[Dict[str, Any]], binned: List[Dict[str, Any]],
+                 numeric: List[Dict[str, Any]], model_type: str = "linear"):
+        self.intercept = intercept
+        self.categorical = categorical
+        self.binned = binned
+        self.numeric = numeric
+        self.model_type = model_type
+
+        # Per-record lookups
+        self._tables = [(spec["column"], dict(zip(spec["categories"], spec["contributions"]))) for spec in categorical]
+        # Batch scoring: every category (and bin) of every field gets a global integer code
+        # into one flat contribution array whose last slot (0.0) stands for unknown values
+        flat, self._offsets = [], []
+        for spec in categorical:
+            self._offsets.append(len(flat))
+            flat.extend(spec["contributions"])
+        for spec in binned:
+            self._offsets.append(len(flat))
+            flat.extend(spec["contributions"] + [spec["missing"]])
+        self.unknown_code = len(flat)
+        self.contributions = np.asarray(flat + [0.0], dtype=np.float64)
+        self.weights = np.asarray([spec["weight"] for spec in numeric], dtype=np.float64)
+
+    @classmethod
+    def from_pipeline(cls, pipeline, compiled: Optional[CompiledPipeline] = None) -> "ScoringTable":
+        """
+        Extracts the table from a fitted linear churn Pipeline (BaselineModel or the
+        streaming SGD baseline).
+        """
+        try:
+            compiled = compiled or CompiledPipeline.from_pipeline(pipeline)
+        except CompilationError as e:
+            raise ScoringTableError(f"Pipeline can't be tabulated: {e}") from e
+        if compiled.linear is None:
+            raise ScoringTableError(f"{type(compiled.estimator).__name__} is not a linear model.")
+
+        linear = compiled.linear
+        coef = linear["coef"].reshape(-1)
+        # coef . (x - mean) / scale = (coef / scale) . x - (coef / scale) . mean
+        weights = coef / linear["scale"]
+        intercept = float(np.ravel(linear["intercept"])[0] - weights @ linear["mean"])
+
+        bin_ops = {op["output"]: op for op in compiled.engineering_ops if op["kind"] == "bin"}
+        value_ops = {op["output"]: op for op in compiled.engineering_ops if op["kind"] != "bin"}
+        categorical, binned = [], []
+        for spec in compiled.categorical:
+            lookup = spec["lookup"]
+            op = bin_ops.get(spec["column"])
+            if op is None:
+                categories = sorted(lookup, key=lookup.get)
+                categorical.append({"column": spec["column"], "categories": categories,
+                                    "contributions": [float(weights[lookup[c]]) for c in categories]})
+                continue
+            # Labels the encoder never saw (including 'nan') have no column and add 0
+            label_weight = {label: float(weights[col]) for label, col in lookup.items()}
+            binned.append({
+                "column": op["inputs"][0],
+                "bins": op["bins"].tolist(),
+                "contributions": [label_weight.get(label, 0.0) for label in op["labels"]],
+                "missing": label_weight.get("nan", 0.0),
+            })
+        numeric = []
+        for spec in compiled.numerical:
+            op = value_ops.get(spec["column"])
+            numeric.append({
+                "column": spec["column"],
+                "op": op["kind"] if op else None,
+                "inputs": op["inputs"] if op else [spec["column"]],
+                "weight": float(weights[spec["index"]]),
+            })
+        return cls(intercept, categorical, binned, numeric, model_type=type(compiled.estimator).__name__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format_version": TABLE_FORMAT_VERSION,
+            "model_type": self.model_type,
+            "intercept": self.intercept,
+            "categorical": self.categorical,
+            "binned": self.binned,
+            "numeric": self.numeric,
+        }
+
+    def save(self, path: str) -> str:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "ScoringTable":
+        with open(path) as f:
+            table = json.load(f)
+        if table.get("format_version") != TABLE_FORMAT_VERSION:
+            raise ScoringTableError(f"Unsupported scoring table version {table.get('format_version')!r} in {path}.")
+        return cls(table["intercept"], table["categorical"], table["binned"], table["numeric"],
+                   model_type=table.get("model_type", "linear"))
+
+    # Single record, pure Python
+
+    def logit_record(self, record: Dict[str, Any]) -> float:
+        total = self.intercept
+        for column, table in self._tables:
+            total += table.get(record.get(column), 0.0)
+        for spec in self.binned:
+            value = _float(record[spec["column"]])
+            i = bisect_left(spec["bins"], value)
+            valid = 0 < i < len(spec["bins"]) and not math.isnan(value)
+            total += spec["contributions"][i - 1] if valid else spec["missing"]
+        for spec in self.numeric:
+            total += spec["weight"] * self._numeric_value(spec, record)
+        return total
+
+    @staticmethod
+    def _numeric_value(spec: Dict[str, Any], record: Dict[str, Any]) -> float:
+        value = _float(record[spec["inputs"][0]])
+        if spec["op"] == "ratio":
+            # InteractionFeatures: numerator / denominator.replace(0, 1)
+            denominator = _float(record[spec["inputs"][1]])
+            return value / (denominator if denominator != 0 else 1.0)
+        if spec["op"] == "log1p":
+            return _log1p(value)
+        return value
+
+    def predict_proba_record(self, record: Dict[str, Any]) -> float:
+        logit = self.logit_record(record)
+        # Overflow-safe logistic
+        if logit >= 0:
+            return 1.0 / (1.0 + math.exp(-logit))
+        z = math.exp(logit)
+        return z / (1.0 + z)
+
+    # Batches, numpy over integer codes
+
+    def encode(self, records: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (n x n_fields) integer codes into `contributions` and the (n x n_numeric) numeric values.
+        """
+        columns = {}
+        for spec in self.categorical + self.binned:
+            columns[spec["column"]] = [r.get(spec["column"]) for r in records]
+        for spec in self.numeric:
+            for col in spec["inputs"]:
+                columns[col] = [r.get(col) for r in records]
+        return self.encode_columns(columns, len(records))
+
+    def encode_columns(self, columns: Dict[str, Any], n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        `encode` for column arrays (lists, numpy arrays or pandas Series). Category-typed
+        Series are recoded through their categories instead of row by row.
+        """
+        codes = np.empty((n_rows, len(self._offsets)), dtype=np.intp)
+        for j, spec in enumerate(self.categorical):
+            lookup = {category: self._offsets[j] + i for i, category in enumerate(spec["categories"])}
+            codes[:, j] = self._category_codes(columns[spec["column"]], lookup, n_rows)
+        for k, spec in enumerate(self.binned):
+            j = len(self.categorical) + k
+            bins = np.asarray(spec["bins"], dtype=np.float64)
+            values = _as_float(columns[spec["column"]])
+            ids = np.searchsorted(bins, values, side="left")
+            invalid = (ids == 0) | (ids == len(bins)) | np.isnan(values)
+            # Bin i lives at offset + i - 1; `missing` right after the last bin
+            codes[:, j] = self._offsets[j] + np.where(invalid, len(bins) - 1, ids - 1)
+
+        numeric = np.empty((n_rows, len(self.numeric)), dtype=np.float64)
+        for j, spec in enumerate(self.numeric):
+            values = _as_float(columns[spec["inputs"][0]])
+            if spec["op"] == "ratio":
+                denominator = _as_float(columns[spec["inputs"][1]])
+                values = values / np.where(denominator == 0, 1.0, denominator)
+            elif spec["op"] == "log1p":
+                values = np.log1p(values)
+            numeric[:, j] = values
+        return codes, numeric
+
+    def _category_codes(self, values, lookup: Dict[str, int], n_rows: int) -> np.ndarray:
+        if hasattr(values, "cat"):
+            # Code -1 (missing) indexes the trailing unknown code
+            recode = np.array([lookup.get(c, self.unknown_code) for c in values.cat.categories] + [self.unknown_code],
+                              dtype=np.intp)
+            return recode[values.cat.codes.to_numpy()]
+        return np.fromiter((lookup.get(v, self.unknown_code) for v in values), dtype=np.intp, count=n_rows)
+
+    def logit_codes(self, codes: np.ndarray, numeric: np.ndarray) -> np.ndarray:
+        return self.intercept + self.contributions[codes].sum(axis=1) + numeric @ self.weights
+
+    def predict_proba_codes(self, codes: np.ndarray, numeric: np.ndarray) -> np.ndarray:
+        return expit(self.logit_codes(codes, numeric))
+
+    def predict_proba_records(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        return self.predict_proba_codes(*self.encode(records))
+
+
+def _as_float(values) -> np.ndarray:
+    if isinstance(values, list):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.asarray(values, dtype=np.float64)
+
+
+def check_parity(table: ScoringTable, predictor, records: List[Dict[str, Any]]) -> float:
+    """
+    Max absolute difference between ChurnPredictor's churn probabilities and the table's
+    (batch and per-record paths) on `records`.
+    """
+    expected = np.array([r["churn_probability"] for r in predictor.predict_batch(records)])
+    batch = table.predict_proba_records(records)
+    single = np.array([table.predict_proba_record(r) for r in records])
+    return float(max(np.max(np.abs(expected - batch)), np.max(np.abs(expected - single))))
+
+
+def main(argv: Optional[list] = None):
+    import pandas as pd
+    from src.data_validation.cleaner import DataCleaner
+    from src.inference.predictor import ChurnPredictor
+
+    parser = argparse.ArgumentParser(description="Export the additive scoring table of a linear churn model.")
+    parser.add_argument("--model", default="artifacts/models/baseline_model.joblib")
+    parser.add_argument("--output", default=None, help="Table path (default: <export dir>/<model name>.scoring.json)")
+    parser.add_argument("--check-data", default="data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv",
+                        help="Raw CSV scored by ChurnPredictor and the table for the parity check ('' to skip)")
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    predictor = ChurnPredictor(args.model, warm=False)
+    table = ScoringTable.from_pipeline(predictor.model, compiled=predictor.compiled)
+    if args.check_data:
+        df = DataCleaner().clean_data(pd.read_csv(args.check_data))
+        records = df.drop(columns=["customerID", "Churn"]).to_dict(orient="records")
+        max_diff = check_parity(table, predictor, records)
+        if max_diff > args.tolerance:
+            raise SystemExit(f"Scoring table disagrees with ChurnPredictor (max diff {max_diff:.3g}).")
+        logger.info(f"Scoring table parity OK on {len(records)} records (max diff {max_diff:.3g}).")
+
+    output = args.output or os.path.join(
+        "artifacts/export", f"{os.path.splitext(os.path.basename(args.model))[0]}.scoring.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    table.save(output)
+    logger.info(f"Wrote scoring table for {table.model_type} to {output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
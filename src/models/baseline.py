@@ -1,4 +1,4 @@
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.base import BaseEstimator, ClassifierMixin
@@ -29,3 +29,49 @@ class BaselineModel(BaseEstimator, ClassifierMixin):
 
     def predict_proba(self, X):
         return self.model.predict_proba(X)
+
+class IncrementalBaselineModel(BaseEstimator, ClassifierMixin):
+    """
+    Out-of-core counterpart of BaselineModel for data that does not fit in memory.
+    StandardScaler and an SGD logistic regression (loss='log_loss') are both trained
+    chunk by chunk with partial_fit; see src/training/streaming.py for the passes.
+    SGD's partial_fit does not support class_weight='balanced', so the balanced
+    weights are computed upfront from the class counts and passed in explicitly.
+    Averaged SGD (average=True) converges to the liblinear solution in a few epochs.
+    Exposes the same `model` Pipeline (scaler -> clf) as BaselineModel.
+    """
+    def __init__(self, class_weight=None, alpha=0.0001, average=True, random_state=42):
+        self.class_weight = class_weight
+        self.alpha = alpha
+        self.average = average
+        self.random_state = random_state
+        self.model = Pipeline([
+            ('scaler', StandardScaler()),
+            ('clf', SGDClassifier(loss='log_loss', alpha=self.alpha, average=self.average,
+                                  class_weight=self.class_weight, random_state=self.random_state))
+        ])
+
+    @staticmethod
+    def balanced_class_weight(class_counts):
+        # Same formula as class_weight='balanced': n_samples / (n_classes * n_samples_c)
+        total = sum(class_counts.values())
+        return {c: total / (len(class_counts) * n) for c, n in class_counts.items()}
+
+    def partial_fit_scaler(self, X):
+        self.model.named_steps['scaler'].partial_fit(X)
+        return self
+
+    def partial_fit(self, X, y, classes=(0, 1)):
+        X_scaled = self.model.named_steps['scaler'].transform(X)
+        self.model.named_steps['clf'].partial_fit(X_scaled, y, classes=list(classes))
+        return self
+
+    def fit(self, X, y):
+        logger.info("Training Incremental Baseline Model (SGD log-loss) on a single chunk...")
+        return self.partial_fit_scaler(X).partial_fit(X, y)
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
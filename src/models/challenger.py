@@ -1,3 +1,6 @@
+import os
+
+import xgboost as xgb
 from xgboost import XGBClassifier
 from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.pipeline import Pipeline
@@ -15,13 +18,20 @@ class ChallengerModel(BaseEstimator, ClassifierMixin):
     - We assume preprocessing happens upstream or we can bundle it. 
       For consistency with Baseline, we'll expect preprocessed features or add a simple pipeline.
     """
-    def __init__(self, random_state=42, n_estimators=100, max_depth=5, learning_rate=0.1, scale_pos_weight=1.0):
+    def __init__(self, random_state=42, n_estimators=100, max_depth=5, learning_rate=0.1, scale_pos_weight=1.0, n_jobs=-1,
+                 tree_method='hist', max_bin=256, early_stopping_rounds=None):
         self.random_state = random_state
         self.n_estimators = n_estimators
         self.max_depth = max_depth
         self.learning_rate = learning_rate
         self.scale_pos_weight = scale_pos_weight
+        self.n_jobs = n_jobs
+        self.tree_method = tree_method
+        self.max_bin = max_bin
+        self.early_stopping_rounds = early_stopping_rounds
         
+        # With tree_method='hist', XGBoost quantizes dense or scipy CSR input into a
+        # QuantileDMatrix (max_bin bins per feature) instead of keeping a float copy.
         self.model = XGBClassifier(
             n_estimators=self.n_estimators,
             max_depth=self.max_depth,
@@ -29,12 +39,64 @@ class ChallengerModel(BaseEstimator, ClassifierMixin):
             scale_pos_weight=self.scale_pos_weight,
             random_state=self.random_state,
             eval_metric='logloss',
-            n_jobs=-1
+            n_jobs=self.n_jobs,
+            tree_method=self.tree_method,
+            max_bin=self.max_bin,
+            early_stopping_rounds=self.early_stopping_rounds
         )
 
-    def fit(self, X, y):
+    def fit(self, X, y, eval_set=None, xgb_model=None):
+        """
+        `eval_set` ([(X_val, y_val)]) enables early stopping after `early_stopping_rounds`
+        rounds without improvement; predictions then use the best iteration.
+        `xgb_model` (a Booster) continues boosting from an existing model: `n_estimators`
+        more rounds are added on top of its trees.
+        """
         logger.info(f"Training Challenger Model (XGBoost) with scale_pos_weight={self.scale_pos_weight}...")
-        self.model.fit(X, y)
+        # XGBoost refuses early stopping without a validation set
+        self.model.set_params(early_stopping_rounds=self.early_stopping_rounds if eval_set else None)
+        self.model.fit(X, y, eval_set=eval_set, xgb_model=xgb_model, verbose=False)
+        return self
+
+    def refit_best(self, X, y, xgb_model=None):
+        """
+        After an early-stopped fit: a new ChallengerModel trained on all of X, y (validation
+        rows included) for the number of rounds early stopping chose, without early stopping.
+        """
+        base_rounds = xgb_model.num_boosted_rounds() if xgb_model is not None else 0
+        params = {**self.get_params(), 'n_estimators': max(self.n_trees - base_rounds, 1),
+                  'early_stopping_rounds': None}
+        logger.info(f"Refitting Challenger on all {X.shape[0]} training rows with {params['n_estimators']} rounds.")
+        return ChallengerModel(**params).fit(X, y, xgb_model=xgb_model)
+
+    @property
+    def n_trees(self):
+        """
+        Boosting rounds used for prediction (up to the best iteration when early stopping fired).
+        """
+        best_iteration = getattr(self.model, 'best_iteration', None)
+        if best_iteration is not None:
+            return best_iteration + 1
+        return self.model.get_booster().num_boosted_rounds()
+
+    def get_booster(self):
+        return self.model.get_booster()
+
+    def fit_external(self, make_chunks, cache_dir="artifacts/xgb_cache"):
+        """
+        Trains from an external-memory DMatrix for data larger than RAM.
+        `make_chunks` is a zero-argument callable returning a fresh iterator of (X, y)
+        feature chunks (dense or CSR); XGBoost pages each pass through `cache_dir`.
+        The booster is installed into the XGBClassifier, so predict/predict_proba and
+        pickling behave exactly as after fit().
+        """
+        logger.info(f"Training Challenger Model (XGBoost, external memory in {cache_dir})...")
+        os.makedirs(cache_dir, exist_ok=True)
+        dtrain = xgb.DMatrix(ChunkIterator(make_chunks, os.path.join(cache_dir, "dtrain")))
+        params = {k: v for k, v in self.model.get_xgb_params().items() if v is not None}
+        params['objective'] = 'binary:logistic'
+        self.model._Booster = xgb.train(params, dtrain, num_boost_round=self.n_estimators)
+        self.model.n_classes_ = 2
         return self
 
     def predict(self, X):
@@ -42,3 +104,27 @@ class ChallengerModel(BaseEstimator, ClassifierMixin):
 
     def predict_proba(self, X):
         return self.model.predict_proba(X)
+
+
+class ChunkIterator(xgb.DataIter):
+    """
+    Feeds (X, y) chunks to XGBoost's external-memory DMatrix. XGBoost calls reset()
+    before every pass over the data, so `make_chunks` is re-invoked each time.
+    """
+    def __init__(self, make_chunks, cache_prefix):
+        self._make_chunks = make_chunks
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self._chunks = iter(self._make_chunks())
+        try:
+            X, y = next(self._chunks)
+        except StopIteration:
+            return 0
+        input_data(data=X, label=y)
+        return 1
+
+    def reset(self):
+        self._chunks = None
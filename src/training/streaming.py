@@ -0,0 +1,165 @@
+import logging
+import os
+import time
+from typing import Dict, Any, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score, recall_score, precision_score, f1_score
+
+from src.data_validation.cleaner import DataCleaner
+from src.inference.bulk import detect_format, iter_chunks
+from src.models.baseline import IncrementalBaselineModel
+
+logger = logging.getLogger("ChurnPrediction.streaming")
+
+HASH_BUCKETS = 10_000
+
+
+class ChunkedDataset:
+    """
+    A CSV/Parquet training file read chunk by chunk, never holding more than one chunk
+    of raw rows (plus its feature matrix) in memory.
+
+    The train/test assignment is a deterministic hash of customerID, so every pass
+    (and every run) sees the same split without keeping an index in memory.
+    """
+    def __init__(self, config: Dict[str, Any], source: str = None):
+        streaming_config = config.get('streaming', {})
+        self.source = source or self.default_source(config)
+        self.file_format = detect_format(self.source)
+        self.chunk_size = streaming_config.get('chunk_size', 100_000)
+        self.test_size = streaming_config.get('test_size', 0.2)
+        self.target_col = config['data']['target_col']
+        self.churn_label = config['data'].get('churn_label', 'Yes')
+        self.cleaner = DataCleaner()
+        self.n_rows = None  # Set by the scan pass
+
+    @staticmethod
+    def default_source(config: Dict[str, Any]) -> str:
+        # Prefer the typed Parquet copy written by DataIngestor; fall back to the raw CSV
+        processed = config['data'].get('processed_path')
+        return processed if processed and os.path.exists(processed) else config['data']['raw_path']
+
+    def _is_test(self, chunk: pd.DataFrame) -> np.ndarray:
+        keys = chunk['customerID'] if 'customerID' in chunk.columns else chunk
+        buckets = pd.util.hash_pandas_object(keys, index=False).to_numpy() % HASH_BUCKETS
+        return buckets < int(self.test_size * HASH_BUCKETS)
+
+    def iter_split(self) -> Iterator[Tuple[pd.DataFrame, np.ndarray, np.ndarray]]:
+        """
+        Yields (features, y, is_test) per chunk; features exclude the target and customerID.
+        """
+        for chunk in iter_chunks(self.source, self.file_format, self.chunk_size):
+            chunk = self.cleaner.clean_data(chunk)
+            y = (chunk[self.target_col] == self.churn_label).to_numpy().astype(int)
+            is_test = self._is_test(chunk)
+            X = chunk.drop(columns=[c for c in (self.target_col, 'customerID') if c in chunk.columns])
+            yield X, y, is_test
+
+    def iter_features(self, feature_pipeline, test: bool = False):
+        """
+        Yields (transformed X, y) for the training (or held-out) rows of each chunk.
+        """
+        for X, y, is_test in self.iter_split():
+            rows = is_test if test else ~is_test
+            if rows.any():
+                yield feature_pipeline.transform(X[rows]), y[rows]
+
+    def fit_feature_pipeline(self, feature_pipeline) -> Dict[int, int]:
+        """
+        Scan pass: learns the one-hot categories (after feature engineering) and the training
+        class counts, then fits `feature_pipeline` on a small sample of training rows with
+        those categories fixed. Returns the class counts.
+        """
+        engineering = feature_pipeline.named_steps['feature_eng']
+        preprocessor = feature_pipeline.named_steps['preprocessor']
+        ohe_cols = next(cols for name, _, cols in preprocessor.transformers if name == 'cat')
+        categories = {col: set() for col in ohe_cols}
+        class_counts = {0: 0, 1: 0}
+        sample = None
+        rows = 0
+
+        for X, y, is_test in self.iter_split():
+            engineered = engineering.transform(X)
+            for col in ohe_cols:
+                # Missing values are not a category (they encode as all zeros), and NaN can't be sorted with strings
+                values = engineered[col]
+                categories[col].update(pd.unique(np.asarray(values[values.notna()], dtype=object)))
+            train_y = y[~is_test]
+            class_counts[1] += int(train_y.sum())
+            class_counts[0] += int(len(train_y) - train_y.sum())
+            if sample is None and (~is_test).any():
+                # Held-out rows must not reach any fit, not even the sample
+                sample = X[~is_test].head(1000)
+            rows += len(X)
+
+        if sample is None or min(class_counts.values()) == 0:
+            raise ValueError(f"Streaming source {self.source} has no rows of one of the classes.")
+
+        self.n_rows = rows
+        preprocessor.set_params(cat__categories=[sorted(categories[col]) for col in ohe_cols])
+        # Categories are fixed, so fitting on a sample is enough to build the transformer
+        feature_pipeline.fit(sample)
+        logger.info(f"Scan pass: {rows:,} rows, train class counts {class_counts}, "
+                    f"{sum(len(v) for v in categories.values())} categories across {len(ohe_cols)} columns")
+        return class_counts
+
+    def evaluate(self, model, feature_pipeline) -> Dict[str, float]:
+        y_true, y_prob = [], []
+        for X_t, y in self.iter_features(feature_pipeline, test=True):
+            y_prob.append(model.predict_proba(X_t)[:, 1])
+            y_true.append(y)
+        y_true = np.concatenate(y_true)
+        y_prob = np.concatenate(y_prob)
+        y_pred = (y_prob >= 0.5).astype(int)
+        return {
+            'test_rows': int(len(y_true)),
+            'roc_auc': roc_auc_score(y_true, y_prob),
+            'recall': recall_score(y_true, y_pred),
+            'precision': precision_score(y_true, y_pred, zero_division=0),
+            'f1': f1_score(y_true, y_pred),
+        }
+
+
+class StreamingBaselineTrainer:
+    """
+    Trains the baseline over a ChunkedDataset. Passes over the file:
+    1. Scan: one-hot categories and class counts (ChunkedDataset.fit_feature_pipeline).
+    2. Scaler: StandardScaler.partial_fit on the transformed training rows.
+    3. `n_epochs` passes of averaged-SGD logistic regression partial_fit with balanced class weights.
+    4. Evaluation on the held-out rows.
+    The result is a regular Pipeline([('features', ...), ('model', ...)]) artifact.
+    """
+    def __init__(self, config: Dict[str, Any], feature_pipeline, source: str = None):
+        streaming_config = config.get('streaming', {})
+        self.dataset = ChunkedDataset(config, source)
+        self.n_epochs = streaming_config.get('n_epochs', 5)
+        self.alpha = streaming_config.get('alpha', 0.0001)
+        self.random_state = config['project'].get('random_seed', 42)
+        self.feature_pipeline = feature_pipeline
+
+    def fit(self):
+        """
+        Runs every pass. Returns (pipeline-ready model, fitted feature pipeline, test metrics).
+        """
+        start = time.perf_counter()
+        class_counts = self.dataset.fit_feature_pipeline(self.feature_pipeline)
+        model = IncrementalBaselineModel(
+            class_weight=IncrementalBaselineModel.balanced_class_weight(class_counts),
+            alpha=self.alpha,
+            random_state=self.random_state,
+        )
+
+        for X_t, _ in self.dataset.iter_features(self.feature_pipeline):
+            model.partial_fit_scaler(X_t)
+        logger.info("Scaler pass complete.")
+
+        for epoch in range(self.n_epochs):
+            for X_t, y in self.dataset.iter_features(self.feature_pipeline):
+                model.partial_fit(X_t, y)
+            logger.info(f"SGD epoch {epoch + 1}/{self.n_epochs} complete.")
+
+        metrics = self.dataset.evaluate(model, self.feature_pipeline)
+        metrics['train_seconds'] = round(time.perf_counter() - start, 2)
+        return model, self.feature_pipeline, metrics
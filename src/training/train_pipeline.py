@@ -1,5 +1,10 @@
 import argparse
 import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
 
 # Enforce single-threaded execution for safety on resource-limited environment
 os.environ["OMP_NUM_THREADS"] = "1"
@@ -10,7 +15,6 @@ os.environ["NUMEXPR_NUM_THREADS"] = "1"
 
 import pandas as pd
 import numpy as np
-import yaml
 import joblib
 import logging
 from sklearn.pipeline import Pipeline
@@ -18,102 +22,246 @@ from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.metrics import classification_report, roc_auc_score, recall_score, precision_score, f1_score
 
+from src.data_ingestion.ingestor import DataIngestor
 from src.data_validation.cleaner import DataCleaner
-from src.data_validation.validator import DataValidator
 from src.data_splitting.splitter import DataSplitter
-from src.feature_engineering.transformers import TenureBinning, LogTransformer, InteractionFeatures
-from src.models.baseline import BaselineModel
-from src.models.challenger import ChallengerModel
+from src.feature_engineering.transformers import EngineeredFeatures
+from src.feature_engineering.cache import FeatureCache
 from src.utils.logger import setup_logger
+from src.utils.config import load_config
+from src.utils.profiling import StageProfiler, profile_stage
+# pandera (validator), xgboost (challenger/tuning), the streaming trainers and the exporter
+# are imported by the functions that use them, so e.g. --stream never loads pandera and a
+# baseline-only run never loads xgboost.
 
-# Initialize Logger
-logger = setup_logger()
+# Handlers (training.log + console) are attached by setup_logger() in each entry function,
+# so programmatic callers of train()/tune() get the training log too.
+logger = logging.getLogger("ChurnPrediction")
 
-def load_config(config_path="configs/config.yaml"):
-    try:
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        # Fallback for when running from root
-        config_path = os.path.join(os.getcwd(), config_path)
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f)
-
-def build_feature_pipeline(config):
+def build_feature_pipeline(config, sparse=False):
+    """
+    `sparse=True` keeps the one-hot output as a scipy CSR matrix (for the Challenger;
+    the Baseline's StandardScaler needs dense input).
+    """
     cat_cols = config['feature_engineering']['categorical_cols']
     
-    engineering_pipeline = Pipeline([
-        ('interaction', InteractionFeatures()),
-        ('tenure_bin', TenureBinning()),
-        ('log_transform', LogTransformer(columns=['TotalCharges'])),
-    ])
+    # Interaction ratio, tenure cohorts and log1p in one vectorized pass
+    engineering = EngineeredFeatures(log_columns=['TotalCharges'])
     
     ohe_cols = cat_cols + ['tenure_group']
     
     preprocessor = ColumnTransformer(
         transformers=[
-            ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=False), ohe_cols),
+            ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=sparse), ohe_cols),
             ('num', 'passthrough', config['feature_engineering']['numerical_cols'] + ['calculated_AvgCharges', 'TotalCharges_log'])
         ],
-        remainder='drop'
+        remainder='drop',
+        sparse_threshold=1.0 if sparse else 0.3
     )
     
     return Pipeline([
-        ('feature_eng', engineering_pipeline),
+        ('feature_eng', engineering),
         ('preprocessor', preprocessor)
     ])
 
-def train(model_type='all'):
-    logger.info(f"Starting training pipeline. Mode: {model_type}")
-    config = load_config()
-    
-    # 1. Load Data
-    logger.info("Loading Data...")
-    df = pd.read_csv(config['data']['raw_path'])
+def save_model(pipeline, path):
+    """
+    Writes the artifact to a temporary file and atomically renames it into place, so a
+    serving process hot-reloading (or memory-mapping) `path` never sees a partial file.
+    """
+    tmp_path = f"{path}.tmp"
+    joblib.dump(pipeline, tmp_path)
+    os.replace(tmp_path, path)
+
+def export_if_enabled(config, pipeline, path, X_check=None):
+    """
+    Writes the portable export of the artifact saved at `path` (same base name) when
+    `export.enabled`, checked against the pipeline on `X_check`. A failed export is
+    logged, never fatal: the joblib artifact stays the source of truth.
+    """
+    export_config = config.get('export', {})
+    if not export_config.get('enabled', False):
+        return
+    from src.inference.export import export_model, ExportError, DEFAULT_TOLERANCE
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        export_model(pipeline, export_config.get('dir', 'artifacts/export'), name=name, X_check=X_check,
+                     tolerance=export_config.get('tolerance', DEFAULT_TOLERANCE))
+    except ExportError as e:
+        logger.warning(f"Portable export of {name} skipped: {e}")
+
+def prepare_data(config, df=None):
+    """
+    Load -> clean -> validate -> split. Returns X_train, X_test, y_train, y_test.
+    `df` skips loading and uses the given raw frame instead.
+    """
+    # 1. Load Data (typed Parquet, converted from the raw CSV on first use)
+    if df is None:
+        logger.info("Loading Data...")
+        with profile_stage("load"):
+            df = DataIngestor(config).load()
     
     # 2. Clean Data
-    cleaner = DataCleaner()
-    df = cleaner.clean_data(df)
+    with profile_stage("clean"):
+        cleaner = DataCleaner()
+        df = cleaner.clean_data(df)
     
     # 3. Validate Data
-    validator = DataValidator()
-    try:
-        validator.validate(df)
-    except Exception as e:
-        logger.warning(f"Data Validation warning: {e}")
+    with profile_stage("validate"):
+        from src.data_validation.validator import DataValidator
+        validation_config = config.get('validation', {})
+        validator = DataValidator(
+            mode=validation_config.get('mode', 'full'),
+            sample_size=validation_config.get('sample_size', 100_000),
+            random_state=config['project']['random_seed'],
+            target_col=config['data']['target_col'],
+        )
+        try:
+            validator.validate(df)
+        except Exception as e:
+            logger.warning(f"Data Validation warning: {e}")
     
     # 4. Split Data
-    splitter = DataSplitter(target_column=config['data']['target_col'])
-    train_df, test_df = splitter.split_data(df)
-    
+    with profile_stage("split"):
+        splitter = DataSplitter(target_column=config['data']['target_col'])
+        train_df, test_df = splitter.split_data(df)
+        
+        target = config['data']['target_col']
+        churn_label = config['data'].get('churn_label', 'Yes')
+        y_train = (train_df[target] == churn_label).astype(int)
+        y_test = (test_df[target] == churn_label).astype(int)
+        
+        X_train = train_df.drop(columns=[target, 'customerID'])
+        X_test = test_df.drop(columns=[target, 'customerID'])
+    return X_train, X_test, y_train, y_test
+
+def materialize_features(config, X_train, X_test, use_cache=True, sparse=False):
+    """
+    Fits the feature pipeline once and transforms train/test, so every model trains and
+    is evaluated on the same matrices. With the cache enabled, the result is stored
+    content-addressed (data hash + pipeline/code hash) and a rerun on unchanged data
+    skips feature engineering entirely.
+    Returns (fitted feature_pipeline, X_train_t, X_test_t).
+    """
+    feature_pipeline = build_feature_pipeline(config, sparse=sparse)
+    cache_config = config.get('feature_cache', {})
+    use_cache = use_cache and cache_config.get('enabled', True)
+
+    if use_cache:
+        cache = FeatureCache(cache_config.get('dir', 'artifacts/feature_cache'))
+        key, inputs = cache.make_key(feature_pipeline, X_train, X_test)
+        cached = cache.load(key)
+        if cached is not None:
+            logger.info(f"Feature cache hit ({key}); skipping feature engineering.")
+            return cached
+        logger.info(f"Feature cache miss ({key}); building features.")
+
+    X_train_t = feature_pipeline.fit_transform(X_train)
+    X_test_t = feature_pipeline.transform(X_test)
+
+    if use_cache:
+        cache.save(key, inputs, feature_pipeline, X_train_t, X_test_t)
+    return feature_pipeline, X_train_t, X_test_t
+
+CHALLENGER_PATH = "artifacts/models/challenger_model.joblib"
+
+def challenger_params(config):
+    challenger_config = config['modeling']['challenger']
+    early_stopping = challenger_config.get('early_stopping', {})
+    return {
+        'tree_method': challenger_config.get('tree_method', 'hist'),
+        'max_bin': challenger_config.get('max_bin', 256),
+        'early_stopping_rounds': early_stopping.get('rounds') if early_stopping.get('enabled', False) else None,
+    }
+
+def carve_validation(config, X_t, y):
+    """
+    Splits the (transformed) training rows into fit/validation sets with DataSplitter,
+    stratified on the target. Works for dense and sparse matrices.
+    """
     target = config['data']['target_col']
-    y_train = train_df[target].apply(lambda x: 1 if x == 'Yes' else 0)
-    y_test = test_df[target].apply(lambda x: 1 if x == 'Yes' else 0)
-    
-    X_train = train_df.drop(columns=[target, 'customerID'])
-    X_test = test_df.drop(columns=[target, 'customerID'])
+    validation_size = config['modeling']['challenger'].get('early_stopping', {}).get('validation_size', 0.15)
+    rows = pd.DataFrame({'row': np.arange(len(y)), target: np.asarray(y)})
+    splitter = DataSplitter(target_column=target, test_size=validation_size,
+                            random_state=config['project']['random_seed'])
+    fit_rows, val_rows = splitter.split_data(rows)
+    fit_idx, val_idx = fit_rows['row'].to_numpy(), val_rows['row'].to_numpy()
+    y = np.asarray(y)
+    return X_t[fit_idx], X_t[val_idx], y[fit_idx], y[val_idx]
+
+def fit_challenger(config, model, X_t, y, xgb_model=None):
+    """
+    Fits `model`. When modeling.challenger.early_stopping is enabled, the number of rounds
+    is chosen on a validation split carved from the training rows, then the model is refit
+    with that many rounds on every training row.
+    """
+    if model.early_stopping_rounds:
+        X_fit, X_val, y_fit, y_val = carve_validation(config, X_t, y)
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], xgb_model=xgb_model)
+        return model.refit_best(X_t, y, xgb_model=xgb_model)
+    return model.fit(X_t, y, xgb_model=xgb_model)
+
+def load_previous_challenger(path=CHALLENGER_PATH):
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path)
+    except Exception as e:
+        logger.warning(f"Could not load previous challenger from {path}: {e}")
+        return None
+
+def log_retrain_summary(previous, pipeline, X_test, y_test, trees_added, seconds):
+    """
+    Logs trees added, wall time and the ROC-AUC/recall change against the previous
+    challenger artifact (scored on the same test split).
+    """
+    logger.info(f"Retrain summary: {trees_added} trees added in {seconds:.2f}s")
+    if previous is None:
+        logger.info("No previous challenger to compare against.")
+        return
+    try:
+        old_prob = previous.predict_proba(X_test)[:, 1]
+    except Exception as e:
+        logger.warning(f"Previous challenger could not score the test split: {e}")
+        return
+    new_prob = pipeline.predict_proba(X_test)[:, 1]
+    old_auc, new_auc = roc_auc_score(y_test, old_prob), roc_auc_score(y_test, new_prob)
+    old_recall, new_recall = recall_score(y_test, old_prob >= 0.5), recall_score(y_test, new_prob >= 0.5)
+    logger.info(f"ROC-AUC: {old_auc:.4f} -> {new_auc:.4f} ({new_auc - old_auc:+.4f}), "
+                f"Recall: {old_recall:.4f} -> {new_recall:.4f} ({new_recall - old_recall:+.4f})")
+
+def train(model_type='all', use_feature_cache=True):
+    setup_logger()
+    logger.info(f"Starting training pipeline. Mode: {model_type}")
+    config = load_config()
+    with profile_stage("prepare_data"):
+        X_train, X_test, y_train, y_test = prepare_data(config)
     
-    # 5. Build Feature Pipeline
-    feature_pipeline = build_feature_pipeline(config)
+    # 5. Build Features (once, shared by every model)
+    with profile_stage("feature_build"):
+        feature_pipeline, X_train_t, X_test_t = materialize_features(config, X_train, X_test, use_cache=use_feature_cache)
     
     os.makedirs("artifacts/models", exist_ok=True)
 
     # --- Baseline ---
     if model_type in ['all', 'baseline']:
+        from src.models.baseline import BaselineModel
         logger.info("Training Baseline Model...")
+        with profile_stage("baseline_fit"):
+            baseline_model = BaselineModel().fit(X_train_t, y_train)
         baseline_pipeline = Pipeline([
             ('features', feature_pipeline),
-            ('model', BaselineModel())
+            ('model', baseline_model)
         ])
-        baseline_pipeline.fit(X_train, y_train)
-        y_pred_base = baseline_pipeline.predict(X_test)
-        y_prob_base = baseline_pipeline.predict_proba(X_test)[:, 1]
-        
-        # Metrics
-        auc = roc_auc_score(y_test, y_prob_base)
-        recall = recall_score(y_test, y_pred_base)
-        precision = precision_score(y_test, y_pred_base)
-        f1 = f1_score(y_test, y_pred_base)
+        with profile_stage("baseline_eval"):
+            y_pred_base = baseline_model.predict(X_test_t)
+            y_prob_base = baseline_model.predict_proba(X_test_t)[:, 1]
+            
+            # Metrics
+            auc = roc_auc_score(y_test, y_prob_base)
+            recall = recall_score(y_test, y_pred_base)
+            precision = precision_score(y_test, y_pred_base)
+            f1 = f1_score(y_test, y_pred_base)
 
         logger.info("Baseline Results:")
         logger.info(f"ROC-AUC: {auc:.4f}")
@@ -122,46 +270,333 @@ def train(model_type='all'):
         logger.info(f"F1-Score: {f1:.4f}")
         logger.info("\n" + classification_report(y_test, y_pred_base))
         
-        joblib.dump(baseline_pipeline, "artifacts/models/baseline_model.joblib")
-        # Also save as best_model if running single mode or if it beats others (logic handled in 'all')
-        if model_type == 'baseline':
-             joblib.dump(baseline_pipeline, "artifacts/models/best_model.joblib")
-             logger.info("Saved baseline as best_model.joblib")
+        with profile_stage("baseline_save"):
+            save_model(baseline_pipeline, "artifacts/models/baseline_model.joblib")
+            export_if_enabled(config, baseline_pipeline, "artifacts/models/baseline_model.joblib", X_check=X_test)
+            # Also save as best_model if running single mode or if it beats others (logic handled in 'all')
+            if model_type == 'baseline':
+                 save_model(baseline_pipeline, "artifacts/models/best_model.joblib")
+                 export_if_enabled(config, baseline_pipeline, "artifacts/models/best_model.joblib", X_check=X_test)
+                 logger.info("Saved baseline as best_model.joblib")
 
     # --- Challenger ---
     if model_type in ['all', 'challenger']:
+        from src.models.challenger import ChallengerModel
         logger.info("Training Challenger Model...")
+        challenger_config = config['modeling']['challenger']
+        if challenger_config.get('sparse_features', False):
+            # The one-hot block stays CSR; XGBoost's hist method consumes it without densifying
+            with profile_stage("challenger_feature_build"):
+                chal_features, chal_train_t, chal_test_t = materialize_features(
+                    config, X_train, X_test, use_cache=use_feature_cache, sparse=True
+                )
+        else:
+            chal_features, chal_train_t, chal_test_t = feature_pipeline, X_train_t, X_test_t
+        start = time.perf_counter()
+        with profile_stage("challenger_fit"):
+            challenger_model = fit_challenger(config, ChallengerModel(**challenger_params(config)), chal_train_t, y_train)
+        fit_seconds = time.perf_counter() - start
         challenger_pipeline = Pipeline([
-            ('features', feature_pipeline),
-            ('model', ChallengerModel())
+            ('features', chal_features),
+            ('model', challenger_model)
         ])
-        challenger_pipeline.fit(X_train, y_train)
-        y_pred_chal = challenger_pipeline.predict(X_test)
-        y_prob_chal = challenger_pipeline.predict_proba(X_test)[:, 1]
-        
-        # Metrics
-        auc = roc_auc_score(y_test, y_prob_chal)
-        recall = recall_score(y_test, y_pred_chal)
-        
-        logger.info("Challenger Results:")
-        logger.info(f"ROC-AUC: {auc:.4f}")
-        logger.info(f"Recall: {recall:.4f}")
-        logger.info("\n" + classification_report(y_test, y_pred_chal))
+        with profile_stage("challenger_eval"):
+            y_pred_chal = challenger_model.predict(chal_test_t)
+            y_prob_chal = challenger_model.predict_proba(chal_test_t)[:, 1]
+            
+            # Metrics
+            auc = roc_auc_score(y_test, y_prob_chal)
+            recall = recall_score(y_test, y_pred_chal)
+            
+            logger.info("Challenger Results:")
+            logger.info(f"ROC-AUC: {auc:.4f}")
+            logger.info(f"Recall: {recall:.4f}")
+            logger.info("\n" + classification_report(y_test, y_pred_chal))
+            logger.info(f"Challenger fit: {challenger_model.n_trees} trees in {fit_seconds:.2f}s")
         
-        joblib.dump(challenger_pipeline, "artifacts/models/challenger_model.joblib")
-        
-        if model_type == 'challenger':
-             joblib.dump(challenger_pipeline, "artifacts/models/best_model.joblib")
+        with profile_stage("challenger_save"):
+            save_model(challenger_pipeline, CHALLENGER_PATH)
+            export_if_enabled(config, challenger_pipeline, CHALLENGER_PATH, X_check=X_test)
+            
+            if model_type == 'challenger':
+                 save_model(challenger_pipeline, "artifacts/models/best_model.joblib")
+                 export_if_enabled(config, challenger_pipeline, "artifacts/models/best_model.joblib", X_check=X_test)
 
-    # Comparison logic for 'all' mode
+    # Comparison logic for 'all' mode: k-fold on the training split, winner becomes best_model
     if model_type == 'all':
-        # Re-calculate to match variables scope or refactor. 
-        # For safety and adhering to current task, we assume 'baseline' mode is what's running.
-        pass
+        with profile_stage("cross_validation"):
+            champion = select_champion(config, {'baseline': X_train_t, 'challenger': chal_train_t}, y_train)
+        pipelines = {'baseline': baseline_pipeline, 'challenger': challenger_pipeline}
+        with profile_stage("champion_save"):
+            save_model(pipelines[champion], "artifacts/models/best_model.joblib")
+            export_if_enabled(config, pipelines[champion], "artifacts/models/best_model.joblib", X_check=X_test)
+        logger.info(f"Promoted {champion} to best_model.joblib")
+
+def select_champion(config, matrices, y_train):
+    """
+    Cross-validates every model in `matrices` ({name: transformed training features}) in
+    parallel and returns the champion's name (see src/evaluation/cross_validation.py).
+    """
+    from src.evaluation.cross_validation import ModelComparison
+    early_stopping = config['modeling']['challenger'].get('early_stopping', {})
+    comparison = ModelComparison(config.get('selection', {}), random_state=config['project']['random_seed'],
+                                 validation_size=early_stopping.get('validation_size', 0.15))
+    summaries = comparison.evaluate(matrices, y_train, model_params={'challenger': challenger_params(config)})
+    comparison.log_summary(summaries)
+    champion = comparison.choose_champion(summaries)
+    logger.info(f"Cross-validation report written to {comparison.write_report(summaries, champion)}")
+    return champion
+
+def train_incremental(source=None):
+    """
+    Warm-start retrain: continues boosting the existing challenger_model.joblib on the
+    current data (or `source`), reusing its fitted feature pipeline so the feature
+    columns line up. modeling.challenger.incremental.n_estimators rounds are added, with
+    early stopping when enabled.
+    """
+    setup_logger()
+    from src.models.challenger import ChallengerModel
+    logger.info("Starting training pipeline. Mode: challenger (incremental)")
+    config = load_config()
+    previous = load_previous_challenger()
+    if previous is None:
+        raise FileNotFoundError(f"Incremental retraining needs an existing model at {CHALLENGER_PATH}.")
+
+    df = None
+    if source is not None:
+        # A CSV extract gets the same typed read as the raw data, so validation sees the same schema
+        df = pd.read_parquet(source) if source.endswith((".parquet", ".pq")) else DataIngestor(config).read_raw(source)
+    with profile_stage("prepare_data"):
+        X_train, X_test, y_train, y_test = prepare_data(config, df=df)
+
+    feature_pipeline = previous.named_steps['features']
+    base_model = previous.named_steps['model']
+    with profile_stage("feature_build"):
+        X_train_t = feature_pipeline.transform(X_train)
+
+    # Keep the tuned hyperparameters; artifacts from older versions may lack newer params
+    params = {name: getattr(base_model, name) for name in ChallengerModel._get_param_names() if hasattr(base_model, name)}
+    params.update(challenger_params(config))
+    params['n_estimators'] = config['modeling']['challenger'].get('incremental', {}).get('n_estimators', 50)
+    # Continue from the trees the previous model actually predicts with
+    base_booster = base_model.get_booster()[:base_model.n_trees]
+
+    start = time.perf_counter()
+    with profile_stage("challenger_fit"):
+        model = fit_challenger(config, ChallengerModel(**params), X_train_t, y_train, xgb_model=base_booster)
+    fit_seconds = time.perf_counter() - start
+
+    challenger_pipeline = Pipeline([
+        ('features', feature_pipeline),
+        ('model', model)
+    ])
+    with profile_stage("challenger_eval"):
+        log_retrain_summary(previous, challenger_pipeline, X_test, y_test, model.n_trees - base_model.n_trees, fit_seconds)
+
+    with profile_stage("challenger_save"):
+        save_model(challenger_pipeline, CHALLENGER_PATH)
+        export_if_enabled(config, challenger_pipeline, CHALLENGER_PATH, X_check=X_test)
+        save_model(challenger_pipeline, "artifacts/models/best_model.joblib")
+        export_if_enabled(config, challenger_pipeline, "artifacts/models/best_model.joblib", X_check=X_test)
+    logger.info(f"Saved incrementally retrained challenger ({model.n_trees} trees) as best_model.joblib")
+
+def tune(use_feature_cache=True):
+    """
+    Hyperparameter search for the Challenger. The feature pipeline is fitted once and its
+    output shared by every trial; trials run in parallel (see src/training/tuning.py).
+    The best trial by recall is refit on the full training split and promoted to best_model.joblib.
+    """
+    setup_logger()
+    from src.models.challenger import ChallengerModel
+    from src.training.tuning import ChallengerTuner
+    logger.info("Starting training pipeline. Mode: tune")
+    config = load_config()
+    with profile_stage("prepare_data"):
+        X_train, X_test, y_train, y_test = prepare_data(config)
+
+    sparse = config['modeling']['challenger'].get('sparse_features', False)
+    with profile_stage("feature_build"):
+        feature_pipeline, X_train_t, X_test_t = materialize_features(
+            config, X_train, X_test, use_cache=use_feature_cache, sparse=sparse
+        )
+
+    tuner = ChallengerTuner(config['tuning'], random_state=config['project']['random_seed'],
+                            model_params=challenger_params(config))
+    # Trials run in worker processes; this stage sees the parent waiting on them
+    with profile_stage("search"):
+        leaderboard = tuner.search(X_train_t, y_train.values)
+
+    os.makedirs(tuner.work_dir, exist_ok=True)
+    leaderboard_path = os.path.join(tuner.work_dir, "leaderboard.csv")
+    leaderboard.to_csv(leaderboard_path, index=False)
+    logger.info(f"Leaderboard written to {leaderboard_path}:\n{leaderboard.head(10).to_string(index=False)}")
+
+    best_params = tuner.best_params(leaderboard)
+    logger.info(f"Refitting best Challenger on full training split: {best_params}")
+    with profile_stage("challenger_fit"):
+        model = ChallengerModel(**best_params, **challenger_params(config)).fit(X_train_t, y_train)
+    challenger_pipeline = Pipeline([
+        ('features', feature_pipeline),
+        ('model', model)
+    ])
+
+    y_pred_chal = model.predict(X_test_t)
+    y_prob_chal = model.predict_proba(X_test_t)[:, 1]
+    logger.info("Tuned Challenger Results:")
+    logger.info(f"ROC-AUC: {roc_auc_score(y_test, y_prob_chal):.4f}")
+    logger.info(f"Recall: {recall_score(y_test, y_pred_chal):.4f}")
+    logger.info("\n" + classification_report(y_test, y_pred_chal))
+
+    os.makedirs("artifacts/models", exist_ok=True)
+    with profile_stage("challenger_save"):
+        save_model(challenger_pipeline, "artifacts/models/challenger_model.joblib")
+        export_if_enabled(config, challenger_pipeline, "artifacts/models/challenger_model.joblib", X_check=X_test)
+        save_model(challenger_pipeline, "artifacts/models/best_model.joblib")
+        export_if_enabled(config, challenger_pipeline, "artifacts/models/best_model.joblib", X_check=X_test)
+    logger.info("Saved tuned challenger as best_model.joblib")
+
+def train_streaming(model_type='baseline', source=None, compare_memory=False):
+    """
+    Out-of-core training (see src/training/streaming.py): reads `source` (default: the
+    processed Parquet, else the raw CSV) in chunks and never loads it whole.
+    - Baseline: scaler + averaged SGD trained with partial_fit. Reports the traced peak
+      memory, and with `compare_memory` also that of the in-memory path.
+    - Challenger: XGBoost trained from an external-memory DMatrix fed chunk by chunk.
+    """
+    setup_logger()
+    from src.training.streaming import ChunkedDataset, StreamingBaselineTrainer
+    logger.info(f"Starting training pipeline. Mode: {model_type} (streaming)")
+    config = load_config()
+    os.makedirs("artifacts/models", exist_ok=True)
+
+    if model_type in ['all', 'baseline']:
+        trainer = StreamingBaselineTrainer(config, build_feature_pipeline(config), source=source)
+        logger.info(f"Streaming {trainer.dataset.source} in chunks of {trainer.dataset.chunk_size:,} rows")
+
+        # A profiled run is already tracing; leave its tracing running
+        own_tracing = not tracemalloc.is_tracing()
+        if own_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        with profile_stage("baseline_fit"):
+            model, feature_pipeline, metrics = trainer.fit()
+        streaming_peak = tracemalloc.get_traced_memory()[1]
+
+        logger.info("Streaming Baseline Results:")
+        log_stream_metrics(metrics)
+        logger.info(f"Peak traced memory (streaming): {streaming_peak / 1e6:.1f} MB")
+
+        if compare_memory:
+            if trainer.dataset.n_rows <= trainer.dataset.chunk_size:
+                logger.warning(f"The source ({trainer.dataset.n_rows:,} rows) fits in one chunk of "
+                               f"{trainer.dataset.chunk_size:,}, so streaming holds all of it at once too and "
+                               "can't peak lower than the in-memory path; chunking only bounds peak memory "
+                               "for sources larger than streaming.chunk_size.")
+            # Same source, loaded whole, through the regular in-memory Baseline path
+            tracemalloc.reset_peak()
+            with profile_stage("in_memory_comparison"):
+                reader = pd.read_parquet if trainer.dataset.file_format == "parquet" else pd.read_csv
+                X_train, X_test, y_train, y_test = prepare_data(config, df=reader(trainer.dataset.source))
+                X_train_t = build_feature_pipeline(config).fit_transform(X_train)
+                from src.models.baseline import BaselineModel
+                BaselineModel().fit(X_train_t, y_train)
+            in_memory_peak = tracemalloc.get_traced_memory()[1]
+            logger.info(f"Peak traced memory (in-memory): {in_memory_peak / 1e6:.1f} MB "
+                        f"({in_memory_peak / streaming_peak:.1f}x streaming)")
+            if trainer.dataset.file_format == "parquet":
+                logger.info("tracemalloc does not see pyarrow's buffers, so both figures (the in-memory one "
+                            "most, as it reads the whole file) understate a Parquet source; "
+                            f"process peak RSS so far: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+        if own_tracing:
+            tracemalloc.stop()
+
+        baseline_pipeline = Pipeline([
+            ('features', feature_pipeline),
+            ('model', model)
+        ])
+        with profile_stage("baseline_save"):
+            save_model(baseline_pipeline, "artifacts/models/baseline_model.joblib")
+            export_if_enabled(config, baseline_pipeline, "artifacts/models/baseline_model.joblib")
+            if model_type == 'baseline':
+                save_model(baseline_pipeline, "artifacts/models/best_model.joblib")
+                export_if_enabled(config, baseline_pipeline, "artifacts/models/best_model.joblib")
+                logger.info("Saved streaming baseline as best_model.joblib")
+
+    if model_type in ['all', 'challenger']:
+        from src.models.challenger import ChallengerModel
+        challenger_config = config['modeling']['challenger']
+        dataset = ChunkedDataset(config, source=source)
+        logger.info(f"Streaming {dataset.source} in chunks of {dataset.chunk_size:,} rows into XGBoost external memory")
+        start = time.perf_counter()
+        feature_pipeline = build_feature_pipeline(config, sparse=challenger_config.get('sparse_features', False))
+        with profile_stage("feature_build"):
+            dataset.fit_feature_pipeline(feature_pipeline)
+
+        model = ChallengerModel(**challenger_params(config))
+        cache_dir = challenger_config.get('external_memory', {}).get('cache_dir', 'artifacts/xgb_cache')
+        with profile_stage("challenger_fit"):
+            model.fit_external(lambda: dataset.iter_features(feature_pipeline), cache_dir=cache_dir)
+        with profile_stage("challenger_eval"):
+            metrics = dataset.evaluate(model, feature_pipeline)
+        metrics['train_seconds'] = round(time.perf_counter() - start, 2)
+
+        logger.info("Streaming Challenger Results:")
+        log_stream_metrics(metrics)
+
+        challenger_pipeline = Pipeline([
+            ('features', feature_pipeline),
+            ('model', model)
+        ])
+        with profile_stage("challenger_save"):
+            save_model(challenger_pipeline, "artifacts/models/challenger_model.joblib")
+            export_if_enabled(config, challenger_pipeline, "artifacts/models/challenger_model.joblib")
+            if model_type == 'challenger':
+                save_model(challenger_pipeline, "artifacts/models/best_model.joblib")
+                export_if_enabled(config, challenger_pipeline, "artifacts/models/best_model.joblib")
+                logger.info("Saved streaming challenger as best_model.joblib")
+
+def log_stream_metrics(metrics):
+    for name in ('roc_auc', 'recall', 'precision', 'f1'):
+        logger.info(f"{name}: {metrics[name]:.4f}")
+    logger.info(f"Held-out rows: {metrics['test_rows']:,}, training time: {metrics['train_seconds']}s")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--model", type=str, default="all", choices=["all", "baseline", "challenger"], help="Model to train")
+    parser.add_argument("--tune", action="store_true", help="Run the Challenger hyperparameter search (configs: tuning)")
+    parser.add_argument("--no-feature-cache", action="store_true", help="Rebuild features even if a cached copy exists")
+    parser.add_argument("--stream", action="store_true", help="Train out-of-core, chunk by chunk: SGD Baseline / external-memory Challenger (configs: streaming)")
+    parser.add_argument("--source", type=str, default=None, help="CSV/Parquet data file for --stream/--incremental (default: processed data)")
+    parser.add_argument("--compare-memory", action="store_true", help="With --stream, also measure the in-memory Baseline path's peak memory")
+    parser.add_argument("--incremental", action="store_true", help="Continue boosting the existing Challenger on new data (--source)")
+    parser.add_argument("--profile", action="store_true", help="Record wall time, CPU time and peak memory per stage to a JSON report")
+    parser.add_argument("--profile-stages", type=str, default="", help="With --profile, comma-separated stages (or 'all') to also dump stacks for")
+    parser.add_argument("--profile-mode", type=str, default="sample", choices=["sample", "cprofile"], help="Stack dumps as sampled flamegraph stacks (.folded) or cProfile stats (.prof)")
+    parser.add_argument("--profile-memory", action="store_true", help="With --profile, also trace Python allocations per stage with tracemalloc (slows the run down)")
+    parser.add_argument("--profile-dir", type=str, default="artifacts/profiles", help="Directory for profile runs (one timestamped subdirectory each)")
     args = parser.parse_args()
-    
-    train(model_type=args.model)
+
+    profiler = None
+    if args.profile:
+        mode = "incremental" if args.incremental else "tune" if args.tune else f"{args.model}_stream" if args.stream else args.model
+        profiler = StageProfiler(
+            os.path.join(args.profile_dir, f"{mode}_{time.strftime('%Y%m%d-%H%M%S')}"),
+            detail_stages=[name.strip() for name in args.profile_stages.split(",") if name.strip()],
+            detail_mode=args.profile_mode,
+            trace_memory=args.profile_memory,
+            metadata={"command": sys.argv[1:], "python": sys.version.split()[0]},
+        )
+
+    with profiler.activate() if profiler else nullcontext():
+        if args.incremental:
+            train_incremental(source=args.source)
+        elif args.stream:
+            train_streaming(model_type=args.model, source=args.source, compare_memory=args.compare_memory)
+        elif args.tune:
+            tune(use_feature_cache=not args.no_feature_cache)
+        else:
+            train(model_type=args.model, use_feature_cache=not args.no_feature_cache)
+
+    if profiler:
+        profiler.log_summary()
+        logger.info(f"Profile report written to {profiler.write_report()}")
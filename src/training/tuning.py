@@ -0,0 +1,183 @@
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.metrics import roc_auc_score, recall_score, precision_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from src.models.challenger import ChallengerModel
+from src.utils.matrices import save_matrix, load_matrix
+
+logger = logging.getLogger("ChurnPrediction.tuning")
+
+# Parameters sampled on a log scale
+LOG_SCALE_PARAMS = {"learning_rate"}
+INT_PARAMS = {"n_estimators", "max_depth"}
+
+
+def sample_params(rng: np.random.Generator, search_space: Dict[str, List[float]]) -> Dict[str, Any]:
+    """
+    Draws one configuration from `search_space` ({param: [low, high]}).
+    Integer params are sampled uniformly, learning_rate log-uniformly, others uniformly.
+    """
+    params = {}
+    for name, (low, high) in search_space.items():
+        if name in INT_PARAMS:
+            params[name] = int(rng.integers(low, high + 1))
+        elif name in LOG_SCALE_PARAMS:
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+
+def _run_trial(trial: Dict[str, Any], data_dir: str, random_state: int, model_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fits one ChallengerModel on the cached feature matrices and scores it on the
+    validation split. Runs in a worker process; dense matrices are memory-mapped, not copied.
+    """
+    X_fit = load_matrix(data_dir, "X_fit", mmap_mode="r")
+    y_fit = np.load(os.path.join(data_dir, "y_fit.npy"))
+    X_val = load_matrix(data_dir, "X_val", mmap_mode="r")
+    y_val = np.load(os.path.join(data_dir, "y_val.npy"))
+
+    start = time.perf_counter()
+    model = ChallengerModel(random_state=random_state, n_jobs=1, **model_params, **trial["params"])
+    model.fit(X_fit, y_fit)
+    fit_seconds = time.perf_counter() - start
+
+    y_prob = model.predict_proba(X_val)[:, 1]
+    y_pred = (y_prob >= 0.5).astype(int)
+    return {
+        **trial,
+        "recall": recall_score(y_val, y_pred),
+        "precision": precision_score(y_val, y_pred, zero_division=0),
+        "f1": f1_score(y_val, y_pred),
+        "roc_auc": roc_auc_score(y_val, y_prob),
+        "fit_seconds": round(fit_seconds, 3),
+    }
+
+
+def rank_trials(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Recall first (the business metric), ROC-AUC breaks ties
+    return sorted(results, key=lambda r: (r["recall"], r["roc_auc"]), reverse=True)
+
+
+class ChallengerTuner:
+    """
+    Randomized or successive-halving hyperparameter search for ChallengerModel.
+
+    The feature pipeline output is computed once by the caller and written to
+    `work_dir` as .npy files (.npz when sparse); every trial reads the same matrices, so feature
+    engineering is never repeated per trial. Trials run in a process pool of
+    `n_jobs` workers, each pinned to one thread.
+    """
+    def __init__(self, tuning_config: Dict[str, Any], random_state: int = 42, work_dir: str = "artifacts/tuning",
+                 model_params: Dict[str, Any] = None):
+        self.strategy = tuning_config.get("strategy", "random")
+        self.n_trials = tuning_config.get("n_trials", 20)
+        n_jobs = tuning_config.get("n_jobs", -1)
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.validation_size = tuning_config.get("validation_size", 0.2)
+        self.halving_factor = tuning_config.get("halving_factor", 3)
+        self.min_n_estimators = tuning_config.get("min_n_estimators", 25)
+        self.search_space = tuning_config["search_space"]
+        self.random_state = random_state
+        self.work_dir = work_dir
+        # Fixed ChallengerModel arguments shared by every trial (e.g. tree_method, max_bin)
+        self.model_params = model_params or {}
+
+    def _cache_features(self, X: np.ndarray, y: np.ndarray) -> str:
+        data_dir = os.path.join(self.work_dir, "features")
+        if os.path.isdir(data_dir):
+            shutil.rmtree(data_dir)  # a previous dense/sparse run must not leave stale matrices
+        os.makedirs(data_dir, exist_ok=True)
+        fit_idx, val_idx = train_test_split(
+            np.arange(len(y)), test_size=self.validation_size, stratify=y, random_state=self.random_state
+        )
+        save_matrix(data_dir, "X_fit", X[fit_idx])
+        np.save(os.path.join(data_dir, "y_fit.npy"), y[fit_idx])
+        save_matrix(data_dir, "X_val", X[val_idx])
+        np.save(os.path.join(data_dir, "y_val.npy"), y[val_idx])
+        logger.info(f"Cached tuning features: fit={len(fit_idx)}, validation={len(val_idx)} rows in {data_dir}")
+        return data_dir
+
+    def _run(self, trials: List[Dict[str, Any]], data_dir: str) -> List[Dict[str, Any]]:
+        # 'spawn' keeps workers clear of any OpenMP/BLAS state initialized in the parent
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(trials)), mp_context=context) as pool:
+            futures = [pool.submit(_run_trial, trial, data_dir, self.random_state, self.model_params) for trial in trials]
+            results = []
+            for future in futures:
+                result = future.result()
+                logger.info(
+                    f"Trial {result['trial']} (rung {result['rung']}): recall={result['recall']:.4f}, "
+                    f"roc_auc={result['roc_auc']:.4f}, params={result['params']}"
+                )
+                results.append(result)
+        return results
+
+    def search(self, X: np.ndarray, y: np.ndarray) -> pd.DataFrame:
+        """
+        Runs the search and returns the leaderboard, best trial first.
+        """
+        y = np.asarray(y)
+        data_dir = self._cache_features(X if sp.issparse(X) else np.asarray(X), y)
+        rng = np.random.default_rng(self.random_state)
+        logger.info(f"Tuning ChallengerModel: strategy={self.strategy}, trials={self.n_trials}, workers={self.n_jobs}")
+
+        trials = [{"trial": i, "rung": 0, "params": sample_params(rng, self.search_space)} for i in range(self.n_trials)]
+        if self.strategy == "random":
+            results = self._run(trials, data_dir)
+        elif self.strategy == "halving":
+            results = self._successive_halving(trials, data_dir)
+        else:
+            raise ValueError(f"Unknown tuning strategy '{self.strategy}'. Expected 'random' or 'halving'.")
+
+        # Later halving rungs trained with bigger budgets, so they rank above earlier ones
+        ranked = sorted(results, key=lambda r: (r["rung"], r["recall"], r["roc_auc"]), reverse=True)
+        return pd.DataFrame([
+            {"trial": r["trial"], "rung": r["rung"], **r["params"],
+             **{k: r[k] for k in ("recall", "precision", "f1", "roc_auc", "fit_seconds")}}
+            for r in ranked
+        ])
+
+    def best_params(self, leaderboard: pd.DataFrame) -> Dict[str, Any]:
+        best = leaderboard.iloc[0]
+        return {
+            name: int(best[name]) if name in INT_PARAMS else float(best[name])
+            for name in self.search_space
+        }
+
+    def _successive_halving(self, trials: List[Dict[str, Any]], data_dir: str) -> List[Dict[str, Any]]:
+        """
+        Every configuration starts with `min_n_estimators` trees; after each rung only the
+        top 1/halving_factor survive and their tree budget is multiplied by halving_factor,
+        up to the top of the n_estimators range.
+        """
+        max_estimators = self.search_space.get("n_estimators", [self.min_n_estimators, 400])[1]
+        budget = self.min_n_estimators
+        survivors = trials
+        all_results = []
+        rung = 0
+        while True:
+            rung_trials = [
+                {**t, "rung": rung, "params": {**t["params"], "n_estimators": budget}} for t in survivors
+            ]
+            results = self._run(rung_trials, data_dir)
+            all_results.extend(results)
+            keep = max(1, math.floor(len(results) / self.halving_factor))
+            if len(results) <= 1 or budget >= max_estimators:
+                break
+            survivors = rank_trials(results)[:keep]
+            budget = min(budget * self.halving_factor, max_estimators)
+            rung += 1
+        return all_results
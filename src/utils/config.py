@@ -0,0 +1,12 @@
+import os
+
+def load_config(config_path="configs/config.yaml"):
+    import yaml
+    try:
+        with open(config_path, "r") as f:
+            return yaml.safe_load(f)
+    except FileNotFoundError:
+        # Fallback for when running from root
+        config_path = os.path.join(os.getcwd(), config_path)
+        with open(config_path, "r") as f:
+            return yaml.safe_load(f)
@@ -1,8 +1,15 @@
 import logging
 import os
-import yaml
 
 def setup_logger(config_path="configs/config.yaml"):
+    """
+    Configures the "ChurnPrediction" logger (file + console) once; later calls return it as is.
+    """
+    logger = logging.getLogger("ChurnPrediction")
+    if logger.handlers:
+        return logger
+
+    import yaml
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
 
@@ -12,7 +19,6 @@ def setup_logger(config_path="configs/config.yaml"):
     # Ensure log directory exists
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
-    logger = logging.getLogger("ChurnPrediction")
     logger.setLevel(log_level)
 
     # File Handler
@@ -23,8 +29,7 @@ def setup_logger(config_path="configs/config.yaml"):
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
-    if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(stream_handler)
+    logger.addHandler(file_handler)
+    logger.addHandler(stream_handler)
     
     return logger
@@ -0,0 +1,28 @@
+"""
+On-disk feature matrices shared between processes and runs: dense matrices as .npy
+(memory-mappable), sparse ones as uncompressed CSR .npz. Used by the feature cache,
+the tuning trials and the cross-validation folds.
+"""
+import os
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def save_matrix(directory: str, name: str, X):
+    if sp.issparse(X):
+        sp.save_npz(os.path.join(directory, f"{name}.npz"), X.tocsr(), compressed=False)
+    else:
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(X))
+
+
+def load_matrix(directory: str, name: str, mmap_mode: Optional[str] = None):
+    """
+    Loads a matrix written by save_matrix. `mmap_mode` applies to dense matrices only;
+    sparse ones are always read into memory.
+    """
+    sparse_path = os.path.join(directory, f"{name}.npz")
+    if os.path.exists(sparse_path):
+        return sp.load_npz(sparse_path)
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
@@ -0,0 +1,224 @@
+"""
+Per-stage profiling for the training pipeline (python -m src.training.train_pipeline --profile).
+
+Code marks its stages with `with profile_stage("feature_build"):`. Outside a profiled run
+this is a no-op. Inside `StageProfiler.activate()` each stage records:
+- wall time and CPU time: this process (all threads, so CPU > wall when XGBoost runs in
+  parallel) plus the worker processes that finished during the stage (RUSAGE_CHILDREN),
+  so stages running a process pool are not reported as idle;
+- the process's peak RSS at the end of the stage and how much the stage raised it;
+- with `trace_memory`, also peak traced memory (tracemalloc, which numpy allocations
+  report to) and the increase over the memory in use when the stage started; nested stages
+  fold their peak into the parent. Tracing slows allocation-heavy code down, so it is off
+  by default and the wall times of a traced run are inflated;
+- for stages named in `detail_stages`, either a cProfile dump (`<stage>.prof`, for pstats /
+  snakeviz) or sampled stacks in collapsed format (`<stage>.folded`, for flamegraph.pl /
+  speedscope), from a thread sampling the main thread every `sample_interval` seconds.
+`write_report()` writes everything to `<output_dir>/report.json`.
+"""
+import cProfile
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Sequence
+
+logger = logging.getLogger("ChurnPrediction.profiling")
+
+_active: Optional["StageProfiler"] = None
+
+
+class StackSampler:
+    """
+    Samples the Python stack of one thread at a fixed interval and counts collapsed stacks
+    ("outer;...;inner" -> samples). Native code shows up as its calling Python frame.
+    """
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StageProfiler:
+    """
+    Collects per-stage timings for one run. See the module docstring.
+    """
+    def __init__(self, output_dir: str, detail_stages: Sequence[str] = (), detail_mode: str = "sample",
+                 sample_interval: float = 0.005, trace_memory: bool = False, metadata: Optional[Dict[str, Any]] = None):
+        if detail_mode not in ("sample", "cprofile"):
+            raise ValueError(f"Unknown detail_mode '{detail_mode}'; expected 'sample' or 'cprofile'.")
+        self.output_dir = output_dir
+        self.detail_stages = set(detail_stages)
+        self.detail_mode = detail_mode
+        self.sample_interval = sample_interval
+        self.trace_memory = trace_memory
+        self.metadata = metadata or {}
+        self.stages: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._started_tracing = False
+        self._start_wall = None
+        self._start_cpu = None
+
+    def _wants_detail(self, name: str) -> bool:
+        return "all" in self.detail_stages or name in self.detail_stages
+
+    @contextmanager
+    def activate(self):
+        global _active
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start_wall, self._start_cpu, self._start_child_cpu = time.perf_counter(), time.process_time(), _child_cpu()
+        previous, _active = _active, self
+        try:
+            yield self
+        finally:
+            _active = previous
+            self.metadata["wall_seconds"] = round(time.perf_counter() - self._start_wall, 3)
+            child_cpu = _child_cpu() - self._start_child_cpu
+            self.metadata["cpu_seconds"] = round(time.process_time() - self._start_cpu + child_cpu, 3)
+            self.metadata["child_cpu_seconds"] = round(child_cpu, 3)
+            self.metadata["max_rss_mb"] = round(_max_rss_mb(resource.RUSAGE_SELF), 1)
+            self.metadata["max_child_rss_mb"] = round(_max_rss_mb(resource.RUSAGE_CHILDREN), 1)
+            self.metadata["trace_memory"] = self.trace_memory
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def _traced(self):
+        return tracemalloc.get_traced_memory() if self.trace_memory and tracemalloc.is_tracing() else (0, 0)
+
+    @contextmanager
+    def stage(self, name: str):
+        path = "/".join([frame["name"] for frame in self._stack] + [name])
+        current, peak = self._traced()
+        # Fold the peak so far into the enclosing stages before resetting it for this one
+        for frame in self._stack:
+            frame["peak"] = max(frame["peak"], peak)
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        frame = {"name": name, "peak": current}
+        self._stack.append(frame)
+        # Appended on entry so the report lists stages in start order
+        record = {"stage": path}
+        self.stages.append(record)
+
+        detail, detail_file = None, None
+        if self._wants_detail(name):
+            if self.detail_mode == "cprofile":
+                detail = cProfile.Profile()
+                detail.enable()
+            else:
+                detail = StackSampler(threading.get_ident(), self.sample_interval)
+                detail.start()
+
+        start_rss = _max_rss_mb(resource.RUSAGE_SELF)
+        start_wall, start_cpu, start_child_cpu = time.perf_counter(), time.process_time(), _child_cpu()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            child_cpu = _child_cpu() - start_child_cpu
+            cpu = time.process_time() - start_cpu + child_cpu
+            end_rss = _max_rss_mb(resource.RUSAGE_SELF)
+            if detail is not None:
+                detail_file = os.path.join(self.output_dir, path.replace("/", ".") +
+                                           (".prof" if self.detail_mode == "cprofile" else ".folded"))
+                if self.detail_mode == "cprofile":
+                    detail.disable()
+                    detail.dump_stats(detail_file)
+                else:
+                    detail.stop()
+                    detail.write(detail_file)
+
+            frame["peak"] = max(frame["peak"], self._traced()[1])
+            self._stack.pop()
+            for parent in self._stack:
+                parent["peak"] = max(parent["peak"], frame["peak"])
+            record.update({
+                "wall_seconds": round(wall, 4),
+                "cpu_seconds": round(cpu, 4),
+                "child_cpu_seconds": round(child_cpu, 4),
+                "max_rss_mb": round(end_rss, 1),
+                "rss_increase_mb": round(end_rss - start_rss, 1),
+                "peak_traced_mb": round(frame["peak"] / 1e6, 2) if self.trace_memory else None,
+                "peak_increase_mb": round((frame["peak"] - current) / 1e6, 2) if self.trace_memory else None,
+                "detail_file": detail_file,
+            })
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **self.metadata,
+            "stages": self.stages,
+        }
+
+    def write_report(self) -> str:
+        path = os.path.join(self.output_dir, "report.json")
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def log_summary(self):
+        traced = f"{'traced (MB)':>13}" if self.trace_memory else ""
+        logger.info(f"{'stage':<40}{'wall (s)':>10}{'cpu (s)':>10}{'rss (MB)':>10}{traced}")
+        for s in self.report()["stages"]:
+            traced = f"{s['peak_traced_mb']:>13.1f}" if self.trace_memory else ""
+            logger.info(f"{s['stage']:<40}{s['wall_seconds']:>10.2f}{s['cpu_seconds']:>10.2f}{s['max_rss_mb']:>10.1f}{traced}")
+
+
+def _child_cpu() -> float:
+    # User + system CPU of child processes that have exited and been waited for
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _max_rss_mb(who) -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+@contextmanager
+def _noop():
+    yield
+
+
+def profile_stage(name: str):
+    """
+    `with profile_stage("load"):` — a stage of the active StageProfiler, or a no-op.
+    """
+    return _active.stage(name) if _active is not None else _noop()
@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+from sklearn.pipeline import Pipeline
+
+from src.data_validation.cleaner import DataCleaner
+from src.utils.config import load_config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(ROOT, "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv")
+
+
+@pytest.fixture(scope="session")
+def config():
+    return load_config(os.path.join(ROOT, "configs/config.yaml"))
+
+
+@pytest.fixture(scope="session")
+def raw_data():
+    """
+    The cleaned raw dataset: (X, y) with X in the shape the pipelines and predictor score.
+    """
+    df = DataCleaner().clean_data(pd.read_csv(DATA_PATH))
+    y = (df["Churn"] == "Yes").astype(int)
+    return df.drop(columns=["customerID", "Churn"]), y
+
+
+def fit_pipeline(config, X, y, kind: str, sparse: bool = False) -> Pipeline:
+    # Same assembly as src.training.train_pipeline, with a small challenger to keep tests fast
+    from src.training.train_pipeline import build_feature_pipeline
+
+    features = build_feature_pipeline(config, sparse=sparse)
+    X_t = features.fit_transform(X)
+    if kind == "linear":
+        from src.models.baseline import BaselineModel
+        model = BaselineModel().fit(X_t, y)
+    else:
+        from src.models.challenger import ChallengerModel
+        model = ChallengerModel(n_estimators=30, max_depth=4, n_jobs=1).fit(X_t, y)
+    return Pipeline([("features", features), ("model", model)])
+
+
+@pytest.fixture(scope="session")
+def pipelines(config, raw_data):
+    """
+    Fitted pipelines of every kind the serving and export paths handle, by name.
+    "tree_sparse" is trained on CSR features, where XGBoost reads unstored zeros as missing.
+    """
+    X, y = raw_data
+    return {
+        "linear": fit_pipeline(config, X, y, "linear"),
+        "tree": fit_pipeline(config, X, y, "tree"),
+        "tree_sparse": fit_pipeline(config, X, y, "tree", sparse=True),
+    }
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+from src.inference.batching import MicroBatcher
+
+
+def test_concurrent_submits_are_coalesced():
+    calls = []
+
+    def score(records):
+        calls.append(len(records))
+        return [record["x"] * 2 for record in records]
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit({"x": i}) for i in range(8)))
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == [i * 2 for i in range(8)]
+    assert calls == [8]
+
+
+def test_stop_fails_the_batch_being_scored():
+    release = threading.Event()
+
+    def score(records):
+        release.wait(5)
+        return records
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=4, max_wait_ms=0)
+        await batcher.start()
+        pending = [asyncio.ensure_future(batcher.submit({"x": i})) for i in range(3)]
+        while batcher.batches == 0:
+            await asyncio.sleep(0.001)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+    assert len(results) == 3
+    for result in results:
+        assert isinstance(result, RuntimeError)
+
@@ -0,0 +1,36 @@
+import io
+
+import joblib
+import numpy as np
+import pytest
+
+from src.inference.bulk import iter_chunks, score_chunks
+from src.inference.predictor import ChurnPredictor, categorize_risk
+
+
+@pytest.fixture(scope="module")
+def predictor(pipelines, tmp_path_factory):
+    path = tmp_path_factory.mktemp("models") / "model.joblib"
+    joblib.dump(pipelines["linear"], path)
+    return ChurnPredictor(str(path), warm=False)
+
+
+def test_every_row_is_scored_whatever_the_chunk_size(predictor):
+    from tests.conftest import DATA_PATH
+    with open(DATA_PATH) as f:
+        header, *rows = f.read().splitlines()[:41]
+    # Duplicates inside one chunk and across chunk boundaries
+    csv = "\n".join([header] + rows + rows[:10] + rows[:10]) + "\n"
+    n_rows = len(rows) + 20
+
+    results = []
+    for chunk_size in (7, 1000):
+        scored = list(score_chunks(predictor, iter_chunks(io.StringIO(csv), "csv", chunk_size)))
+        assert sum(len(chunk) for chunk in scored) == n_rows
+        results.append(np.concatenate([chunk["churn_probability"].to_numpy() for chunk in scored]))
+    np.testing.assert_allclose(results[0], results[1], rtol=0, atol=1e-12)
+
+
+def test_nan_probability_is_low_risk():
+    probs = np.array([np.nan, 0.1, 0.3, 0.59, 0.6, 1.0])
+    assert categorize_risk(probs).tolist() == ["LOW", "LOW", "MEDIUM", "MEDIUM", "HIGH", "HIGH"]
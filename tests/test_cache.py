@@ -0,0 +1,81 @@
+from src.inference.cache import PredictionCache
+from src.inference.predictor import REFERENCE_RECORD
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_drops_least_recently_used():
+    cache = PredictionCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert (stats["expirations"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_reading_does_not_extend_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    clock.now += 8
+    assert cache.get("a") == 1
+    clock.now += 8
+    assert cache.get("a") is None
+
+
+def test_key_changes_with_model_version():
+    cache = PredictionCache()
+    cache.put(PredictionCache.make_key(REFERENCE_RECORD, "v1"), {"churn_probability": 0.5})
+
+    assert PredictionCache.make_key(REFERENCE_RECORD, "v1") != PredictionCache.make_key(REFERENCE_RECORD, "v2")
+    assert cache.get(PredictionCache.make_key(REFERENCE_RECORD, "v2")) is None
+    assert cache.get(PredictionCache.make_key(REFERENCE_RECORD, "v1")) is not None
+
+
+def test_key_normalizes_numbers_and_field_order():
+    record = {**REFERENCE_RECORD, "tenure": 12}
+    reordered = dict(reversed(list({**REFERENCE_RECORD, "tenure": 12.0}.items())))
+    assert PredictionCache.make_key(record, "v1") == PredictionCache.make_key(reordered, "v1")
+
+
+def test_reload_serves_new_model_not_cached_results(pipelines, tmp_path):
+    import joblib
+    from src.inference.predictor import ChurnPredictor
+
+    linear_path, tree_path = tmp_path / "linear.joblib", tmp_path / "tree.joblib"
+    joblib.dump(pipelines["linear"], linear_path)
+    joblib.dump(pipelines["tree"], tree_path)
+    cache = PredictionCache()
+    predictor = ChurnPredictor(str(linear_path), cache=cache, warm=False)
+    before = predictor.predict_single(REFERENCE_RECORD)
+    assert predictor.predict_single(REFERENCE_RECORD) == before and cache.hits == 1
+
+    old_version = predictor.model_version
+    predictor.reload(str(tree_path))
+    assert predictor.model_version != old_version
+    after = predictor.predict_single(REFERENCE_RECORD)
+    assert after["churn_probability"] != before["churn_probability"]
+    assert after["churn_probability"] == predictor.predict_single(REFERENCE_RECORD)["churn_probability"]
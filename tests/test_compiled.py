@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from src.inference.compiled import CompiledPipeline
+
+
+@pytest.mark.parametrize("name", ["linear", "tree", "tree_sparse"])
+def test_compiled_records_match_pipeline(pipelines, raw_data, name):
+    X, _ = raw_data
+    pipeline = pipelines[name]
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    assert (compiled.linear is not None) == (name == "linear")
+
+    expected = pipeline.predict_proba(X)[:, 1]
+    np.testing.assert_array_equal(compiled.predict_proba_records(X.to_dict(orient="records")), expected)
+
+
+def test_compiled_handles_unseen_values_like_pipeline(pipelines, raw_data):
+    X, _ = raw_data
+    X = X.head(50).copy()
+    X.loc[X.index[0], "Contract"] = "Three year"  # unknown category: all-zero one-hot
+    X.loc[X.index[1], "tenure"] = 100  # outside the tenure bins
+    for pipeline in pipelines.values():
+        expected = pipeline.predict_proba(X)[:, 1]
+        actual = CompiledPipeline.from_pipeline(pipeline).predict_proba_records(X.to_dict(orient="records"))
+        np.testing.assert_array_equal(actual, expected)
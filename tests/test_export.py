@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.inference.export import export_model
+from src.inference.portable import PortableModel
+
+
+@pytest.mark.parametrize("name", ["linear", "tree", "tree_sparse"])
+def test_portable_model_matches_pipeline(pipelines, raw_data, tmp_path, name):
+    X, _ = raw_data
+    pipeline = pipelines[name]
+    spec_path = export_model(pipeline, str(tmp_path), name=name)
+
+    portable = PortableModel.load(spec_path)
+    assert portable.compiled.zeros_as_missing == (name == "tree_sparse")
+    # New customers have real zeros (tenure, TotalCharges), which CSR training reads as missing
+    assert (X["tenure"] == 0).any()
+
+    expected = pipeline.predict_proba(X)[:, 1]
+    np.testing.assert_allclose(portable.predict_proba(X)[:, 1], expected, rtol=0, atol=1e-6)
+    records = X.head(200).to_dict(orient="records")
+    np.testing.assert_allclose(portable.predict_proba(records)[:, 1], expected[:200], rtol=0, atol=1e-6)
+
+
+def test_linear_export_is_exact(pipelines, raw_data, tmp_path):
+    X, _ = raw_data
+    spec_path = export_model(pipelines["linear"], str(tmp_path), name="linear")
+    np.testing.assert_array_equal(PortableModel.load(spec_path).predict_proba(X), pipelines["linear"].predict_proba(X))
+
+
+def test_reexport_as_other_kind_removes_stale_files(pipelines, tmp_path):
+    export_model(pipelines["linear"], str(tmp_path), name="best_model")
+    assert (tmp_path / "best_model.scoring.json").exists()
+
+    spec_path = export_model(pipelines["tree"], str(tmp_path), name="best_model")
+    assert PortableModel.load(spec_path).model_type == "ChallengerModel"
+    assert (tmp_path / "best_model.booster.json").exists()
+    assert not (tmp_path / "best_model.scoring.json").exists()
+
+    export_model(pipelines["linear"], str(tmp_path), name="best_model")
+    assert (tmp_path / "best_model.scoring.json").exists()
+    assert not (tmp_path / "best_model.booster.json").exists()
+
+
+def test_load_rejects_booster_not_matching_spec(pipelines, tmp_path):
+    spec_path = export_model(pipelines["tree"], str(tmp_path), name="tree")
+    assert not list(tmp_path.glob("*.tmp"))
+    booster_path = tmp_path / "tree.booster.json"
+    booster_path.write_bytes(booster_path.read_bytes()[:-1] + b" ")
+    with pytest.raises(ValueError, match="sha256"):
+        PortableModel.load(spec_path)
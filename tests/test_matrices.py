@@ -0,0 +1,19 @@
+import numpy as np
+import scipy.sparse as sp
+
+from src.utils.matrices import save_matrix, load_matrix
+
+
+def test_dense_and_sparse_round_trip(tmp_path):
+    dense = np.arange(12, dtype=np.float64).reshape(3, 4)[:, ::2]  # non-contiguous view
+    sparse = sp.random(5, 6, density=0.3, format="csc", random_state=0)
+    save_matrix(str(tmp_path), "dense", dense)
+    save_matrix(str(tmp_path), "sparse", sparse)
+
+    mapped = load_matrix(str(tmp_path), "dense", mmap_mode="r")
+    assert isinstance(mapped, np.memmap)
+    np.testing.assert_array_equal(mapped, dense)
+    np.testing.assert_array_equal(load_matrix(str(tmp_path), "dense"), dense)
+    loaded = load_matrix(str(tmp_path), "sparse")
+    assert sp.isspmatrix_csr(loaded) or loaded.format == "csr"
+    np.testing.assert_array_equal(loaded.toarray(), sparse.toarray())
@@ -0,0 +1,64 @@
+import joblib
+import numpy as np
+import pytest
+
+from src.inference.predictor import ChurnPredictor, REFERENCE_RECORD
+from src.inference.scoring_table import ScoringTable, ScoringTableError, check_parity
+
+
+@pytest.fixture(scope="module")
+def linear_predictor(pipelines, tmp_path_factory):
+    path = tmp_path_factory.mktemp("models") / "baseline_model.joblib"
+    joblib.dump(pipelines["linear"], path)
+    return ChurnPredictor(str(path), warm=False)
+
+
+@pytest.fixture(scope="module")
+def table(linear_predictor):
+    return ScoringTable.from_pipeline(linear_predictor.model, compiled=linear_predictor.compiled)
+
+
+def churn_probabilities(predictor, records):
+    return np.array([r["churn_probability"] for r in predictor.predict_batch(records)])
+
+
+def test_parity_with_predictor_on_raw_dataset(table, linear_predictor, raw_data):
+    X, _ = raw_data
+    assert check_parity(table, linear_predictor, X.to_dict(orient="records")) < 1e-9
+
+
+@pytest.mark.parametrize("override", [
+    {"gender": "Mle"},  # unknown category: contributes 0, like an all-zero one-hot
+    {"PaymentMethod": None},
+    {"tenure": 100},  # above the last tenure bin
+    {"tenure": -1},  # below the first
+])
+def test_parity_on_edge_records(table, linear_predictor, override):
+    records = [{**REFERENCE_RECORD, **override}]
+    assert check_parity(table, linear_predictor, records) < 1e-9
+
+
+def test_missing_total_charges_is_nan_like_the_predictor(table, linear_predictor):
+    record = {**REFERENCE_RECORD, "TotalCharges": None}
+    assert np.isnan(churn_probabilities(linear_predictor, [record])[0])
+    assert np.isnan(table.predict_proba_record(record))
+    assert np.isnan(table.predict_proba_records([record])[0])
+
+
+def test_category_frame_through_encode_columns(table, linear_predictor, raw_data):
+    X, _ = raw_data
+    X = X.head(500).copy()
+    X.loc[X.index[0], "gender"] = "Mle"
+    X.loc[X.index[1], "Contract"] = None
+    categorical = [spec["column"] for spec in table.categorical]
+    typed = X.astype({col: "category" for col in categorical})
+    assert all(hasattr(typed[col], "cat") for col in categorical)
+
+    codes, numeric = table.encode_columns({col: typed[col] for col in typed.columns}, len(typed))
+    expected = churn_probabilities(linear_predictor, X.to_dict(orient="records"))
+    np.testing.assert_allclose(table.predict_proba_codes(codes, numeric), expected, rtol=0, atol=1e-9)
+
+
+def test_tree_pipeline_has_no_table(pipelines):
+    with pytest.raises(ScoringTableError):
+        ScoringTable.from_pipeline(pipelines["tree"])
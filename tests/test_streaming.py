@@ -0,0 +1,40 @@
+import pandas as pd
+
+from src.training.streaming import ChunkedDataset
+from src.training.train_pipeline import build_feature_pipeline
+from tests.conftest import DATA_PATH
+
+
+def test_scan_pass_ignores_missing_categories(config, tmp_path):
+    df = pd.read_csv(DATA_PATH).head(300)
+    df.loc[df.index[:5], "Contract"] = None
+    source = tmp_path / "train.csv"
+    df.to_csv(source, index=False)
+
+    dataset = ChunkedDataset({**config, "streaming": {"chunk_size": 100}}, source=str(source))
+    feature_pipeline = build_feature_pipeline(config)
+    class_counts = dataset.fit_feature_pipeline(feature_pipeline)
+
+    assert sum(class_counts.values()) > 0
+    encoder = feature_pipeline.named_steps["preprocessor"].named_transformers_["cat"]
+    contract = encoder.categories_[list(encoder.feature_names_in_).index("Contract")]
+    assert sorted(contract) == ["Month-to-month", "One year", "Two year"]
+    # Rows with a missing Contract still transform (as an all-zero one-hot)
+    assert len(list(dataset.iter_features(feature_pipeline))) == 3
+
+
+def test_feature_pipeline_is_fitted_on_training_rows_only(config, tmp_path, monkeypatch):
+    df = pd.read_csv(DATA_PATH).head(300)
+    source = tmp_path / "train.csv"
+    df.to_csv(source, index=False)
+    dataset = ChunkedDataset({**config, "streaming": {"chunk_size": 100}}, source=str(source))
+    held_out = set(df["customerID"][dataset._is_test(df[["customerID"]])])
+    assert held_out
+
+    feature_pipeline = build_feature_pipeline(config)
+    fitted_on = []
+    monkeypatch.setattr(feature_pipeline, "fit", lambda X, y=None: fitted_on.append(X) or feature_pipeline)
+    dataset.fit_feature_pipeline(feature_pipeline)
+
+    sample_ids = set(df.loc[fitted_on[0].index, "customerID"])
+    assert sample_ids and not sample_ids & held_out
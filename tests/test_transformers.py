@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from src.feature_engineering.transformers import (
+    TenureBinning, LogTransformer, InteractionFeatures, EngineeredFeatures
+)
+
+# Bin edges (0, 12, 24, 60), one either side of each, beyond the last, and missing
+EDGE_TENURES = [0, 1, 11, 12, 13, 23, 24, 25, 59, 60, 61, 72, 100, -1, np.nan]
+
+
+def legacy_chain():
+    return Pipeline([
+        ('interaction', InteractionFeatures()),
+        ('tenure_bin', TenureBinning()),
+        ('log_transform', LogTransformer(columns=['TotalCharges'])),
+    ])
+
+
+def edge_frame(base: pd.DataFrame) -> pd.DataFrame:
+    rows = []
+    for tenure in EDGE_TENURES:
+        for total in (0.0, 1397.5, np.nan):  # zero and missing numerators over every denominator
+            rows.append({**base.iloc[0].to_dict(), "tenure": tenure, "TotalCharges": total})
+    return pd.DataFrame(rows).astype({"tenure": "float64", "TotalCharges": "float64"})
+
+
+def test_fused_matches_chain_on_raw_dataset(raw_data):
+    X, _ = raw_data
+    pd.testing.assert_frame_equal(EngineeredFeatures().transform(X), legacy_chain().transform(X), check_exact=True)
+
+
+def test_fused_matches_chain_on_edge_cases(raw_data):
+    X, _ = raw_data
+    df = edge_frame(X)
+    fused, legacy = EngineeredFeatures().transform(df), legacy_chain().transform(df)
+    pd.testing.assert_frame_equal(fused, legacy, check_exact=True)
+
+    zero_tenure = df["tenure"] == 0
+    np.testing.assert_array_equal(fused.loc[zero_tenure, "calculated_AvgCharges"], df.loc[zero_tenure, "TotalCharges"])
+    assert set(fused.loc[zero_tenure | df["tenure"].isna() | (df["tenure"] > 60), "tenure_group"]) <= {"nan", "60+"}
+    assert (fused.loc[df["tenure"] == 12, "tenure_group"] == "0-12").all()
+    assert (fused.loc[df["tenure"] == 13, "tenure_group"] == "12-24").all()
+
+
+def test_fused_matches_chain_on_typed_frame(raw_data):
+    # DataIngestor's narrow dtypes, which training sees
+    X, _ = raw_data
+    typed = X.astype({"tenure": "int16", "TotalCharges": "float32"})
+    pd.testing.assert_frame_equal(EngineeredFeatures().transform(typed), legacy_chain().transform(typed), check_exact=True)
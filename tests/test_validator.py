@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pandera as pa
+import pytest
+
+from src.data_ingestion.ingestor import DataIngestor
+from src.data_validation.cleaner import DataCleaner
+from src.data_validation.domains import record_violations
+from src.data_validation.validator import DataValidator
+from tests.conftest import DATA_PATH
+
+# Rows hit per column, with values outside its domain (TotalCharges NaN is allowed, only the -3 counts)
+INJECTED = {
+    "gender": (slice(0, 3), "Mle"),
+    "Contract": (slice(10, 12), None),
+    "Churn": (slice(20, 22), "Maybe"),
+    "SeniorCitizen": (slice(30, 34), 2),
+    "tenure": (slice(40, 45), -1),
+    "MonthlyCharges": (slice(50, 51), -5.0),
+    "TotalCharges": (slice(60, 61), -3.0),
+}
+EXPECTED = {"gender": 3, "Contract": 2, "Churn": 2, "SeniorCitizen": 4, "tenure": 5, "MonthlyCharges": 1, "TotalCharges": 1}
+
+
+@pytest.fixture(scope="module")
+def typed_data(config):
+    # The frame prepare_data validates: DataIngestor's typed read, then DataCleaner
+    return DataCleaner().clean_data(DataIngestor(config).read_raw(DATA_PATH))
+
+
+@pytest.fixture(scope="module")
+def corrupted(typed_data):
+    df = typed_data.copy()
+    for col, (rows, value) in INJECTED.items():
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and value is not None:
+            df[col] = df[col].cat.add_categories([value])
+        df.iloc[rows, df.columns.get_loc(col)] = value
+    df.iloc[70:72, df.columns.get_loc("TotalCharges")] = np.nan
+    return df
+
+
+def full_mode_counts(df: pd.DataFrame) -> dict:
+    # Lazy validation collects every failure instead of stopping at the first column
+    with pytest.raises(pa.errors.SchemaErrors) as excinfo:
+        DataValidator(mode="full").schema.validate(df, lazy=True)
+    cases = excinfo.value.failure_cases
+    return cases.dropna(subset=["index"]).groupby("column")["index"].nunique().to_dict()
+
+
+def test_clean_data_passes_both_modes(typed_data):
+    assert DataValidator(mode="fast").check(typed_data).is_valid
+    DataValidator(mode="full").validate(typed_data)
+
+
+def test_fast_mode_counts_injected_violations(corrupted):
+    report = DataValidator(mode="fast").check(corrupted)
+    assert not report.is_valid and not report.missing_columns
+    assert report.failing_columns() == EXPECTED
+
+
+def test_full_mode_agrees_with_fast_mode(corrupted):
+    with pytest.raises(pa.errors.SchemaError):
+        DataValidator(mode="full").validate(corrupted)
+    assert full_mode_counts(corrupted) == EXPECTED
+
+
+def test_sampled_mode_covering_every_row_matches_fast(corrupted):
+    report = DataValidator(mode="sampled", sample_size=len(corrupted)).check(corrupted)
+    assert not report.sampled
+    assert report.failing_columns() == EXPECTED
+
+
+def test_record_check_flags_the_same_columns(corrupted):
+    feature_cols = [c for c in corrupted.columns if c not in ("customerID", "Churn")]
+    records = corrupted[feature_cols].astype(object).where(corrupted[feature_cols].notna(), None).to_dict(orient="records")
+    counts = {}
+    for record in records:
+        for col in record_violations(record):
+            counts[col] = counts.get(col, 0) + 1
+    assert counts == {col: n for col, n in EXPECTED.items() if col != "Churn"}